@@ -4,15 +4,23 @@ from discord import app_commands
 from discord.app_commands import Choice
 import json
 import random
+import asyncio
 from pathlib import Path
+from io import BytesIO
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from constants import *
 from helpers.embedHelper import add_spacer
 from helpers.achievements import ACHIEVEMENTS
-from helpers.bingo_render import render_bingo_card
+from helpers.bingo_render import render_card, invalidate_card, bingo_png_cache
+from helpers.avatar_cache import avatar_cache
+from helpers.render_service import render_service
 from helpers.admin import admin_meta
 from helpers.achievement_engine import AchievementEngine
+from helpers.persistence import read_json, write_json
+from helpers.json_cache import json_cache
+from helpers.achievement_context import LazyContext
+from helpers.guild_index import guild_index
 
 DATA_FILE = Path(CHALLENGE_PATH)
 CHALLENGE_SUGGESTIONS_FILE = Path(CHALLENGE_SUGGESTIONS_PATH)
@@ -27,6 +35,20 @@ ACHIEVEMENT_SUGGESTIONS_FILE = Path(ACHIEVEMENT_SUGGESTIONS_PATH)
 LINKS_FILE = Path(MINECRAFT_LINKS_PATH)
 STAMP_CARDS_FILE = Path(STAMP_CARDS_PATH)
 
+# ctx keys filled from the user's stats entry in build_ctx
+STATS_CTX_KEYS = (
+    MESSAGES, FILES, EREUSE_REACTS, REACTIONS_GIVEN, COMMANDS_USED, UNIQUE_COMMANDS,
+    COMMAND_USAGE, ANNOUNCEMENT_REACTS, BINGOS_COMPLETE, STAMP_CARDS_COMPLETE,
+    VOICE_MINUTES, VOICE_SESSION_MAX, VOICE_3P_MINUTES, VOICE_5P_MINUTES,
+    SIX_SEVEN, ADMIN_VICTIM, MAX_UNIQUE_REACTORS, MAX_REACTIONS_ON_MESSAGE,
+    UNIQUE_USERS_REACTED_TO, YOU_FOUND_THIS, BUTTON_SMASHER, USE_IT_WRONG, FOOTER_READER,
+    SERVER_EMOJIS_USED, UNIQUE_SERVER_EMOJIS, EMOJI_ARCHIVIST, MEMES_POSTED,
+    SALVAGE_TOTAL, SALVAGE_SPAWN_CAUGHT, SALVAGE_GIFTS_SENT, SALVAGE_GIFTS_RECEIVED,
+    SALVAGE_TRADES, SALVAGE_EPIC_TOTAL, SALVAGE_LEGENDARY_TOTAL, SALVAGE_RARE_50K_TOTAL,
+    SALVAGE_RARE_1M_TOTAL, SALVAGE_UNIQUE_VARIANTS_COUNT, SALVAGE_UNIQUE_RARITIES_COUNT,
+    SALVAGE_ALL_VARIANTS, SALVAGE_ALL_RARITIES, SALVAGE_ALT_VARIANT, BUGS_RESOLVED,
+)
+
 class CreateBingoCardModal(discord.ui.Modal, title="Create Bingo Card!"):
     row1 = discord.ui.TextInput(label="Row 1 (A - E)", placeholder=("A | B | C | D | E"))
     row2 = discord.ui.TextInput(label="Row 2", placeholder=("..."))
@@ -71,6 +93,8 @@ class CreateBingoCardModal(discord.ui.Modal, title="Create Bingo Card!"):
         }
 
         self.cog.save_bingo_cards(cards)
+        # render workers key their layers by the grid so they'd miss anyway, this frees ours
+        invalidate_card(card_key)
 
         await interaction.response.send_message(f"✅ **Bingo Card #{self.card_number} created!**")
 
@@ -98,7 +122,7 @@ class AchievementPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, BUTTON_SMASHER, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={BUTTON_SMASHER})
 
         return True
 
@@ -115,7 +139,7 @@ class AchievementPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, YOU_FOUND_THIS, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={YOU_FOUND_THIS})
 
         await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
 
@@ -128,7 +152,7 @@ class AchievementPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, YOU_FOUND_THIS, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={YOU_FOUND_THIS})
 
         await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
 
@@ -205,152 +229,89 @@ class Challenges(commands.Cog):
         self.bot = bot
         self.stats_store = stats_store
         self.achievement_engine: AchievementEngine = achievement_engine
+        self.achievement_engine.queue.ctx_builder = self.build_ctx
 
-    def load_challenges(self):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    # readonly loads come from the shared cache as frozen views and must not be
+    # modified; anything that edits and saves should take a fresh copy
+    def _load(self, path: Path, readonly: bool = False):
+        if readonly:
+            return json_cache.get(path, {})
+        return read_json(path, {})
 
-    def save_challenges(self, data):
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+    def _save(self, path: Path, data):
+        write_json(path, data, indent=2, sort_keys=True)
+        json_cache.invalidate(path)
+
+    def load_challenges(self, readonly: bool = False):
+        return self._load(DATA_FILE, readonly)
 
+    def save_challenges(self, data):
+        self._save(DATA_FILE, data)
 
-    def load_points(self):
-        if not POINTS_FILE.exists():
-            return {}
-        with open(POINTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_points(self, readonly: bool = False):
+        return self._load(POINTS_FILE, readonly)
 
     def save_points(self, points):
-        with open(POINTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(points, f, indent=2, sort_keys=True)
+        self._save(POINTS_FILE, points)
 
-    def load_achievements(self):
-        if not ACHIEVEMENTS_FILE.exists():
-            return {}
-        with open(ACHIEVEMENTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_achievements(self, readonly: bool = False):
+        return self._load(ACHIEVEMENTS_FILE, readonly)
 
     def save_achievements(self, achievements):
-        with open(ACHIEVEMENTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(achievements, f, indent=2, sort_keys=True)
+        self._save(ACHIEVEMENTS_FILE, achievements)
 
-    def load_volunteer_winners(self):
-        if not VOLUNTEER_FILE.exists():
-            return {}
-        with open(VOLUNTEER_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_volunteer_winners(self, readonly: bool = False):
+        return self._load(VOLUNTEER_FILE, readonly)
 
     def save_volunteer_winners(self, data):
-        with open(VOLUNTEER_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        self._save(VOLUNTEER_FILE, data)
 
-    def load_volunteer_votes(self):
-        if not VOTES_FILE.exists():
-            return {}
-        with open(VOTES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_volunteer_votes(self, readonly: bool = False):
+        return self._load(VOTES_FILE, readonly)
 
-    def load_bingo_progress(self):
-        if not BINGO_PROGRESS_FILE.exists():
-            return {}
-        with open(BINGO_PROGRESS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_bingo_progress(self, readonly: bool = False):
+        return self._load(BINGO_PROGRESS_FILE, readonly)
 
     def save_bingo_progress(self, data):
-        with open(BINGO_PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        self._save(BINGO_PROGRESS_FILE, data)
 
-    def load_bingo_cards(self):
-        if not BINGO_CARDS_FILE.exists():
-            return {}
-        try:
-            with open(BINGO_CARDS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except(json.JSONDecodeError, OSError):
-            return {}
+    def load_bingo_cards(self, readonly: bool = False):
+        return self._load(BINGO_CARDS_FILE, readonly)
 
     def save_bingo_cards(self, data):
-        tmp = BINGO_CARDS_FILE.with_suffix(".tmp")
-
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        self._save(BINGO_CARDS_FILE, data)
 
-        tmp.replace(BINGO_CARDS_FILE)
-
-    def load_bingo_suggestions(self):
-        if not BINGO_SUGGESTIONS_FILE.exists():
-            return {}
-        try:
-            with open(BINGO_SUGGESTIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except(json.JSONDecodeError, OSError):
-            return {}
+    def load_bingo_suggestions(self, readonly: bool = False):
+        return self._load(BINGO_SUGGESTIONS_FILE, readonly)
 
     def save_bingo_suggestions(self, data):
-        tmp = BINGO_SUGGESTIONS_FILE.with_suffix(".tmp")
-
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        self._save(BINGO_SUGGESTIONS_FILE, data)
 
-        tmp.replace(BINGO_SUGGESTIONS_FILE)
-
-
-    def load_challenge_suggestions(self):
-        if not CHALLENGE_SUGGESTIONS_FILE.exists():
-            return {}
-        try:
-            with open(CHALLENGE_SUGGESTIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except(json.JSONDecodeError, OSError):
-            return {}
+    def load_challenge_suggestions(self, readonly: bool = False):
+        return self._load(CHALLENGE_SUGGESTIONS_FILE, readonly)
 
     def save_challenge_suggestions(self, data):
-        tmp = CHALLENGE_SUGGESTIONS_FILE.with_suffix(".tmp")
+        self._save(CHALLENGE_SUGGESTIONS_FILE, data)
 
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
-
-        tmp.replace(CHALLENGE_SUGGESTIONS_FILE)
-    
-    def load_achievement_suggestions(self):
-        if not ACHIEVEMENT_SUGGESTIONS_FILE.exists():
-            return {}
-        try:
-            with open(ACHIEVEMENT_SUGGESTIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except(json.JSONDecodeError, OSError):
-            return {}
+    def load_achievement_suggestions(self, readonly: bool = False):
+        return self._load(ACHIEVEMENT_SUGGESTIONS_FILE, readonly)
 
     def save_achievement_suggestions(self, data):
-        tmp = ACHIEVEMENT_SUGGESTIONS_FILE.with_suffix(".tmp")
+        self._save(ACHIEVEMENT_SUGGESTIONS_FILE, data)
 
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+    def load_links(self, readonly: bool = False):
+        return self._load(LINKS_FILE, readonly)
 
-        tmp.replace(ACHIEVEMENT_SUGGESTIONS_FILE)
+    def load_stamp_cards(self, readonly: bool = False):
+        return self._load(STAMP_CARDS_FILE, readonly)
 
-    def load_links(self):
-        if not LINKS_FILE.exists():
-            return {}
-        with open(LINKS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def save_stamp_cards(self, data):
+        self._save(STAMP_CARDS_FILE, data)
 
 
-    def load_stamp_cards(self):
-        if not STAMP_CARDS_FILE.exists():
-            return {}
-        try:
-            with open(STAMP_CARDS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            return {}
-
-    def save_stamp_cards(self, data):
-        tmp = STAMP_CARDS_FILE.with_suffix(".tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
-        tmp.replace(STAMP_CARDS_FILE)
+    def processing_changed(self, user_id):
+        # lets the Processing cog update its pending index for this user
+        self.bot.dispatch("processing_source_changed", str(user_id))
 
 
     def calculate_streak(self, weeks: list[int]) -> int:
@@ -399,7 +360,7 @@ class Challenges(commands.Cog):
 
     def count_votes_given(self, user_id: str) -> int:
         user_id = str(user_id)
-        votes = self.load_volunteer_votes()
+        votes = self.load_volunteer_votes(readonly=True)
         total = 0
 
         for week_votes in votes.values():
@@ -410,7 +371,7 @@ class Challenges(commands.Cog):
 
     def count_votes_recieved(self, user_id) -> int:
         user_id = str(user_id)
-        votes = self.load_volunteer_votes()
+        votes = self.load_volunteer_votes(readonly=True)
 
         total = 0
 
@@ -516,8 +477,8 @@ class Challenges(commands.Cog):
     async def _format_user_summary(self, member: discord.Member) -> dict:
         user_id = str(member.id)
 
-        points_data = self.load_points()
-        achievements_data = self.load_achievements()
+        points_data = self.load_points(readonly=True)
+        achievements_data = self.load_achievements(readonly=True)
 
         weeks = [int(w) for w in points_data.get(user_id, [])]
 
@@ -574,7 +535,7 @@ class Challenges(commands.Cog):
             return f"{a} 🤝", f"{b} 🤝"
 
     async def _build_achievement_embeds(self, member: discord.Member):
-        achievement_data = self.load_achievements()
+        achievement_data = self.load_achievements(readonly=True)
         raw = achievement_data.get(str(member.id), {})
 
         if isinstance(raw, dict):
@@ -658,7 +619,7 @@ class Challenges(commands.Cog):
         return rarest_key, rarest_percent
 
     async def grant_achievement_role(self, member: discord.Member, role_name: str):
-        role = discord.utils.get(member.guild.roles, name=role_name)
+        role = guild_index.role(member.guild, role_name)
 
         if not role:
             return
@@ -672,7 +633,7 @@ class Challenges(commands.Cog):
             pass
 
     async def remove_achievement_role(self, member: discord.Member, role_name: str):
-        role = discord.utils.get(member.guild.roles, name=role_name)
+        role = guild_index.role(member.guild, role_name)
 
         if not role:
             return
@@ -686,24 +647,7 @@ class Challenges(commands.Cog):
             pass
 
     async def achievement_percentage(self, achievement_key: str, guild: discord.Guild) -> float:
-        data = self.load_achievements()
-        if not data:
-            return 0.0
-
-        total_users = guild.member_count
-        if total_users == 0:
-            return 0.0
-
-        earned_count = 0
-        for user_achs in data.values():
-            if isinstance(user_achs, dict):
-                if achievement_key in user_achs:
-                    earned_count += 1
-            elif isinstance(user_achs, list):
-                if achievement_key in user_achs:
-                    earned_count += 1
-
-        return round((earned_count / total_users) * 100.0, 1)
+        return self.achievement_engine.percentage(achievement_key, guild)
 
 
 
@@ -728,150 +672,146 @@ class Challenges(commands.Cog):
         return any(line <= completed for line in rows + cols + diags)
 
     def count_bingo_suggestions(self, user_id: str) -> int:
-        data = self.load_bingo_suggestions()
+        data = self.load_bingo_suggestions(readonly=True)
         return len(data.get(str(user_id), []))
 
     def count_challenge_suggestions(self, user_id: str) -> int:
-        data = self.load_challenge_suggestions()
+        data = self.load_challenge_suggestions(readonly=True)
         return len(data.get(str(user_id), []))
 
     def count_achievement_suggestions(self, user_id: str) -> int:
-        data = self.load_achievement_suggestions()
+        data = self.load_achievement_suggestions(readonly=True)
         return len(data.get(str(user_id), []))
     
-    async def get_user_invites_count(self, guild: discord.Guild, user: discord.Member) -> int:
+    def get_user_invites_count(self, guild: discord.Guild, user: discord.Member) -> int:
         if guild is None:
             return 0
 
-        try:
-            invites = await guild.invites()
-        except (discord.Forbidden, discord.HTTPException):
+        tracker = self.bot.get_cog("InviteTracker")
+        if tracker is None:
             return 0
 
-        uid = user.id
-        total = 0
-
-        for inv in invites:
-            if inv.inviter and inv.inviter.id == uid:
-                total += int(inv.uses or 0)
+        return tracker.count_for(guild, user.id)
 
-        return total
-
-    async def build_ctx(self, user: discord.Member):
+    async def build_ctx(self, user: discord.Member) -> LazyContext:
         user_id = str(user.id)
 
-        points_data = self.load_points()
-        weeks = [int(w) for w in points_data.get(user_id, [])]
-
-        current_streak = self.calculate_streak(weeks)
-        longest_streak = self.calculate_longest_streak(weeks)
-
-        stats_data = self.stats_store.get(user_id)
-
-        volunteer_data = self.load_volunteer_winners()
-        votw_wins = sum(1 for uid in volunteer_data.values() if uid == user_id)
-
-        curious = self.is_curious_ready(user_id) if not stats_data.get(CURIOUS_WINDOW_OK, False) else True
-
-        raw_earned = self.load_achievements().get(user_id, {})
-        if isinstance(raw_earned, dict):
-            earned_keys = list(raw_earned.keys())
-        elif isinstance(raw_earned, list):
-            earned_keys = list(raw_earned)
-        else:
-            earned_keys = []
-
-        hidden_count = self.count_hidden_achievements(earned_keys)
-
-        wordle_stats = self.get_wordle_stats(user_id)
-        make_ten_stats = self.get_make_ten_stats(user_id)
-
-        invites_count = await self.get_user_invites_count(user.guild, user)
-
-
-        return {
-            MEMBER: user,
-            USER_ID: str(user.id),
-            WEEKS: weeks,
-            TOTAL_CHALLENGES: len(weeks),
-            CURRENT_STREAK: current_streak,
-            LONGEST_STREAK: longest_streak,
-
-            MESSAGES: stats_data.get(MESSAGES, 0),
-            FILES: stats_data.get(FILES, 0),
-            EREUSE_REACTS: stats_data.get(EREUSE_REACTS, 0),
-            REACTIONS_GIVEN: stats_data.get(REACTIONS_GIVEN, 0),
-            COMMANDS_USED: stats_data.get(COMMANDS_USED, 0),
-            UNIQUE_COMMANDS: len(stats_data.get(UNIQUE_COMMANDS, [])),
-            COMMAND_USAGE: stats_data.get(COMMAND_USAGE, {}),
-            ANNOUNCEMENT_REACTS: stats_data.get(ANNOUNCEMENT_REACTS, 0),
-            BINGOS_COMPLETE: stats_data.get(BINGOS_COMPLETE, 0),
-            STAMP_CARDS_COMPLETE: stats_data.get(STAMP_CARDS_COMPLETE, 0),
-            BINGO_SUGGESTIONS: self.count_bingo_suggestions(user_id),
-            CHALLENGE_SUGGESTIONS: self.count_challenge_suggestions(user_id),
-            ACHIEVEMENT_SUGGESTIONS: self.count_achievement_suggestions(user_id),
-
-            VOICE_MINUTES: stats_data.get(VOICE_MINUTES, 0),
-            VOICE_SESSION_MAX: stats_data.get(VOICE_SESSION_MAX, 0),
-            VOICE_3P_MINUTES: stats_data.get(VOICE_3P_MINUTES, 0),
-            VOICE_5P_MINUTES: stats_data.get(VOICE_5P_MINUTES, 0),
-
-            VOTW_WINS: votw_wins,
-            VOTW_VOTES_CAST: self.count_votes_given(user.id),
-            VOTW_VOTES_RECIEVED: self.count_votes_recieved(user.id),
-
-            SIX_SEVEN: stats_data.get(SIX_SEVEN, 0),
-            ADMIN_VICTIM: stats_data.get(ADMIN_VICTIM, False),
-            HIDDEN_ACHIEVEMENTS_COUNT: hidden_count,
-
-            MAX_UNIQUE_REACTORS: stats_data.get(MAX_UNIQUE_REACTORS, 0),
-            MAX_REACTIONS_ON_MESSAGE: stats_data.get(MAX_REACTIONS_ON_MESSAGE, 0),
-            UNIQUE_USERS_REACTED_TO: len(stats_data.get(REACTED_USERS, [])),
-
-            CURIOUS_WINDOW_OK: curious,
-            YOU_FOUND_THIS: stats_data.get(YOU_FOUND_THIS, False),
-            BUTTON_SMASHER: stats_data.get(BUTTON_SMASHER, False),
-            USE_IT_WRONG: stats_data.get(USE_IT_WRONG, False),
-            FOOTER_READER: stats_data.get(FOOTER_READER, False),
-
-            LINKED_MINECRAFT: self.has_account_linked(user_id),
-
-            WORDLE_BEST_TURN: wordle_stats[WORDLE_BEST_TURN],
-            WORDLE_BEST_STREAK: wordle_stats[WORDLE_BEST_STREAK],
-            WORDLE_TOTAL_SOLVED: wordle_stats[WORDLE_TOTAL_SOLVED],
-
-            SERVER_EMOJIS_USED: stats_data.get(SERVER_EMOJIS_USED, 0),
-            UNIQUE_SERVER_EMOJIS: len(stats_data.get(UNIQUE_SERVER_EMOJIS, [])),
-            EMOJI_ARCHIVIST: stats_data.get(EMOJI_ARCHIVIST, False),
-
-            INVITES_COUNT: invites_count,
-            MEMES_POSTED: stats_data.get(MEMES_POSTED, 0),
-
-            SALVAGE_TOTAL: stats_data.get(SALVAGE_TOTAL, 0),
-            SALVAGE_SPAWN_CAUGHT: stats_data.get(SALVAGE_SPAWN_CAUGHT, 0),
-            SALVAGE_GIFTS_SENT: stats_data.get(SALVAGE_GIFTS_SENT, 0),
-            SALVAGE_GIFTS_RECEIVED: stats_data.get(SALVAGE_GIFTS_RECEIVED, 0),
-            SALVAGE_TRADES: stats_data.get(SALVAGE_TRADES, 0),
-
-            SALVAGE_EPIC_TOTAL: stats_data.get(SALVAGE_EPIC_TOTAL, 0),
-            SALVAGE_LEGENDARY_TOTAL: stats_data.get(SALVAGE_LEGENDARY_TOTAL, 0),
-            SALVAGE_RARE_50K_TOTAL: stats_data.get(SALVAGE_RARE_50K_TOTAL, 0),
-            SALVAGE_RARE_1M_TOTAL: stats_data.get(SALVAGE_RARE_1M_TOTAL, 0),
-
-            SALVAGE_UNIQUE_VARIANTS_COUNT: len(stats_data.get(SALVAGE_UNIQUE_VARIANTS, [])),
-            SALVAGE_UNIQUE_RARITIES_COUNT: len(stats_data.get(SALVAGE_UNIQUE_RARITIES, [])),
-            SALVAGE_ALL_VARIANTS: len(stats_data.get(SALVAGE_UNIQUE_VARIANTS, [])) >= len({v for v, _w in VARIANT_WEIGHTS}),
-            SALVAGE_ALL_RARITIES: len(stats_data.get(SALVAGE_UNIQUE_RARITIES, [])) >= len(RARITY_ORDER),
-            SALVAGE_ALT_VARIANT: any(v != "Normal" for v in stats_data.get(SALVAGE_UNIQUE_VARIANTS, [])),
-
-            BUGS_RESOLVED: stats_data.get(BUGS_RESOLVED, 0),
-
-            MAKE_TEN_TOTAL_PLAYED: make_ten_stats[MAKE_TEN_TOTAL_PLAYED],
-            MAKE_TEN_TOTAL_SOLVED: make_ten_stats[MAKE_TEN_TOTAL_SOLVED],
-            MAKE_TEN_BEST_STREAK: make_ten_stats[MAKE_TEN_BEST_STREAK],
-            MAKE_TEN_FASTEST_SOLVE_SECONDS: make_ten_stats[MAKE_TEN_FASTEST_SOLVE_SECONDS],
-            MAKE_TEN_EARLY_BIRD_SOLVES: make_ten_stats[MAKE_TEN_EARLY_BIRD_SOLVES]
-        }
+        def points_group():
+            points_data = self.load_points(readonly=True)
+            weeks = [int(w) for w in points_data.get(user_id, [])]
+            return {
+                WEEKS: weeks,
+                TOTAL_CHALLENGES: len(weeks),
+                CURRENT_STREAK: self.calculate_streak(weeks),
+                LONGEST_STREAK: self.calculate_longest_streak(weeks),
+            }
+
+        def stats_group():
+            stats_data = self.stats_store.get(user_id)
+            unique_variants = stats_data.get(SALVAGE_UNIQUE_VARIANTS, [])
+            unique_rarities = stats_data.get(SALVAGE_UNIQUE_RARITIES, [])
+
+            return {
+                MESSAGES: stats_data.get(MESSAGES, 0),
+                FILES: stats_data.get(FILES, 0),
+                EREUSE_REACTS: stats_data.get(EREUSE_REACTS, 0),
+                REACTIONS_GIVEN: stats_data.get(REACTIONS_GIVEN, 0),
+                COMMANDS_USED: stats_data.get(COMMANDS_USED, 0),
+                UNIQUE_COMMANDS: len(stats_data.get(UNIQUE_COMMANDS, [])),
+                COMMAND_USAGE: stats_data.get(COMMAND_USAGE, {}),
+                ANNOUNCEMENT_REACTS: stats_data.get(ANNOUNCEMENT_REACTS, 0),
+                BINGOS_COMPLETE: stats_data.get(BINGOS_COMPLETE, 0),
+                STAMP_CARDS_COMPLETE: stats_data.get(STAMP_CARDS_COMPLETE, 0),
+
+                VOICE_MINUTES: stats_data.get(VOICE_MINUTES, 0),
+                VOICE_SESSION_MAX: stats_data.get(VOICE_SESSION_MAX, 0),
+                VOICE_3P_MINUTES: stats_data.get(VOICE_3P_MINUTES, 0),
+                VOICE_5P_MINUTES: stats_data.get(VOICE_5P_MINUTES, 0),
+
+                SIX_SEVEN: stats_data.get(SIX_SEVEN, 0),
+                ADMIN_VICTIM: stats_data.get(ADMIN_VICTIM, False),
+
+                MAX_UNIQUE_REACTORS: stats_data.get(MAX_UNIQUE_REACTORS, 0),
+                MAX_REACTIONS_ON_MESSAGE: stats_data.get(MAX_REACTIONS_ON_MESSAGE, 0),
+                UNIQUE_USERS_REACTED_TO: len(stats_data.get(REACTED_USERS, [])),
+
+                YOU_FOUND_THIS: stats_data.get(YOU_FOUND_THIS, False),
+                BUTTON_SMASHER: stats_data.get(BUTTON_SMASHER, False),
+                USE_IT_WRONG: stats_data.get(USE_IT_WRONG, False),
+                FOOTER_READER: stats_data.get(FOOTER_READER, False),
+
+                SERVER_EMOJIS_USED: stats_data.get(SERVER_EMOJIS_USED, 0),
+                UNIQUE_SERVER_EMOJIS: len(stats_data.get(UNIQUE_SERVER_EMOJIS, [])),
+                EMOJI_ARCHIVIST: stats_data.get(EMOJI_ARCHIVIST, False),
+
+                MEMES_POSTED: stats_data.get(MEMES_POSTED, 0),
+
+                SALVAGE_TOTAL: stats_data.get(SALVAGE_TOTAL, 0),
+                SALVAGE_SPAWN_CAUGHT: stats_data.get(SALVAGE_SPAWN_CAUGHT, 0),
+                SALVAGE_GIFTS_SENT: stats_data.get(SALVAGE_GIFTS_SENT, 0),
+                SALVAGE_GIFTS_RECEIVED: stats_data.get(SALVAGE_GIFTS_RECEIVED, 0),
+                SALVAGE_TRADES: stats_data.get(SALVAGE_TRADES, 0),
+
+                SALVAGE_EPIC_TOTAL: stats_data.get(SALVAGE_EPIC_TOTAL, 0),
+                SALVAGE_LEGENDARY_TOTAL: stats_data.get(SALVAGE_LEGENDARY_TOTAL, 0),
+                SALVAGE_RARE_50K_TOTAL: stats_data.get(SALVAGE_RARE_50K_TOTAL, 0),
+                SALVAGE_RARE_1M_TOTAL: stats_data.get(SALVAGE_RARE_1M_TOTAL, 0),
+
+                SALVAGE_UNIQUE_VARIANTS_COUNT: len(unique_variants),
+                SALVAGE_UNIQUE_RARITIES_COUNT: len(unique_rarities),
+                SALVAGE_ALL_VARIANTS: len(unique_variants) >= len({v for v, _w in VARIANT_WEIGHTS}),
+                SALVAGE_ALL_RARITIES: len(unique_rarities) >= len(RARITY_ORDER),
+                SALVAGE_ALT_VARIANT: any(v != "Normal" for v in unique_variants),
+
+                BUGS_RESOLVED: stats_data.get(BUGS_RESOLVED, 0),
+            }
+
+        def curious_group():
+            stats_data = self.stats_store.get(user_id)
+            curious = self.is_curious_ready(user_id) if not stats_data.get(CURIOUS_WINDOW_OK, False) else True
+            return {CURIOUS_WINDOW_OK: curious}
+
+        def votw_wins_group():
+            volunteer_data = self.load_volunteer_winners(readonly=True)
+            return {VOTW_WINS: sum(1 for uid in volunteer_data.values() if uid == user_id)}
+
+        def votes_group():
+            return {
+                VOTW_VOTES_CAST: self.count_votes_given(user_id),
+                VOTW_VOTES_RECIEVED: self.count_votes_recieved(user_id),
+            }
+
+        def hidden_group():
+            raw_earned = self.load_achievements(readonly=True).get(user_id, {})
+            if isinstance(raw_earned, dict):
+                earned_keys = list(raw_earned.keys())
+            elif isinstance(raw_earned, list):
+                earned_keys = list(raw_earned)
+            else:
+                earned_keys = []
+            return {HIDDEN_ACHIEVEMENTS_COUNT: self.count_hidden_achievements(earned_keys)}
+
+        return LazyContext(
+            {
+                MEMBER: user,
+                USER_ID: user_id,
+            },
+            [
+                ((INVITES_COUNT,), lambda: {INVITES_COUNT: self.get_user_invites_count(user.guild, user)}),
+                (POINTS_CTX_KEYS, points_group),
+                (STATS_CTX_KEYS, stats_group),
+                ((CURIOUS_WINDOW_OK,), curious_group),
+                ((VOTW_WINS,), votw_wins_group),
+                ((VOTW_VOTES_CAST, VOTW_VOTES_RECIEVED), votes_group),
+                ((HIDDEN_ACHIEVEMENTS_COUNT,), hidden_group),
+                ((BINGO_SUGGESTIONS,), lambda: {BINGO_SUGGESTIONS: self.count_bingo_suggestions(user_id)}),
+                ((CHALLENGE_SUGGESTIONS,), lambda: {CHALLENGE_SUGGESTIONS: self.count_challenge_suggestions(user_id)}),
+                ((ACHIEVEMENT_SUGGESTIONS,), lambda: {ACHIEVEMENT_SUGGESTIONS: self.count_achievement_suggestions(user_id)}),
+                ((LINKED_MINECRAFT,), lambda: {LINKED_MINECRAFT: self.has_account_linked(user_id)}),
+                (WORDLE_CTX_KEYS, lambda: self.get_wordle_stats(user_id)),
+                (MAKE_TEN_CTX_KEYS, lambda: self.get_make_ten_stats(user_id)),
+            ],
+        )
 
 
 
@@ -915,7 +855,7 @@ class Challenges(commands.Cog):
 
     def has_account_linked(self, user_id: str) -> bool:
         user_id = str(user_id)
-        data = self.load_links()
+        data = self.load_links(readonly=True)
         user_entry = data.get(user_id, {})
 
         if user_entry.get("java" , None) or user_entry.get("bedrock", None):
@@ -925,12 +865,7 @@ class Challenges(commands.Cog):
     def get_wordle_stats(self, user_id: str) -> dict:
         user_id = str(user_id)
         
-        wordle_state = {}
-        try:
-            with open(Path(WORDLE_STATS_PATH), "r", encoding="utf-8") as f:
-                wordle_state = json.load(f)
-        except FileNotFoundError:
-            wordle_state = {"users": {}}
+        wordle_state = json_cache.get(WORDLE_STATS_PATH, {"users": {}})
 
         wordle_user = (wordle_state.get("users") or {}).get(user_id, {})
         wordle_best_turn = wordle_user.get("best_turn")
@@ -946,12 +881,7 @@ class Challenges(commands.Cog):
     def get_make_ten_stats(self, user_id: str) -> dict:
         user_id = str(user_id)
 
-        make_ten_state = {}
-        try:
-            with open(Path(MAKE_TEN_PATH), "r", encoding="utf-8") as f:
-                make_ten_state = json.load(f)
-        except FileNotFoundError:
-            make_ten_state = {"users": {}}
+        make_ten_state = json_cache.get(MAKE_TEN_PATH, {"users": {}})
 
         make_ten_user = (make_ten_state.get("users") or {}).get(user_id, {})
 
@@ -999,22 +929,13 @@ class Challenges(commands.Cog):
     @commands.Cog.listener()
     async def on_app_command_completion(self, interaction: discord.Interaction, command: app_commands.Command):
         user_id = str(interaction.user.id)
-        self.stats_store.bump(user_id, COMMANDS_USED, 1)
-
-        stats = self.stats_store.all()
-        user = stats.setdefault(user_id, {})
-
-        unique = set(user.get(UNIQUE_COMMANDS, []))
-        unique.add(command.name)
-        user[UNIQUE_COMMANDS] = list(unique)
-
-        usage = stats.get(user_id).setdefault(COMMAND_USAGE, {})
-        usage[command.name] = usage.get(command.name, 0) + 1
+        with self.stats_store.update(user_id) as tx:
+            tx.bump(COMMANDS_USED, 1)
+            tx.set_add(UNIQUE_COMMANDS, command.name)
+            tx.bump_map(COMMAND_USAGE, command.name, 1)
 
-        self.stats_store.save(stats)
-
-        ctx = await self.build_ctx(interaction.user)
-        await self.achievement_engine.evaluate(ctx)
+        if isinstance(interaction.user, discord.Member):
+            self.achievement_engine.enqueue(interaction.user, tx.fields)
 
     @app_commands.command(name="sendchallenges", description="Send a random challenge to all the weekly challengers through DM's")
     @app_commands.describe(week="Week Number (e.g. 5)")
@@ -1033,7 +954,7 @@ class Challenges(commands.Cog):
             await interaction.followup.send("Run this in a server.", ephemeral=True)
             return
 
-        role = discord.utils.get(guild.roles, name=WEEKLY_CHALLENGE_ROLE)
+        role = guild_index.role(guild, WEEKLY_CHALLENGE_ROLE)
         if not role:
             await interaction.followup.send(f"❌ {WEEKLY_CHALLENGE_ROLE} does not exist", ephemeral=True)
             return
@@ -1178,7 +1099,7 @@ class Challenges(commands.Cog):
         await interaction.response.defer()
 
         guild = interaction.guild
-        role = discord.utils.get(guild.roles, name=WEEKLY_CHALLENGE_ROLE)
+        role = guild_index.role(guild, WEEKLY_CHALLENGE_ROLE)
 
         if not role:
             await interaction.followup.send(f"❌ {WEEKLY_CHALLENGE_ROLE} does not exist")
@@ -1261,6 +1182,7 @@ class Challenges(commands.Cog):
         weeks.add(week)
         data[user_id] = sorted(weeks)
         self.save_points(data)
+        self.processing_changed(user_id)
 
         streak = self.calculate_streak(list(weeks))
 
@@ -1271,7 +1193,7 @@ class Challenges(commands.Cog):
             )
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed=POINTS_CTX_KEYS)
 
         await self.log_action(
             guild=interaction.guild,
@@ -1316,11 +1238,12 @@ class Challenges(commands.Cog):
         weeks.remove(week)
         data[user_id] = sorted(weeks)
         self.save_points(data)
+        self.processing_changed(user_id)
 
         self.stats_store.set_value(user_id, ADMIN_VICTIM, True)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={*POINTS_CTX_KEYS, ADMIN_VICTIM})
 
         await self.log_action(
             guild=interaction.guild,
@@ -1355,6 +1278,7 @@ class Challenges(commands.Cog):
 
 
         self.save_points(data)
+        self.processing_changed(user_id)
 
         await self.log_action(
             guild=interaction.guild,
@@ -1378,25 +1302,13 @@ class Challenges(commands.Cog):
     async def reset_achievements(self, interaction: discord.Interaction, user: discord.Member):
         await interaction.response.defer(ephemeral=True)
 
-        data = self.load_achievements()
-        user_id = str(user.id)
-
-        raw = data.get(user_id, {})
-        if isinstance(raw, dict):
-            earned_keys = list(raw.keys())
-        elif isinstance(raw, list):
-            earned_keys = list(raw)
-        else:
-            earned_keys = []
+        earned_keys = self.achievement_engine.reset_user(user.id)
 
         for key in earned_keys:
             role_name = ACHIEVEMENTS.get(key, {}).get("role")
             if role_name:
                 await self.remove_achievement_role(user, role_name)
 
-        data.pop(user_id, None)
-        self.save_achievements(data)
-
         await self.log_action(
             guild=interaction.guild,
             message=f"⚒️ {interaction.user.mention} reset all of {user.mention}'s achievements"
@@ -1409,6 +1321,50 @@ class Challenges(commands.Cog):
         )
 
 
+    @app_commands.command(name="achievementqueue", description="Show the background achievement evaluation queue")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @admin_meta(
+        permissions="Administrator",
+        affects=["Achievements"],
+        notes="Queue depth, lag and counters for achievement evaluation"
+    )
+    async def achievement_queue(self, interaction: discord.Interaction):
+        q = self.achievement_engine.queue.stats()
+
+        await interaction.response.send_message(
+            f"📥 Waiting: **{q['depth']}** users ({q['ready']} ready, {q['in_flight']} running on {q['workers']} workers)\n"
+            f"⏱️ Oldest wait: **{q['oldest_wait']}s** | Last lag: **{q['last_lag']}s** | Max lag: **{q['max_lag']}s**\n"
+            f"📊 Events: **{q['enqueued']}** | Evaluations: **{q['evaluated']}** | Failed: **{q['failed']}**\n"
+            f"🔍 Checks run: **{self.achievement_engine.checks_run}**",
+            ephemeral=True
+        )
+
+
+    @app_commands.command(name="bingocache", description="Show bingo render cache stats")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @admin_meta(
+        permissions="Administrator",
+        affects=["Bingo"],
+        notes="Hit rates for cached bingo card images and avatars, and render times"
+    )
+    async def bingo_cache(self, interaction: discord.Interaction):
+        cards = bingo_png_cache.stats()
+        avatars = avatar_cache.stats()
+        render = render_service.stats().get("BingoCardSpec")
+
+        msg = (
+            f"🖼️ Cards: **{cards['entries']}** cached ({cards['bytes'] // 1024} KB) | "
+            f"Hits: **{cards['hits']}** | Misses: **{cards['misses']}** | Hit rate: **{cards['hit_rate']:.0%}**\n"
+            f"👤 Avatars: **{avatars['hits']}** disk hits | **{avatars['misses']}** fetched | **{avatars['errors']}** failed"
+        )
+        if render:
+            msg += f"\n⏱️ Renders: **{render['jobs']}** | Avg: **{render['avg_ms']}ms** | Max: **{render['max_ms']}ms**"
+
+        await interaction.response.send_message(msg, ephemeral=True)
+
+
     @app_commands.command(name="challengepoints", description="Check a users weekly challenge points")
     @app_commands.describe(user="Whose points to check")
     async def challenge_points(self, interaction: discord.Interaction, user: discord.Member):
@@ -1417,7 +1373,7 @@ class Challenges(commands.Cog):
         if user.bot:
             self.stats_store.set_value(str(interaction.user.id), USE_IT_WRONG, True)
             ctx = await self.build_ctx(interaction.user)
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={USE_IT_WRONG})
 
         data = self.load_points()
         user_id = str(user.id)
@@ -1497,18 +1453,7 @@ class Challenges(commands.Cog):
         total_achievements = sum(user_ach_count(v) for v in achievements.values())
         avg_achievements = round(total_achievements / total_achievement_particiants, 2) if total_achievement_particiants else 0
 
-        achievements_counts: dict[str, int] = {}
-        for user_achs in achievements.values():
-            if isinstance(user_achs, dict):
-                keys = user_achs.keys()
-            elif isinstance(user_achs, list):
-                keys = user_achs
-            else:
-                keys = []
-
-            for key in keys:
-                key = str(key)
-                achievements_counts[key] = achievements_counts.get(key, 0) + 1
+        achievements_counts = dict(self.achievement_engine.earned_counts)
 
         most_common_ach = max(achievements_counts, key=achievements_counts.get, default=None)
         rarest_ach = min(achievements_counts, key=achievements_counts.get, default=None)
@@ -1540,7 +1485,7 @@ class Challenges(commands.Cog):
             member = guild.get_member(int(uid)) if uid else None
             return member.mention if member else "-"
 
-        emoji = discord.utils.get(interaction.guild.emojis, name="eReuse") or "📊"
+        emoji = guild_index.emoji(interaction.guild, "eReuse") or "📊"
 
         embed = discord.Embed(
             title=f"{emoji} **eReuse** Server Stats",
@@ -1615,7 +1560,7 @@ class Challenges(commands.Cog):
 
         self.stats_store.set_value(str(interaction.user.id), LAST_SERVERSTATS_AT, self._now_iso())
         ctx = await self.build_ctx(interaction.user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={LAST_SERVERSTATS_AT})
 
         await interaction.followup.send(embed=embed, allowed_mentions=discord.AllowedMentions(users=False))
 
@@ -1629,7 +1574,7 @@ class Challenges(commands.Cog):
         if user and user.id == interaction.user.id:
             self.stats_store.set_value(str(interaction.user.id), USE_IT_WRONG, True)
             ctx = await self.build_ctx(interaction.user)
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={USE_IT_WRONG})
 
         target = user or interaction.user
 
@@ -1722,9 +1667,10 @@ class Challenges(commands.Cog):
 
         winners[week_key] = str(user.id)
         self.save_volunteer_winners(winners)
+        self.processing_changed(user.id)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={VOTW_WINS})
 
         await self.log_action(
             guild=interaction.guild,
@@ -1752,10 +1698,11 @@ class Challenges(commands.Cog):
         winners = self.load_volunteer_winners()
         week_key = str(week)
 
-        if week_key in winners:
-            del winners[week_key]
+        previous = winners.pop(week_key, None)
 
         self.save_volunteer_winners(winners)
+        if previous:
+            self.processing_changed(previous)
 
         await self.log_action(
             guild=interaction.guild,
@@ -1796,7 +1743,7 @@ class Challenges(commands.Cog):
         if user and user.id == interaction.user.id:
             self.stats_store.set_value(str(interaction.user.id), USE_IT_WRONG, True)
             ctx = await self.build_ctx(interaction.user)
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={USE_IT_WRONG})
 
         member = user or interaction.user
 
@@ -1878,7 +1825,7 @@ class Challenges(commands.Cog):
 
         self.stats_store.set_value(str(interaction.user.id), LAST_PROFILE_AT, self._now_iso())
         ctx = await self.build_ctx(interaction.user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={LAST_PROFILE_AT})
 
 
         await interaction.followup.send(embed=embed)
@@ -1892,7 +1839,7 @@ class Challenges(commands.Cog):
         if user1.bot or user2.bot or user1.id == user2.id:
             self.stats_store.set_value(str(interaction.user.id), USE_IT_WRONG, True)
             ctx = await self.build_ctx(interaction.user)
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={USE_IT_WRONG})
 
         a = await self._format_user_summary(user1)
         b = await self._format_user_summary(user2)
@@ -1969,7 +1916,7 @@ class Challenges(commands.Cog):
 
         self.stats_store.set_value(str(interaction.user.id), LAST_COMPARE_AT, self._now_iso())
         ctx = await self.build_ctx(interaction.user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={LAST_COMPARE_AT})
 
         await interaction.followup.send(embed=embed)
 
@@ -2021,6 +1968,7 @@ class Challenges(commands.Cog):
 
         card_data["completed"].append(tile)
         self.save_bingo_progress(progress)
+        self.processing_changed(user_id)
 
         if self.has_bingo(set(card_data["completed"])):
             self.stats_store.bump(str(user.id), BINGOS_COMPLETE, 1)
@@ -2029,7 +1977,7 @@ class Challenges(commands.Cog):
                 await channel.send(f"## Congrats to {user.mention} for completing the bingo card {card_number} 🥳🎉", silent=True)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={BINGOS_COMPLETE})
 
         await self.log_action(message= f"⚒️ {interaction.user.mention} marked {user.mention}'s bingo tile {tile} for card **{card_number}** complete", guild=interaction.guild)
 
@@ -2087,6 +2035,7 @@ class Challenges(commands.Cog):
             progress[user_id] = user_data
 
         self.save_bingo_progress(progress)
+        self.processing_changed(user_id)
 
         is_bingo = self.has_bingo(set(card_data.get("completed", [])))
 
@@ -2096,7 +2045,7 @@ class Challenges(commands.Cog):
         self.stats_store.set_value(user_id, ADMIN_VICTIM, True)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={BINGOS_COMPLETE, ADMIN_VICTIM})
 
         await self.log_action(
             guild=interaction.guild,
@@ -2160,10 +2109,14 @@ class Challenges(commands.Cog):
 
         grid = cards[key]["grid"]
 
-        image_path = render_bingo_card(key, grid, [], None)
+        try:
+            data = await render_card(key, grid, [], None)
+        except asyncio.TimeoutError:
+            await interaction.followup.send("❌ Rendering the bingo card took too long, try again in a bit", ephemeral=True)
+            return
 
         await interaction.followup.send(
-            file=discord.File(image_path)
+            file=discord.File(BytesIO(data), filename=f"bingo_{key}.png")
         )
 
     @app_commands.command(name="bingo", description="View someones bingo card")
@@ -2174,7 +2127,7 @@ class Challenges(commands.Cog):
         if user and user.id == interaction.id:
             self.stats_store.set_value(str(interaction.user.id), USE_IT_WRONG, True)
             ctx = await self.build_ctx(interaction.user)
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={USE_IT_WRONG})
 
         user = user or interaction.user
 
@@ -2191,9 +2144,14 @@ class Challenges(commands.Cog):
         progress = self.load_bingo_progress()
         completed = progress.get(str(user.id), {}).get(card_key, {}).get("completed", [])
 
-        image_path = render_bingo_card(card_key, cards[card_key]["grid"], completed, user)
+        try:
+            data = await render_card(card_key, cards[card_key]["grid"], completed, user)
+        except asyncio.TimeoutError:
+            await interaction.followup.send("❌ Rendering the bingo card took too long, try again in a bit", ephemeral=True)
+            return
+
         await interaction.followup.send(
-            file=discord.File(image_path)
+            file=discord.File(BytesIO(data), filename=f"bingo_{card_key}.png")
         )
 
 
@@ -2212,6 +2170,9 @@ class Challenges(commands.Cog):
 
         self.save_bingo_suggestions(data)
 
+        if isinstance(interaction.user, discord.Member):
+            self.achievement_engine.enqueue(interaction.user, {BINGO_SUGGESTIONS})
+
         await self.log_action(
             interaction.guild,
             f"🧩 {interaction.user.mention} suggested a bingo tile: `{text}`"
@@ -2235,6 +2196,9 @@ class Challenges(commands.Cog):
 
         self.save_challenge_suggestions(data)
 
+        if isinstance(interaction.user, discord.Member):
+            self.achievement_engine.enqueue(interaction.user, {CHALLENGE_SUGGESTIONS})
+
         await self.log_action(
             interaction.guild,
             f"🧩 {interaction.user.mention} suggested a weekly challenge: `{text}`"
@@ -2545,13 +2509,14 @@ class Challenges(commands.Cog):
         entry["cards"] = cards
         data[uid] = entry
         self.save_stamp_cards(data)
+        self.processing_changed(uid)
 
         completed_count = len(cards)
 
         self.stats_store.set_value(uid, STAMP_CARDS_COMPLETE, completed_count)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={STAMP_CARDS_COMPLETE})
 
         await self.log_action(
             guild=guild,
@@ -2751,6 +2716,7 @@ class Challenges(commands.Cog):
             data[uid] = entry
 
         self.save_stamp_cards(data)
+        self.processing_changed(uid)
 
         completed_count = len(cards)
         self.stats_store.set_value(uid, STAMP_CARDS_COMPLETE, completed_count)
@@ -2758,7 +2724,7 @@ class Challenges(commands.Cog):
         self.stats_store.set_value(uid, ADMIN_VICTIM, True)
 
         ctx = await self.build_ctx(user)
-        await self.achievement_engine.evaluate(ctx)
+        await self.achievement_engine.evaluate(ctx, changed={STAMP_CARDS_COMPLETE, ADMIN_VICTIM})
 
         removed_label = f"#{card_num}" if card_num is not None else f"`{card_key}`"
         removed_pretty = pretty(removed_ts) if removed_ts else "unknown time"
@@ -11,6 +11,10 @@ from helpers.stats import StatsStore
 from helpers.achievement_engine import AchievementEngine
 from helpers.admin import admin_meta, is_admin
 from helpers.meme import is_meme_message
+from helpers.persistence import persistence
+from helpers.datastore import shared_datastore, export_zip
+import asyncio
+from io import BytesIO
 
 BUGS_FILE = Path(BUGS_PATH)
 
@@ -18,19 +22,10 @@ def now() -> int:
     return int(time.time())
 
 def load_json(path: Path, default = {}):
-    if not path.exists():
-        return default
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return default
-    try:
-        return json.loads(raw)
-    except Exception:
-        return default
+    return persistence.read_json(path, default)
 
 def save_json(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    persistence.write_json(path, data, indent=2, ensure_ascii=False)
 
 
 class BugReportModal(discord.ui.Modal):
@@ -250,7 +245,7 @@ class General(commands.Cog):
             challenges = self.bot.get_cog("Challenges")
             ctx = await challenges.build_ctx(message.author)
 
-            await self.achievement_engine.evaluate(ctx)
+            await self.achievement_engine.evaluate(ctx, changed={MEMES_POSTED})
         except Exception:
             pass
 
@@ -422,11 +417,38 @@ class General(commands.Cog):
                 challenges = self.bot.get_cog("Challenges")
                 ctx = await challenges.build_ctx(reporter_member)
 
-                await self.achievement_engine.evaluate(ctx)
+                await self.achievement_engine.evaluate(ctx, changed={BUGS_RESOLVED})
             except Exception:
                 pass
 
 
+    @app_commands.command(name="exportdata", description="Export the bot's database as JSON files")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @admin_meta(
+        permissions="Administrator",
+        affects=["Stats Tracking", "Salvage"],
+        notes="Zip of everything in the database (user stats, salvage ownership) in the old data/*.json format"
+    )
+    async def export_data(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        store = shared_datastore()
+        if store is None:
+            await interaction.followup.send("The database is turned off, everything is already in `data/*.json`.", ephemeral=True)
+            return
+
+        # queued row writes first, so the export has everything up to now
+        await persistence.flush()
+        data = await asyncio.to_thread(export_zip, store)
+
+        await interaction.followup.send(
+            "📦 Database export",
+            file=discord.File(BytesIO(data), filename=f"ereuse_export_{now()}.zip"),
+            ephemeral=True
+        )
+
+
 
 async def setup(bot, stats_store: StatsStore, achievement_engine: AchievementEngine):
     await bot.add_cog(General(bot, stats_store, achievement_engine))
\ No newline at end of file
@@ -10,8 +10,8 @@ from cogs.verify import VerifyStore
 verify_store = VerifyStore(VERIFY_PATH)
 ALLOWED_UNVERIFIED = {"verify", "verifyfinish", "help"}
 
-def _is_verified(member: discord.Member) -> bool:
-    return any(r.name == VERIFY_ROLE for r in member.roles) or verify_store.is_verified(member.id)
+async def _is_verified(member: discord.Member) -> bool:
+    return any(r.name == VERIFY_ROLE for r in member.roles) or await verify_store.is_verified(member.id)
 
 
 class HelpPages(discord.ui.View):
@@ -38,7 +38,7 @@ class HelpPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, BUTTON_SMASHER, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={BUTTON_SMASHER})
 
         return True
 
@@ -56,7 +56,7 @@ class HelpPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, YOU_FOUND_THIS, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={YOU_FOUND_THIS})
 
         await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
 
@@ -69,7 +69,7 @@ class HelpPages(discord.ui.View):
             challenges_cog.stats_store.set_value(self.viewer_id, YOU_FOUND_THIS, True)
 
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={YOU_FOUND_THIS})
 
         await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
 
@@ -85,7 +85,7 @@ class Help(commands.Cog):
 
         grouped_commands = defaultdict(list)
         member = interaction.user
-        is_verified = isinstance(member, discord.Member) and _is_verified(member)
+        is_verified = isinstance(member, discord.Member) and await _is_verified(member)
 
         for command in self.bot.tree.walk_commands():
             if not is_verified and command.name not in ALLOWED_UNVERIFIED:
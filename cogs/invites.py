@@ -0,0 +1,114 @@
+import discord
+from discord.ext import commands, tasks
+from constants import INVITE_REFRESH_MINUTES, INVITES_COUNT
+
+
+class InviteTracker(commands.Cog):
+    # Keeps invite use counts per inviter in memory so nothing has to call
+    # guild.invites() per event. Invites are fetched once when the bot is ready,
+    # kept up to date from the invite/join events, and fully refetched every
+    # INVITE_REFRESH_MINUTES in case an event was missed.
+
+    def __init__(self, bot):
+        self.bot = bot
+
+        # guild id -> invite code -> (inviter id, uses)
+        self.invites: dict[int, dict[str, tuple[int | None, int]]] = {}
+        # guild id -> inviter id -> total uses
+        self.counts: dict[int, dict[int, int]] = {}
+
+        self.refresh_loop.start()
+
+    def cog_unload(self):
+        self.refresh_loop.cancel()
+
+    def count_for(self, guild: discord.Guild, user_id: int) -> int:
+        if guild is None:
+            return 0
+        return self.counts.get(guild.id, {}).get(int(user_id), 0)
+
+    def leaderboard(self, guild: discord.Guild, limit: int = 10) -> list[tuple[int, int]]:
+        counts = self.counts.get(guild.id, {})
+        return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+    def _bump(self, guild_id: int, inviter_id: int | None, amount: int):
+        if inviter_id is None or not amount:
+            return
+
+        counts = self.counts.setdefault(guild_id, {})
+        counts[inviter_id] = counts.get(inviter_id, 0) + amount
+        if counts[inviter_id] <= 0:
+            counts.pop(inviter_id)
+
+    def _set_invite(self, guild_id: int, code: str, inviter_id: int | None, uses: int):
+        invites = self.invites.setdefault(guild_id, {})
+        old_inviter, old_uses = invites.get(code, (None, 0))
+        self._bump(guild_id, old_inviter, -old_uses)
+
+        invites[code] = (inviter_id, uses)
+        self._bump(guild_id, inviter_id, uses)
+
+    def _remove_invite(self, guild_id: int, code: str):
+        inviter_id, uses = self.invites.get(guild_id, {}).pop(code, (None, 0))
+        self._bump(guild_id, inviter_id, -uses)
+
+    async def refresh_guild(self, guild: discord.Guild) -> set[int]:
+        # refetch and diff against what we had, returns inviters whose count went up
+        try:
+            invites = await guild.invites()
+        except (discord.Forbidden, discord.HTTPException):
+            return set()
+
+        before = dict(self.counts.get(guild.id, {}))
+        fresh = {inv.code: (inv.inviter.id if inv.inviter else None, int(inv.uses or 0)) for inv in invites}
+
+        for code in set(self.invites.get(guild.id, {})) - set(fresh):
+            self._remove_invite(guild.id, code)
+        for code, (inviter_id, uses) in fresh.items():
+            self._set_invite(guild.id, code, inviter_id, uses)
+
+        after = self.counts.get(guild.id, {})
+        return {uid for uid, n in after.items() if n > before.get(uid, 0)}
+
+    async def evaluate_inviters(self, guild: discord.Guild, inviter_ids: set[int]):
+        challenges_cog = self.bot.get_cog("Challenges")
+        if not challenges_cog:
+            return
+
+        for uid in inviter_ids:
+            member = guild.get_member(uid)
+            if member:
+                challenges_cog.achievement_engine.enqueue(member, {INVITES_COUNT})
+
+    @tasks.loop(minutes=INVITE_REFRESH_MINUTES)
+    async def refresh_loop(self):
+        for guild in self.bot.guilds:
+            first = guild.id not in self.invites
+            increased = await self.refresh_guild(guild)
+            if not first:
+                await self.evaluate_inviters(guild, increased)
+
+    @refresh_loop.before_loop
+    async def before_refresh_loop(self):
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite: discord.Invite):
+        if invite.guild is None:
+            return
+        self._set_invite(invite.guild.id, invite.code, invite.inviter.id if invite.inviter else None, int(invite.uses or 0))
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite: discord.Invite):
+        if invite.guild is None:
+            return
+        self._remove_invite(invite.guild.id, invite.code)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        increased = await self.refresh_guild(member.guild)
+        await self.evaluate_inviters(member.guild, increased)
+
+
+async def setup(bot):
+    await bot.add_cog(InviteTracker(bot))
@@ -4,6 +4,7 @@ from discord import app_commands
 import json
 from pathlib import Path
 from constants import CHALLENGE_POINTS_PATH
+from helpers.persistence import persistence
 
 
 POINTS_FILE = Path(CHALLENGE_POINTS_PATH)
@@ -12,11 +13,8 @@ class Leaderboards(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def load_points(self):
-        if not POINTS_FILE.exists():
-            return {}
-        with open(POINTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    async def load_points(self):
+        return await persistence.read_json_async(POINTS_FILE, {})
 
     def calculate_streak(self, weeks: list[int]) -> int:
         if not weeks:
@@ -39,25 +37,18 @@ class Leaderboards(commands.Cog):
 
 
         guild = interaction.guild
-        invites = await guild.invites()
-
-        invite_counts = {}
-
-        for invite in invites:
-            if invite.inviter:
-                invite_counts[invite.inviter] = invite_counts.get(invite.inviter, 0) + invite.uses
-
-        sorted_invites = sorted(invite_counts.items(), key=lambda x: x[1], reverse=True)
+        tracker = self.bot.get_cog("InviteTracker")
+        sorted_invites = tracker.leaderboard(guild) if tracker else []
 
         embed = discord.Embed(
             title="Invite Leaderboard 🏆",
             color=discord.Color.green()
         )
 
-        for user, count in sorted_invites[:10]:
+        for user_id, count in sorted_invites[:10]:
             embed.add_field(
                 name= "",
-                value= f"**{user.mention}** - {count} invite" + f"{'s' if count > 1 else ''}",
+                value= f"**<@{user_id}>** - {count} invite" + f"{'s' if count > 1 else ''}",
                 inline=False
             )
 
@@ -68,7 +59,7 @@ class Leaderboards(commands.Cog):
     async def challenge_leaderboard(self, interaction: discord.Interaction):
         await interaction.response.defer()
 
-        data = self.load_points()
+        data = await self.load_points()
         guild = interaction.guild
 
         leaderboard = []
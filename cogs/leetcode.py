@@ -10,6 +10,8 @@ from discord import app_commands
 from discord.ext import commands, tasks
 
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
+from helpers.guild_index import guild_index
 from helpers.leetcode_api import (
     fetch_all_problems,
     pick_random_free_problem,
@@ -47,19 +49,11 @@ def unix_to_sydney_date(ts: int) -> date:
 
 
 def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return default
-    try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
-        return default
+    return persistence.read_json(path, default)
 
 
 def save_json(path: Path, obj):
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    persistence.write_json(path, obj, ensure_ascii=False, indent=2)
 
 
 def ensure_state() -> dict:
@@ -181,13 +175,7 @@ class LeetCode(commands.Cog):
     def get_ping_role(self, guild: discord.Guild | None) -> discord.Role | None:
         if guild is None:
             return None
-        target = (LEETCODE_PING_ROLE_NAME or "").strip().lower()
-        if not target:
-            return None
-        for r in guild.roles:
-            if r.name.lower() == target:
-                return r
-        return None
+        return guild_index.role_casefold(guild, LEETCODE_PING_ROLE_NAME)
 
     async def ensure_problem_cache(self):
         if not self._session:
@@ -10,6 +10,8 @@ from zoneinfo import ZoneInfo
 from fractions import Fraction
 import math
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
+from helpers.guild_index import guild_index
 from constants import *
 
 
@@ -29,22 +31,13 @@ def yesterday_str() -> str:
     return (datetime.datetime.now(TZ).date() - datetime.timedelta(days=1)).isoformat()
 
 
-def load_json(path: Path, default=None):
+async def load_json(path: Path, default=None):
     if default is None:
         default = {}
-    if not path.exists():
-        return default
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return default
-    try:
-        return json.loads(raw)
-    except Exception:
-        return default
+    return await persistence.read_json_async(path, default)
 
 def save_json(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    persistence.write_json(path, data, indent=2, ensure_ascii=False)
 
 def frac_to_str(x: Fraction) -> str:
     if x.denominator == 1:
@@ -563,27 +556,28 @@ class MakeTen(commands.Cog):
         self.daily_tick.cancel()
         self.daily_summary_tick.cancel()
 
-    def load(self):
-        return load_json(DATA_FILE, {"puzzles": {}, "users": {}})
+    async def load(self):
+        return await load_json(DATA_FILE, {"puzzles": {}, "users": {}})
 
     def save(self, data):
         save_json(DATA_FILE, data)
 
-    def get_or_create_puzzle(self, date: str):
-        data = self.load()
-        puzzles = data.setdefault("puzzles", {})
-        if date not in puzzles:
-            puzzles[date] = {
-                "numbers": generate_daily_numbers(),
-                "target": MAKE_TEN_TARGET,
-                "posted_message_id": None,
-                "posted_at": None,
-                "posted_channel_id": MAKE_TEN_CHANNEL_ID,
-                "solutions": {},
-                "summary_posted": False,
-            }
-            self.save(data)
-        return puzzles[date]
+    async def get_or_create_puzzle(self, date: str):
+        async with persistence.lock(DATA_FILE):
+            data = await self.load()
+            puzzles = data.setdefault("puzzles", {})
+            if date not in puzzles:
+                puzzles[date] = {
+                    "numbers": generate_daily_numbers(),
+                    "target": MAKE_TEN_TARGET,
+                    "posted_message_id": None,
+                    "posted_at": None,
+                    "posted_channel_id": MAKE_TEN_CHANNEL_ID,
+                    "solutions": {},
+                    "summary_posted": False,
+                }
+                self.save(data)
+            return puzzles[date]
 
     def build_daily_embed(self, date: str, puzzle: dict) -> discord.Embed:
         nums = puzzle["numbers"]
@@ -604,7 +598,7 @@ class MakeTen(commands.Cog):
 
     async def ensure_posted_today(self):
         date = today_str()
-        puzzle = self.get_or_create_puzzle(date)
+        puzzle = await self.get_or_create_puzzle(date)
         if puzzle.get("posted_message_id"):
             return
 
@@ -614,41 +608,43 @@ class MakeTen(commands.Cog):
 
         ping_content = None
         if MAKE_TEN_PING_ROLE_NAME:
-            role = discord.utils.get(ch.guild.roles, name=MAKE_TEN_PING_ROLE_NAME)
+            role = guild_index.role(ch.guild, MAKE_TEN_PING_ROLE_NAME)
             if role:
                 ping_content = f"Opt-in mentions: {role.mention}"
 
         embed = self.build_daily_embed(date, puzzle)
         msg = await ch.send(content=ping_content, embed=embed, view=DailyPanelView(self), silent=True)
 
-        data = self.load()
-        data["puzzles"][date]["posted_message_id"] = msg.id
-        data["puzzles"][date]["posted_channel_id"] = ch.id
-        data["puzzles"][date]["posted_at"] = now()
-        self.save(data)
+        async with persistence.lock(DATA_FILE):
+            data = await self.load()
+            data["puzzles"][date]["posted_message_id"] = msg.id
+            data["puzzles"][date]["posted_channel_id"] = ch.id
+            data["puzzles"][date]["posted_at"] = now()
+            self.save(data)
 
     async def announce_solve(self, user: discord.User, date: str):
         ch = self.bot.get_channel(MAKE_TEN_CHANNEL_ID)
         if not isinstance(ch, discord.TextChannel):
             return
 
-        data = self.load()
+        data = await self.load()
         p = data.get("puzzles", {}).get(date, {})
         solved = len(p.get("solutions", {}))
         await ch.send(f"{user.mention} has solved today's puzzle 🎉 ({solved} solved so far)")
 
     async def post_summary_for_yesterday(self):
         y = yesterday_str()
-        data = self.load()
-        p = data.get("puzzles", {}).get(y)
-        if not p or p.get("summary_posted"):
-            return
+        async with persistence.lock(DATA_FILE):
+            data = await self.load()
+            p = data.get("puzzles", {}).get(y)
+            if not p or p.get("summary_posted"):
+                return
 
-        sols: dict = p.get("solutions", {})
-        if not sols:
-            data["puzzles"][y]["summary_posted"] = True
-            self.save(data)
-            return
+            sols: dict = p.get("solutions", {})
+            if not sols:
+                data["puzzles"][y]["summary_posted"] = True
+                self.save(data)
+                return
 
         ch = self.bot.get_channel(MAKE_TEN_CHANNEL_ID)
         if not isinstance(ch, discord.TextChannel):
@@ -671,9 +667,10 @@ class MakeTen(commands.Cog):
         e.add_field(name="Solutions", value=chunk, inline=False)
         await ch.send(embed=e)
 
-        data = self.load()
-        data["puzzles"][y]["summary_posted"] = True
-        self.save(data)
+        async with persistence.lock(DATA_FILE):
+            data = await self.load()
+            data["puzzles"][y]["summary_posted"] = True
+            self.save(data)
 
     def update_user_stats_on_solve(self, data: dict, user_id: str, solve_date: str, solve_seconds: int | None):
         users = data.setdefault("users", {})
@@ -717,27 +714,26 @@ class MakeTen(commands.Cog):
                 u["early_bird_solves"] = int(u.get("early_bird_solves", 0)) + 1
 
     async def record_solution(self, date: str, user: discord.User, expr: str) -> tuple[bool, str]:
-        data = self.load()
-        puzzle = data.setdefault("puzzles", {}).get(date)
-        if puzzle is None:
-            self.get_or_create_puzzle(date)
-            data = self.load()
+        await self.get_or_create_puzzle(date)
+
+        async with persistence.lock(DATA_FILE):
+            data = await self.load()
             puzzle = data["puzzles"][date]
 
-        sols = puzzle.setdefault("solutions", {})
-        uid = str(user.id)
+            sols = puzzle.setdefault("solutions", {})
+            uid = str(user.id)
 
-        if uid in sols:
-            return (False, "You already solved today's puzzle.")
+            if uid in sols:
+                return (False, "You already solved today's puzzle.")
 
-        posted_at = puzzle.get("posted_at")
-        posted_at = int(posted_at) if posted_at is not None else 0
-        solve_seconds = (now() - posted_at) if posted_at > 0 else None
+            posted_at = puzzle.get("posted_at")
+            posted_at = int(posted_at) if posted_at is not None else 0
+            solve_seconds = (now() - posted_at) if posted_at > 0 else None
 
-        sols[uid] = {"expr": expr, "at": now(), "solve_seconds": solve_seconds}
+            sols[uid] = {"expr": expr, "at": now(), "solve_seconds": solve_seconds}
 
-        self.update_user_stats_on_solve(data, uid, date, solve_seconds)
-        self.save(data)
+            self.update_user_stats_on_solve(data, uid, date, solve_seconds)
+            self.save(data)
 
         await self.try_update_daily_post(date)
         await self.announce_solve(user, date)
@@ -753,13 +749,12 @@ class MakeTen(commands.Cog):
 
         challenges_cog = self.bot.get_cog("Challenges")
         if member and challenges_cog:
-            ctx = await challenges_cog.build_ctx(member)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            challenges_cog.achievement_engine.enqueue(member, MAKE_TEN_CTX_KEYS)
 
         return (True, "ok")
 
     async def try_update_daily_post(self, date: str):
-        data = self.load()
+        data = await self.load()
         p = data.get("puzzles", {}).get(date)
         if not p:
             return
@@ -808,7 +803,7 @@ class MakeTen(commands.Cog):
         if not await self.ensure_in_channel(interaction):
             return
         d = today_str()
-        p = self.get_or_create_puzzle(d)
+        p = await self.get_or_create_puzzle(d)
         e = discord.Embed(title=f"🧮 Make Ten - {d}")
         e.add_field(name="Numbers", value=" ".join(str(n) for n in p["numbers"]), inline=False)
         e.add_field(name="Target", value=str(MAKE_TEN_TARGET), inline=True)
@@ -821,10 +816,10 @@ class MakeTen(commands.Cog):
             return
 
         d = today_str()
-        p = self.get_or_create_puzzle(d)
+        p = await self.get_or_create_puzzle(d)
 
         if allow_write:
-            data = self.load()
+            data = await self.load()
             sols = data.get("puzzles", {}).get(d, {}).get("solutions", {})
             if str(interaction.user.id) in sols:
                 await interaction.response.send_message("You already solved today's puzzle.", ephemeral=True)
@@ -845,7 +840,7 @@ class MakeTen(commands.Cog):
     async def show_stats(self, interaction: discord.Interaction):
         if not await self.ensure_in_channel(interaction):
             return
-        data = self.load()
+        data = await self.load()
         u = data.get("users", {}).get(str(interaction.user.id), {})
         cur = int(u.get("current_streak", 0))
         best = int(u.get("best_streak", 0))
@@ -892,7 +887,7 @@ class MakeTen(commands.Cog):
             await interaction.response.send_message("Date must be YYYY-MM-DD.", ephemeral=True)
             return
 
-        data = self.load()
+        data = await self.load()
         p = data.get("puzzles", {}).get(date)
         if not p:
             await interaction.response.send_message("No puzzle saved for that date.", ephemeral=True)
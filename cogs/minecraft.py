@@ -6,7 +6,7 @@ from pathlib import Path
 import json
 from dotenv import load_dotenv
 import os
-from constants import VOLUNTEER_ROLE, SENIOR_VOLUNTEER_ROLE, OFFICER_ROLE, MINECRAFT_LINKS_PATH, RATE_LIMIT_SECONDS, MODERATOR_ONLY_CHANNEL_ID, MINECRAFT_SERVER_STATUS_MESSAGE_ID, MINECRAFT_SERVER_CHANNEL_ID
+from constants import VOLUNTEER_ROLE, SENIOR_VOLUNTEER_ROLE, OFFICER_ROLE, MINECRAFT_LINKS_PATH, RATE_LIMIT_SECONDS, MODERATOR_ONLY_CHANNEL_ID, MINECRAFT_SERVER_STATUS_MESSAGE_ID, MINECRAFT_SERVER_CHANNEL_ID, LINKED_MINECRAFT
 from mcrcon import MCRcon
 import socket
 import time
@@ -16,6 +16,7 @@ from mcstatus import JavaServer
 import aiohttp
 import asyncio
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
 
 
 load_dotenv()
@@ -76,14 +77,12 @@ class Minecraft(commands.Cog):
             data["blacklist"] = {"discord": [], "java": [], "bedrock_gamertag": [], "floodgate_uuid": []}
 
         
-        with open(LINKS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        persistence.write_json(LINKS_FILE, data, indent=2, sort_keys=True)
 
     def load_links(self):
-        if not LINKS_FILE.exists():
+        data = persistence.read_json(LINKS_FILE)
+        if not isinstance(data, dict):
             return {"blacklist": {"discord": [], "java": [], "bedrock_gamertag": [], "floodgate_uuid": []}}
-        with open(LINKS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
 
         if "blacklist" not in data or not isinstance(data["blacklist"], dict):
             data["blacklist"] = {"discord": [], "java": [], "bedrock_gamertag": [], "floodgate_uuid": []}
@@ -157,6 +156,10 @@ class Minecraft(commands.Cog):
         else:
             return self.is_valid_bedrock(name)
 
+    def achievement_engine(self):
+        challenges_cog = self.bot.get_cog("Challenges")
+        return challenges_cog.achievement_engine if challenges_cog else None
+
     def get_linked_usernames(self, user_id: int) -> list[str]:
         data = self.load_links()
         entry = self.get_user_entry(data, user_id)
@@ -177,7 +180,7 @@ class Minecraft(commands.Cog):
     async def apply_suffix(self, interaction: discord.Interaction, achievement: str):
         await interaction.response.defer(ephemeral=True)
 
-        percent = await achievement_percentage(achievement, interaction.guild)
+        percent = await achievement_percentage(achievement, interaction.guild, self.achievement_engine())
         _, colour = rarity_style(percent)
 
         suffix = f" &7{colour}[{achievement}]&7"
@@ -357,7 +360,7 @@ class Minecraft(commands.Cog):
         challenges_cog = interaction.client.get_cog("Challenges")
         if challenges_cog:
             ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            await challenges_cog.achievement_engine.evaluate(ctx, changed={LINKED_MINECRAFT})
 
         await self.log_action(interaction.guild, f"🌲 {interaction.user.mention} linked {platform.value} account `{minecraft_name}`")
         await interaction.followup.send(f"✅ **{platform.name} account linked:** `{minecraft_name}`", ephemeral=True)
@@ -468,7 +471,7 @@ class Minecraft(commands.Cog):
             await interaction.followup.send("❌ Run this in a server.", ephemeral=True)
             return
 
-        achievements = await get_user_achievements(interaction.user.id, guild)
+        achievements = await get_user_achievements(interaction.user.id, guild, self.achievement_engine())
 
         if not achievements:
             await interaction.followup.send(
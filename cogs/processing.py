@@ -9,7 +9,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Literal, Optional, Dict, List, Tuple, Any
 from helpers.admin import admin_meta
-from constants import PUT_THROUGH_PATH
+from helpers.persistence import persistence
+from constants import PUT_THROUGH_PATH, PROCESSING_INDEX_PATH
 
 
 Scope = Literal["all", "weekly", "bingo", "stamp", "votw"]
@@ -22,22 +23,12 @@ def now_unix() -> int:
 
 
 def _load_json(path: Path, default):
-    if not path.exists():
-        return default
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return default
-    try:
-        return json.loads(raw)
-    except Exception:
-        return default
+    return persistence.read_json(path, default)
 
 
 def _atomic_save_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(".tmp")
-    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
-    tmp.replace(path)
+    # the persistence thread writes via tmp + replace
+    persistence.write_json(path, data, indent=2, sort_keys=True)
 
 
 def _safe_int(x) -> Optional[int]:
@@ -241,6 +232,7 @@ class ProcessUserView(BaseAdminView):
         self.page_size = 20
         self.items: List[TaskItem] = []
         self._selected_task_ids: List[str] = []
+        self._snapshot: Optional[InboxSnapshot] = None
 
         self.add_item(self.BackButton())
         self.add_item(self.ToggleShowButton())
@@ -254,7 +246,9 @@ class ProcessUserView(BaseAdminView):
 
 
     async def refresh(self):
-        self.items = await self.cog.build_tasks_for_user(self.target.guild, self.target.id, scope=self.scope, show=self.show)
+        # pending comes from the index, "all" needs one snapshot per refresh which make_embed reuses
+        self._snapshot = await self.cog.snapshot() if self.show == "all" else None
+        self.items = await self.cog.build_tasks_for_user(self.target.guild, self.target.id, scope=self.scope, show=self.show, snapshot=self._snapshot)
 
         self.items.sort(key=lambda t: t.sort_key, reverse=True)
 
@@ -312,7 +306,7 @@ class ProcessUserView(BaseAdminView):
         self.add_item(select)
 
     async def make_embed(self) -> discord.Embed:
-        pending_total, counts = await self.cog.count_user_pending(self.target.guild, self.target.id)
+        pending_total, counts = await self.cog.count_user_pending(self.target.guild, self.target.id, snapshot=self._snapshot)
         e = discord.Embed(
             title=f"🧾 Processing - {self.target.display_name}",
             description=(
@@ -330,7 +324,10 @@ class ProcessUserView(BaseAdminView):
         else:
             lines = []
             for t in page_items:
-                status = await self.cog.get_task_status_for_display(self.target.id, t)
+                if self._snapshot is None:
+                    status = "pending"
+                else:
+                    status = await self.cog.get_task_status_for_display(self.target.id, t, snapshot=self._snapshot)
                 icon = "✅" if status == "processed" else "⏳"
                 lines.append(f"{icon} **{t.title}** - `{t.task_id}`")
             e.add_field(name="This page", value="\n".join(lines), inline=False)
@@ -472,75 +469,60 @@ class ProcessUserView(BaseAdminView):
 
 
 
-class Processing(commands.Cog):
-    def __init__(self, bot: commands.Bot):
-        self.bot = bot
-        self.ledger_path = Path(PUT_THROUGH_PATH)
-        self._lock = asyncio.Lock()
+class InboxSnapshot:
+    # The four source files and the ledger, each loaded once, with every user's
+    # tasks built in a single pass over the sources. Status checks are dict lookups.
 
+    def __init__(self, challenges, ledger: dict, uid: Optional[str] = None):
+        self.uid = uid
+        self.points = challenges.load_points(readonly=True)
+        self.bingo_progress = challenges.load_bingo_progress(readonly=True)
+        self.stamp_cards = challenges.load_stamp_cards(readonly=True)
+        self.votw_winners = challenges.load_volunteer_winners(readonly=True)
+        self._has_bingo = challenges.has_bingo
 
-    def _load_ledger(self) -> dict:
-        return _load_json(self.ledger_path, {"version": 1, "users": {}, "global": {"tasks": {}}})
+        self.user_status: Dict[str, Dict[str, str]] = {}
+        for uid, entry in (ledger.get("users") or {}).items():
+            tasks = (entry or {}).get("tasks") or {}
+            self.user_status[uid] = {tid: (t or {}).get("status", "pending") for tid, t in tasks.items()}
 
-    def _save_ledger(self, data: dict) -> None:
-        _atomic_save_json(self.ledger_path, data)
+        gtasks = (ledger.get("global") or {}).get("tasks") or {}
+        self.global_status: Dict[str, str] = {tid: (t or {}).get("status", "pending") for tid, t in gtasks.items()}
 
-    def _get_user_task_entry(self, data: dict, uid: str) -> dict:
-        users = data.setdefault("users", {})
-        u = users.setdefault(uid, {})
-        tasks = u.setdefault("tasks", {})
-        return tasks
+        self.tasks: Dict[str, List[TaskItem]] = {}
+        self._build()
 
-    def _get_global_tasks(self, data: dict) -> dict:
-        g = data.setdefault("global", {})
-        return g.setdefault("tasks", {})
-
-    async def get_task_status_for_display(self, owner_uid: int | str, task: TaskItem) -> str:
-        uid = str(owner_uid)
-        async with self._lock:
-            data = self._load_ledger()
-            if task.scope == "votw":
-                gt = self._get_global_tasks(data)
-                return (gt.get(task.task_id, {}) or {}).get("status", "pending")
-            ut = self._get_user_task_entry(data, uid)
-            return (ut.get(task.task_id, {}) or {}).get("status", "pending")
-
-
-    def _challenges(self) -> Optional[commands.Cog]:
-        return self.bot.get_cog("Challenges")
+    def _add(self, item: TaskItem):
+        self.tasks.setdefault(item.owner_uid, []).append(item)
 
-    async def build_tasks_for_user(self, guild: discord.Guild, user_id: int, scope: Scope, show: Show) -> List[TaskItem]:
-        challenges = self._challenges()
-        if challenges is None:
+    def _rows(self, source) -> list:
+        # every (uid, value) pair, or just the one user when built with uid=
+        if not isinstance(source, dict):
             return []
+        if self.uid is None:
+            return list(source.items())
+        return [(self.uid, source[self.uid])] if self.uid in source else []
+
+    def _build(self):
+        if isinstance(self.points, dict):
+            for uid, weeks in self._rows(self.points):
+                for w in weeks:
+                    wi = _safe_int(w)
+                    if wi is None:
+                        continue
+                    self._add(TaskItem(
+                        owner_uid=uid,
+                        scope="weekly",
+                        task_id=f"weekly:week={wi}",
+                        title=f"Weekly Challenge - Week {wi}",
+                        sort_key=wi,
+                        meta={"week": wi}
+                    ))
 
-        uid = str(user_id)
-
-        points_data = challenges.load_points()
-        bingo_progress = challenges.load_bingo_progress()
-        stamp_cards = challenges.load_stamp_cards()
-        votw_winners = challenges.load_volunteer_winners()
-
-        items: List[TaskItem] = []
-
-        if scope in ("all", "weekly"):
-            weeks = points_data.get(uid, [])
-            for w in weeks:
-                wi = _safe_int(w)
-                if wi is None:
+        if isinstance(self.bingo_progress, dict):
+            for uid, user_cards in self._rows(self.bingo_progress):
+                if not isinstance(user_cards, dict):
                     continue
-                items.append(TaskItem(
-                    owner_uid=uid,
-                    scope="weekly",
-                    task_id=f"weekly:week={wi}",
-                    title=f"Weekly Challenge - Week {wi}",
-                    sort_key=wi,
-                    meta={"week": wi}
-                ))
-
-        if scope in ("all", "bingo"):
-            user_cards = (bingo_progress.get(uid) or {})
-            if isinstance(user_cards, dict):
                 for card_key, cd in user_cards.items():
                     if not isinstance(cd, dict):
                         continue
@@ -548,14 +530,14 @@ class Processing(commands.Cog):
                     if not isinstance(completed, list):
                         continue
                     try:
-                        is_bingo = challenges.has_bingo(set(map(str, completed)))
+                        is_bingo = self._has_bingo(set(map(str, completed)))
                     except Exception:
                         is_bingo = False
                     if not is_bingo:
                         continue
 
                     card_num = _safe_int(card_key) or 0
-                    items.append(TaskItem(
+                    self._add(TaskItem(
                         owner_uid=uid,
                         scope="bingo",
                         task_id=f"bingo:card={card_key}",
@@ -564,10 +546,11 @@ class Processing(commands.Cog):
                         meta={"card": card_key}
                     ))
 
-        if scope in ("all", "stamp"):
-            entry = stamp_cards.get(uid, {}) if isinstance(stamp_cards, dict) else {}
-            cards = entry.get("cards", {}) if isinstance(entry, dict) else {}
-            if isinstance(cards, dict):
+        if isinstance(self.stamp_cards, dict):
+            for uid, entry in self._rows(self.stamp_cards):
+                cards = entry.get("cards", {}) if isinstance(entry, dict) else {}
+                if not isinstance(cards, dict):
+                    continue
                 for card_key, ts in cards.items():
                     sk = 0
                     if isinstance(ts, str):
@@ -577,7 +560,7 @@ class Processing(commands.Cog):
                     if sk == 0:
                         sk = 2000000 + (_safe_int(card_key) or 0)
 
-                    items.append(TaskItem(
+                    self._add(TaskItem(
                         owner_uid=uid,
                         scope="stamp",
                         task_id=f"stamp:card={card_key}",
@@ -586,99 +569,250 @@ class Processing(commands.Cog):
                         meta={"card": card_key, "timestamp": ts}
                     ))
 
-        if scope in ("all", "votw"):
-            if isinstance(votw_winners, dict):
-                for wk, winner_uid in votw_winners.items():
-                    if str(winner_uid) != uid:
-                        continue
-                    wki = _safe_int(wk) or 0
-                    items.append(TaskItem(
-                        owner_uid=uid,
-                        scope="votw",
-                        task_id=f"votw:week={wk}",
-                        title=f"Volunteer of the Week - Week {wk}",
-                        sort_key=3000000 + wki,
-                        meta={"week": wk}
-                    ))
+        if isinstance(self.votw_winners, dict):
+            for wk, winner_uid in self.votw_winners.items():
+                if self.uid is not None and str(winner_uid) != self.uid:
+                    continue
+                wki = _safe_int(wk) or 0
+                self._add(TaskItem(
+                    owner_uid=str(winner_uid),
+                    scope="votw",
+                    task_id=f"votw:week={wk}",
+                    title=f"Volunteer of the Week - Week {wk}",
+                    sort_key=3000000 + wki,
+                    meta={"week": wk}
+                ))
 
+    def status(self, task: TaskItem) -> str:
+        if task.scope == "votw":
+            return self.global_status.get(task.task_id, "pending")
+        return self.user_status.get(task.owner_uid, {}).get(task.task_id, "pending")
+
+    def tasks_for(self, uid: str, scope: Scope = "all", show: Show = "all") -> List[TaskItem]:
+        items = self.tasks.get(str(uid), [])
+        if scope != "all":
+            items = [t for t in items if t.scope == scope]
         if show == "pending":
-            pending_items: List[TaskItem] = []
-            for t in items:
-                st = await self.get_task_status_for_display(uid, t)
-                if st != "processed":
-                    pending_items.append(t)
-            items = pending_items
+            items = [t for t in items if self.status(t) != "processed"]
+        return list(items)
+
+    def pending_counts(self, uid: str) -> Tuple[int, dict]:
+        return _pending_counts(_pending_row(uid, self.tasks_for(uid, show="pending")))
+
+    def inbox_rows(self) -> List[dict]:
+        rows = [_pending_row(uid, self.tasks_for(uid, show="pending")) for uid in self.tasks]
+        return [r for r in rows if r["pending_total"] > 0]
+
+
+def _pending_row(uid: str, tasks) -> dict:
+    counts = {"weekly": 0, "bingo": 0, "stamp": 0, "votw": 0}
+    recent = 0
+    for t in tasks:
+        counts[t.scope] += 1
+        recent = max(recent, t.sort_key)
+
+    return {
+        "uid": uid,
+        "pending_total": sum(counts.values()),
+        "pending_weekly": counts["weekly"],
+        "pending_bingo": counts["bingo"],
+        "pending_stamp": counts["stamp"],
+        "pending_votw": counts["votw"],
+        "recent_sort": recent
+    }
+
+
+def _pending_counts(row: dict) -> Tuple[int, dict]:
+    counts = {
+        "weekly": row["pending_weekly"],
+        "bingo": row["pending_bingo"],
+        "stamp": row["pending_stamp"],
+        "votw": row["pending_votw"],
+        "_recent_sort": row["recent_sort"]
+    }
+    return row["pending_total"], counts
+
+
+class PendingIndex:
+    # Only the pending tasks, keyed uid -> task_id, saved to PROCESSING_INDEX_PATH.
+    # Kept up to date per user (sources change, tasks get marked) so the inbox is
+    # read straight from here instead of rebuilt from every source file.
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.users: Dict[str, Dict[str, TaskItem]] = {}
+        self.loaded = False
+
+    def load(self) -> bool:
+        data = _load_json(self.path, None)
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return False
+
+        self.users = {}
+        for uid, tasks in (data.get("users") or {}).items():
+            self.users[uid] = {
+                tid: TaskItem(owner_uid=uid, task_id=tid, **t)
+                for tid, t in tasks.items()
+            }
+        self.loaded = True
+        return True
 
+    def save(self) -> None:
+        users = {
+            uid: {
+                tid: {"scope": t.scope, "title": t.title, "sort_key": t.sort_key, "meta": dict(t.meta)}
+                for tid, t in tasks.items()
+            }
+            for uid, tasks in self.users.items()
+        }
+        _atomic_save_json(self.path, {"version": self.VERSION, "users": users})
+
+    def set_user(self, uid: str, tasks: List[TaskItem]) -> None:
+        if tasks:
+            self.users[uid] = {t.task_id: t for t in tasks}
+        else:
+            self.users.pop(uid, None)
+
+    def rebuild(self, snapshot: InboxSnapshot) -> None:
+        self.users = {}
+        for uid in snapshot.tasks:
+            self.set_user(uid, snapshot.tasks_for(uid, show="pending"))
+        self.loaded = True
+        self.save()
+
+    def discard(self, uid: str, task_ids: List[str]) -> None:
+        tasks = self.users.get(uid)
+        if not tasks:
+            return
+        for tid in task_ids:
+            tasks.pop(tid, None)
+        if not tasks:
+            del self.users[uid]
+
+    def tasks_for(self, uid: str, scope: Scope = "all") -> List[TaskItem]:
+        items = list(self.users.get(str(uid), {}).values())
+        if scope != "all":
+            items = [t for t in items if t.scope == scope]
         return items
 
-    async def build_inbox_rows(self, guild: discord.Guild) -> List[dict]:
+    def pending_counts(self, uid: str) -> Tuple[int, dict]:
+        return _pending_counts(_pending_row(uid, self.users.get(str(uid), {}).values()))
+
+    def inbox_rows(self) -> List[dict]:
+        return [_pending_row(uid, tasks.values()) for uid, tasks in self.users.items() if tasks]
+
+    def as_rows(self) -> Dict[str, dict]:
+        # uid -> {task_id: sort_key}, for comparing two indexes
+        return {uid: {tid: t.sort_key for tid, t in tasks.items()} for uid, tasks in self.users.items()}
+
+
+class Processing(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.ledger_path = Path(PUT_THROUGH_PATH)
+        self._lock = asyncio.Lock()
+        self.index = PendingIndex(Path(PROCESSING_INDEX_PATH))
+
+
+    def _load_ledger(self) -> dict:
+        return _load_json(self.ledger_path, {"version": 1, "users": {}, "global": {"tasks": {}}})
+
+    def _save_ledger(self, data: dict) -> None:
+        _atomic_save_json(self.ledger_path, data)
+
+    def _get_user_task_entry(self, data: dict, uid: str) -> dict:
+        users = data.setdefault("users", {})
+        u = users.setdefault(uid, {})
+        tasks = u.setdefault("tasks", {})
+        return tasks
+
+    def _get_global_tasks(self, data: dict) -> dict:
+        g = data.setdefault("global", {})
+        return g.setdefault("tasks", {})
+
+    async def snapshot(self) -> Optional[InboxSnapshot]:
         challenges = self._challenges()
         if challenges is None:
-            return []
+            return None
+
+        async with self._lock:
+            ledger = self._load_ledger()
+        return InboxSnapshot(challenges, ledger)
+
+    async def ensure_index(self) -> None:
+        if self.index.loaded or self.index.load():
+            return
+
+        # first run, or an old format, build it from the sources
+        await self.rebuild_index()
+
+    async def rebuild_index(self) -> bool:
+        snapshot = await self.snapshot()
+        if snapshot is None:
+            return False
+
+        self.index.rebuild(snapshot)
+        return True
 
-        points_data = challenges.load_points()
-        bingo_progress = challenges.load_bingo_progress()
-        stamp_cards = challenges.load_stamp_cards()
-        votw_winners = challenges.load_volunteer_winners()
-
-        uids: set[str] = set()
-        if isinstance(points_data, dict):
-            uids.update(points_data.keys())
-        if isinstance(bingo_progress, dict):
-            uids.update(bingo_progress.keys())
-        if isinstance(stamp_cards, dict):
-            uids.update(stamp_cards.keys())
-        if isinstance(votw_winners, dict):
-            for _wk, winner_uid in votw_winners.items():
-                uids.add(str(winner_uid))
-
-        rows: List[dict] = []
-        for uid in uids:
-            pending_total, counts = await self.count_user_pending(guild, int(uid) if _safe_int(uid) else uid)
-            if pending_total <= 0:
-                continue
-
-            recent_sort = max(counts.get("_recent_sort", 0), 0)
-
-            rows.append({
-                "uid": uid,
-                "pending_total": pending_total,
-                "pending_weekly": counts["weekly"],
-                "pending_bingo": counts["bingo"],
-                "pending_stamp": counts["stamp"],
-                "pending_votw": counts["votw"],
-                "recent_sort": recent_sort
-            })
-
-        return rows
-
-    async def count_user_pending(self, guild: discord.Guild, user_id: int | str) -> Tuple[int, dict]:
+    def _reindex_user(self, uid: str, ledger: dict) -> None:
+        # caller holds self._lock
         challenges = self._challenges()
-        if challenges is None:
-            return 0, {"weekly": 0, "bingo": 0, "stamp": 0, "votw": 0, "_recent_sort": 0}
+        if challenges is None or not self.index.loaded:
+            return
 
-        uid = str(user_id)
+        snapshot = InboxSnapshot(challenges, ledger, uid=uid)
+        self.index.set_user(uid, snapshot.tasks_for(uid, show="pending"))
+        self.index.save()
 
-        weekly = await self.build_tasks_for_user(guild, int(uid) if _safe_int(uid) else 0, scope="weekly", show="pending")
-        bingo = await self.build_tasks_for_user(guild, int(uid) if _safe_int(uid) else 0, scope="bingo", show="pending")
-        stamp = await self.build_tasks_for_user(guild, int(uid) if _safe_int(uid) else 0, scope="stamp", show="pending")
-        votw = await self.build_tasks_for_user(guild, int(uid) if _safe_int(uid) else 0, scope="votw", show="pending")
+    @commands.Cog.listener()
+    async def on_processing_source_changed(self, user_id: str):
+        if not self.index.loaded:
+            # the full build on first use picks this change up anyway
+            return
 
-        counts = {
-            "weekly": len(weekly),
-            "bingo": len(bingo),
-            "stamp": len(stamp),
-            "votw": len(votw),
-            "_recent_sort": 0
-        }
+        async with self._lock:
+            self._reindex_user(str(user_id), self._load_ledger())
 
-        max_sk = 0
-        for lst in (weekly, bingo, stamp, votw):
-            for t in lst:
-                max_sk = max(max_sk, t.sort_key)
-        counts["_recent_sort"] = max_sk
+    async def get_task_status_for_display(self, owner_uid: int | str, task: TaskItem, snapshot: Optional[InboxSnapshot] = None) -> str:
+        if snapshot is not None:
+            return snapshot.status(task)
 
-        return sum((counts["weekly"], counts["bingo"], counts["stamp"], counts["votw"])), counts
+        uid = str(owner_uid)
+        async with self._lock:
+            data = self._load_ledger()
+            if task.scope == "votw":
+                gt = self._get_global_tasks(data)
+                return (gt.get(task.task_id, {}) or {}).get("status", "pending")
+            ut = self._get_user_task_entry(data, uid)
+            return (ut.get(task.task_id, {}) or {}).get("status", "pending")
+
+
+    def _challenges(self) -> Optional[commands.Cog]:
+        return self.bot.get_cog("Challenges")
+
+    async def build_tasks_for_user(self, guild: discord.Guild, user_id: int, scope: Scope, show: Show, snapshot: Optional[InboxSnapshot] = None) -> List[TaskItem]:
+        if snapshot is None and show == "pending":
+            await self.ensure_index()
+            return self.index.tasks_for(str(user_id), scope)
+
+        snapshot = snapshot or await self.snapshot()
+        if snapshot is None:
+            return []
+
+        return snapshot.tasks_for(str(user_id), scope, show)
+
+    async def build_inbox_rows(self, guild: discord.Guild) -> List[dict]:
+        await self.ensure_index()
+        return self.index.inbox_rows()
+
+    async def count_user_pending(self, guild: discord.Guild, user_id: int | str, snapshot: Optional[InboxSnapshot] = None) -> Tuple[int, dict]:
+        if snapshot is None:
+            await self.ensure_index()
+            return self.index.pending_counts(str(user_id))
+
+        return snapshot.pending_counts(str(user_id))
 
 
     async def mark_tasks_processed(self, guild: discord.Guild, owner_uid: str, task_ids: List[str], processed_by: str) -> int:
@@ -714,6 +848,9 @@ class Processing(commands.Cog):
                     }
 
             self._save_ledger(data)
+            if self.index.loaded:
+                self.index.discard(owner_uid, task_ids)
+                self.index.save()
             return changed
 
     async def mark_tasks_pending(self, guild: discord.Guild, owner_uid: str, task_ids: List[str]) -> int:
@@ -741,6 +878,7 @@ class Processing(commands.Cog):
                     utasks[tid] = cur
 
             self._save_ledger(data)
+            self._reindex_user(owner_uid, data)
             return changed
 
 
@@ -808,6 +946,36 @@ class Processing(commands.Cog):
         await view.refresh()
         await interaction.followup.send(embed=await view.make_embed(), view=view, ephemeral=True)
 
+    @app_commands.command(name="processreindex", description="Rebuild the processing inbox index from the source data.")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @admin_meta(
+        permissions="Administrator",
+        affects=["Processing Ledger"],
+        notes=(
+            "Rebuilds the pending-task index that /processinbox reads from, using the weekly, bingo, "
+            "stamp card and VOTW data plus the ledger. Reports anything the old index had wrong."
+        )
+    )
+    async def process_reindex(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        before = self.index.as_rows() if (self.index.loaded or self.index.load()) else {}
+
+        if not await self.rebuild_index():
+            return await interaction.followup.send("❌ Challenges cog isn't loaded.", ephemeral=True)
+
+        after = self.index.as_rows()
+        missing = sum(len(set(tasks) - set(before.get(uid, {}))) for uid, tasks in after.items())
+        stale = sum(len(set(tasks) - set(after.get(uid, {}))) for uid, tasks in before.items())
+        pending = sum(len(tasks) for tasks in after.values())
+
+        await interaction.followup.send(
+            f"🔁 Rebuilt the processing index: **{pending}** pending across **{len(after)}** users.\n"
+            f"Missing from the old index: **{missing}** • Stale in the old index: **{stale}**",
+            ephemeral=True
+        )
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Processing(bot))
@@ -3,15 +3,22 @@ from discord.ext import commands, tasks
 from discord import app_commands
 from pathlib import Path
 import json
+import os
 import random
 import time
 import asyncio
 from io import BytesIO
-from PIL import Image, ImageEnhance, ImageOps, ImageDraw, ImageFont
 from constants import *
 from helpers.admin import admin_meta
 from helpers.stats import StatsStore
 from helpers.achievement_engine import AchievementEngine
+from helpers.persistence import persistence
+from helpers.guild_index import guild_index
+from helpers.ownership import OwnershipStore
+from helpers.datastore import datastore_for
+from helpers.salvage_odds import OddsTable, fmt_odds
+from helpers.salvage_images import SalvageImageCache, SpawnImageSpec, BattleCollageSpec
+from helpers.render_service import render_service
 
 COLLECTIBLES_FILE = Path(COLLECTIBLES_PATH)
 OWNERSHIP_FILE = Path(OWNERSHIP_PATH)
@@ -22,19 +29,7 @@ def now() -> int:
     return int(time.time())
 
 def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return default
-    try:
-        return json.loads(raw)
-    except:
-        return default
-
-def save_json(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return persistence.read_json(path, default)
 
 def rarity_style(rarity: str) -> str:
     return f"{RARITY_EMOJI.get(rarity,'⚪')} **{rarity}**"
@@ -212,8 +207,7 @@ class TradeView(discord.ui.View):
         self.b_confirm = False
 
     def make_options_for(self, user: discord.Member) -> list[discord.SelectOption]:
-        own = self.cog.load_ownership().get(str(user.id), [])
-        owned_keys = {(x["id"], x.get("variant", "Normal")) for x in own}
+        owned_keys = self.cog.ownership.items(user.id)
 
         f = (self.a_filter if user.id == self.a.id else self.b_filter).lower().strip()
 
@@ -266,16 +260,19 @@ class TradeView(discord.ui.View):
         if self.cog.has_item(self.a.id, b_item_id, b_variant):
             return await interaction.response.send_message(f"{self.a.mention} already owns that exact variant.", ephemeral=True)
 
-        self.cog.stats_store.bump(str(self.a.id), SALVAGE_TRADES, 1)
-        self.cog.stats_store.bump(str(self.b.id), SALVAGE_TRADES, 1)
-        await self.cog.eval_achievements_for(self.a)
-        await self.cog.eval_achievements_for(self.b)
+        # swap before anything awaits, it re-checks both sides and moves both in one go
+        if not self.cog.ownership.swap(self.a.id, self.a_pick, self.b.id, self.b_pick):
+            return await interaction.response.send_message("One of the items changed hands, the trade didn't go through.", ephemeral=True)
 
-        self.cog.remove_item(self.a.id, a_item_id, a_variant)
-        self.cog.remove_item(self.b.id, b_item_id, b_variant)
+        with self.cog.stats_store.update(self.a.id) as tx:
+            tx.bump(SALVAGE_TRADES, 1)
+        with self.cog.stats_store.update(self.b.id) as tx:
+            tx.bump(SALVAGE_TRADES, 1)
 
-        self.cog.grant_item_and_track(self.b.id, a_item_id, a_variant, source=f"trade:{self.a.id}")
-        self.cog.grant_item_and_track(self.a.id, b_item_id, b_variant, source=f"trade:{self.b.id}")
+        b_changed = self.cog.track_grant(self.b.id, a_item_id, a_variant, source=f"trade:{self.a.id}") or set()
+        a_changed = self.cog.track_grant(self.a.id, b_item_id, b_variant, source=f"trade:{self.b.id}") or set()
+        await self.cog.eval_achievements_for(self.a, changed={SALVAGE_TRADES, *a_changed})
+        await self.cog.eval_achievements_for(self.b, changed={SALVAGE_TRADES, *b_changed})
 
         for child in self.children:
             child.disabled = True
@@ -443,8 +440,7 @@ class BattleView(discord.ui.View):
         return self.a_slots if user.id == self.a.id else self.b_slots
 
     def make_options_for(self, user: discord.Member) -> list[discord.SelectOption]:
-        own = self.cog.load_ownership().get(str(user.id), [])
-        owned_keys = {(x["id"], x.get("variant", "Normal")) for x in own}
+        owned_keys = self.cog.ownership.items(user.id)
 
         f = self.filter_for(user)
 
@@ -643,33 +639,35 @@ class BattleView(discord.ui.View):
         uid_a = str(self.a.id)
         uid_b = str(self.b.id)
 
-        self.cog.stats_store.bump(uid_a, SALVAGE_BATTLES_TOTAL, 1)
-        self.cog.stats_store.bump(uid_b, SALVAGE_BATTLES_TOTAL, 1)
+        all_three_draws = (draws == 3)
 
-        self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_ROUNDS_WON, a_wins)
-        self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_ROUNDS_LOST, b_wins)
-        self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_ROUNDS_WON, b_wins)
-        self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_ROUNDS_LOST, a_wins)
+        with self.cog.stats_store.update(uid_a) as tx_a, self.cog.stats_store.update(uid_b) as tx_b:
+            tx_a.bump(SALVAGE_BATTLES_TOTAL, 1)
+            tx_b.bump(SALVAGE_BATTLES_TOTAL, 1)
 
-        if draws:
-            self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_ROUND_DRAWS, draws)
-            self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_ROUND_DRAWS, draws)
-        
-        all_three_draws = (draws == 3)
-        if all_three_draws:
-            self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_ALL_DRAWS, 1)
-            self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_ALL_DRAWS, 1)
+            tx_a.bump(SALVAGE_BATTLE_ROUNDS_WON, a_wins)
+            tx_a.bump(SALVAGE_BATTLE_ROUNDS_LOST, b_wins)
+            tx_b.bump(SALVAGE_BATTLE_ROUNDS_WON, b_wins)
+            tx_b.bump(SALVAGE_BATTLE_ROUNDS_LOST, a_wins)
 
+            if draws:
+                tx_a.bump(SALVAGE_BATTLE_ROUND_DRAWS, draws)
+                tx_b.bump(SALVAGE_BATTLE_ROUND_DRAWS, draws)
 
-        if match == "A":
-            self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_MATCH_WINS, 1)
-            self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_MATCH_LOSSES, 1)
-        elif match == "B":
-            self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_MATCH_WINS, 1)
-            self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_MATCH_LOSSES, 1)
-        else:
-            self.cog.stats_store.bump(uid_a, SALVAGE_BATTLE_MATCH_DRAWS, 1)
-            self.cog.stats_store.bump(uid_b, SALVAGE_BATTLE_MATCH_DRAWS, 1)
+            if all_three_draws:
+                tx_a.bump(SALVAGE_BATTLE_ALL_DRAWS, 1)
+                tx_b.bump(SALVAGE_BATTLE_ALL_DRAWS, 1)
+
+
+            if match == "A":
+                tx_a.bump(SALVAGE_BATTLE_MATCH_WINS, 1)
+                tx_b.bump(SALVAGE_BATTLE_MATCH_LOSSES, 1)
+            elif match == "B":
+                tx_b.bump(SALVAGE_BATTLE_MATCH_WINS, 1)
+                tx_a.bump(SALVAGE_BATTLE_MATCH_LOSSES, 1)
+            else:
+                tx_a.bump(SALVAGE_BATTLE_MATCH_DRAWS, 1)
+                tx_b.bump(SALVAGE_BATTLE_MATCH_DRAWS, 1)
 
         for child in self.children:
             child.disabled = True
@@ -711,7 +709,7 @@ class BattleView(discord.ui.View):
 
         file = None
         try:
-            file = self.cog.build_battle_collage(rounds)
+            file = await self.cog.build_battle_collage(rounds)
             if file:
                 res.set_image(url=f"attachment://{file.filename}")
         except Exception:
@@ -722,10 +720,8 @@ class BattleView(discord.ui.View):
         else:
             await self.edit_main(interaction, embed=res, view=None, attachments=[])
 
-        ch = self.cog.bot.get_cog("Challenges")
-        if ch:
-            await self.cog.achievement_engine.evaluate(await ch.build_ctx(self.a))
-            await self.cog.achievement_engine.evaluate(await ch.build_ctx(self.b))
+        self.cog.achievement_engine.enqueue(self.a, tx_a.fields)
+        self.cog.achievement_engine.enqueue(self.b, tx_b.fields)
 
         self.stage = "DONE"
 
@@ -808,8 +804,12 @@ class Salvage(commands.Cog):
         self.bot = bot
         self.stats_store = stats_store
         self.achievement_engine = achievement_engine
-        self.collectibles = self.load_collectibles()
-        self.by_id = {c["id"]: c for c in self.collectibles}
+        self._collectibles_stamp = None
+        self.refresh_collectibles()
+        self.images = SalvageImageCache()
+        self.images.prewarm(self.collectibles)
+        self.ownership = OwnershipStore(OWNERSHIP_FILE, datastore=datastore_for(OWNERSHIP_PATH))
+        self.ownership.load()
         self.active_spawn: ActiveSpawn | None = None
         self._spawn_lock = asyncio.Lock()
         self.next_spawn_time = 0
@@ -825,81 +825,80 @@ class Salvage(commands.Cog):
         data.sort(key=lambda x: (RARITY_ORDER.index(x.get("rarity","Common")) if x.get("rarity") in RARITY_ORDER else 0, x.get("name","")))
         return data
 
-    def load_ownership(self) -> dict[str, list[dict]]:
-        return load_json(OWNERSHIP_FILE, {})
+    def refresh_collectibles(self) -> bool:
+        # reload collectibles (and rebuild the odds table) only if the file changed
+        try:
+            st = os.stat(COLLECTIBLES_FILE)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+
+        if stamp == self._collectibles_stamp and hasattr(self, "odds"):
+            return False
+
+        self._collectibles_stamp = stamp
+        self.collectibles = self.load_collectibles()
+        self.by_id = {c["id"]: c for c in self.collectibles}
+        self.odds = OddsTable(self.collectibles)
+        return True
 
-    def save_ownership(self, data: dict[str, list[dict]]) -> None:
-        save_json(OWNERSHIP_FILE, data)
-    
     def pick_variant(self) -> str:
-        total = sum(w for _, w in VARIANT_WEIGHTS)
-        r = random.randint(1, total)
-        acc = 0
-        for name, w in VARIANT_WEIGHTS:
-            acc += w
-            if r <= acc:
-                return name
-        return "Normal"
+        return self.odds.pick_variant()
 
     def has_item(self, user_id: int, item_id: str, variant: str) -> bool:
-        own = self.load_ownership()
-        items = own.get(str(user_id), [])
-        return any(x["id"] == item_id and x.get("variant","Normal") == variant for x in items)
+        return self.ownership.has(user_id, item_id, variant)
 
 
     def grant_item(self, user_id: int, item_id: str, variant: str, source: str):
-        own = self.load_ownership()
-        items = own.get(str(user_id), [])
-        items.append({"id": item_id, "variant": variant, "obtained_at": now(), "source": source})
-        own[str(user_id)] = items
-        self.save_ownership(own)
+        self.ownership.grant(user_id, item_id, variant, source)
 
     def remove_item(self, user_id: int, item_id: str, variant: str) -> bool:
-        own = self.load_ownership()
-        items = own.get(str(user_id), [])
-        before = len(items)
-        items = [x for x in items if not (x["id"] == item_id and x.get("variant","Normal") == variant)]
-        if len(items) == before:
-            return False
-        own[str(user_id)] = items
-        self.save_ownership(own)
-        return True
+        return self.ownership.remove(user_id, item_id, variant)
 
 
     def grant_item_and_track(self, user_id: int, item_id: str, variant: str, source: str):
-        item = self.by_id.get(item_id)
-        if not item:
+        if item_id not in self.by_id:
             return
 
         self.grant_item(user_id, item_id, variant, source=source)
+        return self.track_grant(user_id, item_id, variant, source)
+
+    def track_grant(self, user_id: int, item_id: str, variant: str, source: str):
+        # stats side of a grant, for when ownership already moved (gift/trade)
+        item = self.by_id.get(item_id)
+        if not item:
+            return
 
         p_exact, _bucket, _den, _p_rarity, _p_variant = self.odds_for_item_variant_per_spawn(item, variant)
         denom = int(round(1.0 / p_exact)) if p_exact > 0 else 0
 
         uid = str(user_id)
 
-        self.stats_store.bump(uid, SALVAGE_TOTAL, 1)
+        with self.stats_store.update(uid) as tx:
+            tx.bump(SALVAGE_TOTAL, 1)
 
-        if source == "spawn":
-            self.stats_store.bump(uid, SALVAGE_SPAWN_CAUGHT, 1)
-        elif source.startswith("gift:"):
-            self.stats_store.bump(uid, SALVAGE_GIFTS_RECEIVED, 1)
-        elif source.startswith("trade:"):
-            pass
+            if source == "spawn":
+                tx.bump(SALVAGE_SPAWN_CAUGHT, 1)
+            elif source.startswith("gift:"):
+                tx.bump(SALVAGE_GIFTS_RECEIVED, 1)
+            elif source.startswith("trade:"):
+                pass
 
-        rarity = item.get("rarity", "Common")
-        if rarity == "Epic":
-            self.stats_store.bump(uid, SALVAGE_EPIC_TOTAL, 1)
-        if rarity == "Legendary":
-            self.stats_store.bump(uid, SALVAGE_LEGENDARY_TOTAL, 1)
+            rarity = item.get("rarity", "Common")
+            if rarity == "Epic":
+                tx.bump(SALVAGE_EPIC_TOTAL, 1)
+            if rarity == "Legendary":
+                tx.bump(SALVAGE_LEGENDARY_TOTAL, 1)
+
+            if denom >= 50_000:
+                tx.bump(SALVAGE_RARE_50K_TOTAL, 1)
+            if denom >= 1_000_000:
+                tx.bump(SALVAGE_RARE_1M_TOTAL, 1)
 
-        if denom >= 50_000:
-            self.stats_store.bump(uid, SALVAGE_RARE_50K_TOTAL, 1)
-        if denom >= 1_000_000:
-            self.stats_store.bump(uid, SALVAGE_RARE_1M_TOTAL, 1)
+            tx.set_add(SALVAGE_UNIQUE_VARIANTS, variant)
+            tx.set_add(SALVAGE_UNIQUE_RARITIES, rarity)
 
-        self.stats_store.set_bump(uid, SALVAGE_UNIQUE_VARIANTS, variant)
-        self.stats_store.set_bump(uid, SALVAGE_UNIQUE_RARITIES, rarity)
+        return tx.fields
 
 
     def format_owned_label(self, collectible: dict, variant: str) -> str:
@@ -924,58 +923,23 @@ class Salvage(commands.Cog):
         else:
             await interaction.response.send_message(f"Use this in {mention}.", ephemeral=True)
 
-    def weight_map(self, weights_list: list[tuple[str, int]]) -> dict[str, int]:
-        return {k: int(v) for k, v in weights_list}
-
     def available_rarity_weights(self) -> list[tuple[str, int]]:
-        available = {c.get("rarity", "Common") for c in self.collectibles}
-        return [(r, w) for (r, w) in RARITY_WEIGHTS if r in available]
+        return self.odds.rarity_pool
 
     def pick_rarity(self) -> str:
-        pool = self.available_rarity_weights()
-        if not pool:
-            return "Common"
-        rarities = [r for r, _w in pool]
-        weights = [w for _r, w in pool]
-        return random.choices(rarities, weights=weights, k=1)[0]
+        return self.odds.pick_rarity()
 
     def pick_collectible_weighted_by_rarity(self) -> dict:
-        rarity = self.pick_rarity()
-        bucket = [c for c in self.collectibles if c.get("rarity", "Common") == rarity]
-        return random.choice(bucket) if bucket else random.choice(self.collectibles)
+        return self.odds.pick_item()
 
     def bucket_size_for_rarity(self, rarity: str) -> int:
-        return sum(1 for c in self.collectibles if c.get("rarity", "Common") == rarity)
+        return self.odds.bucket_size(rarity)
 
     def odds_for_item_variant_per_spawn(self, item: dict, variant: str) -> tuple[float, int, int, float, float]:
-        r = item.get("rarity", "Common")
-        r_pool = self.available_rarity_weights()
-        r_map = self.weight_map(r_pool)
-        r_total = sum(w for _rr, w in r_pool) or 1
-        r_w = r_map.get(r, 0)
-        p_rarity = (r_w / r_total) if r_w > 0 else 0.0
-
-        bucket_size = self.bucket_size_for_rarity(r) or 1
-        p_item_given_rarity = 1.0 / bucket_size
-
-        v_map = self.weight_map(VARIANT_WEIGHTS)
-        v_total = sum(v_map.values()) or 1
-        v_w = v_map.get(variant, 0)
-        p_variant = (v_w / v_total) if v_w > 0 else 0.0
-
-        p_exact = p_rarity * p_item_given_rarity * p_variant
-        denom_exact = int(round(1.0 / p_exact)) if p_exact > 0 else 0
-        return p_exact, bucket_size, denom_exact, p_rarity, p_variant
+        return self.odds.odds(item, variant).as_tuple()
 
     def fmt_odds(self, p: float) -> str:
-        if p <= 0:
-            return "Unknown"
-        denom = int(round(1.0 / p))
-        pct = p * 100.0
-
-        if denom >= 10_000:
-            return f"1 in {denom:,} ({pct:.6f}%)"
-        return f"1 in {denom:,} ({pct:.3f}%)"
+        return fmt_odds(p)
 
     def fmt_source(self, source: str) -> str:
         if source == "spawn":
@@ -988,79 +952,26 @@ class Salvage(commands.Cog):
             return f"Trade with <@{uid}>"
         return source
 
-    async def eval_achievements_for(self, member: discord.Member):
-        challenges = self.bot.get_cog("Challenges")
-        if not challenges:
-            return
-        ctx = await challenges.build_ctx(member)
-        await self.achievement_engine.evaluate(ctx)
+    async def eval_achievements_for(self, member: discord.Member, changed=None):
+        self.achievement_engine.enqueue(member, changed)
 
-    @staticmethod
-    def safe_open_image(path: str, size=(256,256)) -> Image.Image:
-        try:
-            img = Image.open(path).convert("RGBA")
-        except:
-            img = Image.new("RGBA", size, (40,40,40,255))
-        img = ImageOps.contain(img, size)
-        canvas = Image.new("RGBA", size, (0,0,0,0))
-        canvas.paste(img, ((size[0]-img.size[0])//2, (size[1]-img.size[1])//2), img)
-        return canvas
-
-    @staticmethod
-    def gray_out(img: Image.Image) -> Image.Image:
-        g = ImageOps.grayscale(img).convert("RGBA")
-        g = ImageEnhance.Brightness(g).enhance(0.75)
-        alpha = g.split()[-1].point(lambda a: int(a * 0.55))
-        g.putalpha(alpha)
-        return g
-
-    def add_red_x(self, img: Image.Image) -> Image.Image:
-        overlay = img.copy()
-        d = ImageDraw.Draw(overlay)
-
-        w, h = overlay.size
-        margin = int(min(w,h) * 0.12)
-        thickness = max(8, int(min(w, h) * 0.06))
-
-        red = (220, 50, 60, 255)
-
-        d.line((margin, margin, w - margin, h - margin), fill=red, width=thickness)
-        d.line((w - margin, margin, margin, h - margin), fill=red, width=thickness)
-        return overlay
-    
-    def add_green_check(self, img: Image.Image) -> Image.Image:
-        overlay = img.copy()
-        d = ImageDraw.Draw(overlay)
-
-        w, h = overlay.size
-        margin = int(min(w, h) * 0.10)
-        thickness = max(8, int(min(w, h) * 0.06))
-
-        x2, y2 = w - margin, margin
-        x1, y1 = margin + int(w * 0.4), h - int(h * 0.18)
-        x0, y0 = margin + int(w * 0.1), h - int(h * 0.33)
-
-        green = (60, 220, 120, 255)
-        d.line((x0, y0, x1, y1), fill=green, width=thickness)
-        d.line((x1, y1, x2, y2), fill=green, width=thickness)
-        return overlay
-
-    def build_caught_spawn_image(self, item: dict) -> discord.File | None:
+    async def spawn_image_png(self, item: dict, style: str) -> bytes | None:
         img_path = item.get("image", "")
         if not img_path:
             return None
 
+        data = self.images.cached_png(img_path, SALVAGE_SPAWN_IMAGE_SIZE, style)
+        if data is None:
+            data = await render_service.render(SpawnImageSpec(img_path, SALVAGE_SPAWN_IMAGE_SIZE, style))
+            self.images.store_png(img_path, SALVAGE_SPAWN_IMAGE_SIZE, style, data)
+        return data
+
+    async def build_caught_spawn_image(self, item: dict) -> discord.File | None:
         try:
-            base = self.safe_open_image(img_path, size=(256, 256))
-            base = self.gray_out(base)
-            base = self.add_green_check(base)
-
-            out = BytesIO()
-            base.save(out, format="PNG")
-            out.seek(0)
-            return discord.File(fp=out, filename="caught.png")
+            data = await self.spawn_image_png(item, "check")
         except Exception:
             return None
+        return discord.File(fp=BytesIO(data), filename="caught.png") if data else None
 
     def build_caught_embed(self, item: dict, variant: str, catcher: discord.Member) -> discord.Embed:
         vemoji = VARIANT_EMOJI.get(variant, "")
@@ -1078,68 +989,32 @@ class Salvage(commands.Cog):
 
 
 
-    def build_battle_collage(self, rounds) -> discord.File | None:
-        cell = (220, 220)
-        pad = 20
-        rows = 3
-        w = pad + cell[0] + pad + 80 + pad + cell[0] + pad
-        h = pad + rows * (cell[1] + pad)
-
-        canvas = Image.new("RGBA", (w, h), (20, 20, 24, 255))
-        draw = ImageDraw.Draw(canvas)
-
-        try:
-            font = ImageFont.truetype("arial.ttf", 32)
-        except:
-            font = ImageFont.load_default()
-
-        for i, a_id, a_v, b_id, b_v, outcome in rounds[:3]:
-            a_item = self.by_id.get(a_id, {})
-            b_item = self.by_id.get(b_id, {})
-            a_img_path = a_item.get("image", "")
-            b_img_path = b_item.get("image", "")
-
-            left = self.safe_open_image(a_img_path, size=cell)
-            right = self.safe_open_image(b_img_path, size=cell)
-
-            if outcome == "A":
-                right = self.add_red_x(self.gray_out(right))
-            elif outcome == "B":
-                left = self.add_red_x(self.gray_out(left))
-
-            y = pad + i * (cell[1] + pad)
-            x_left = pad
-            x_mid = x_left + cell[0] + pad
-            x_right = x_mid + 80 + pad
-
-            canvas.paste(left, (x_left, y), left)
-            canvas.paste(right, (x_right, y), right)
-
-            vs = "VS"
-            bbox = draw.textbbox((0,0), vs, font=font)
-            tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            draw.text((x_mid + (80 - tw)//2, y + (cell[1] - th)//2), vs, font=font, fill=(230,230,240,255))
-
-        out = BytesIO()
-        canvas.save(out, format="PNG")
-        out.seek(0)
-        return discord.File(fp=out, filename="battle.png")
-
-    def build_escaped_spawn_image(self, item: dict) -> discord.File | None:
-        img_path = item.get("image", "")
-        if not img_path:
-            return None
+    async def build_battle_collage(self, rounds) -> discord.File | None:
+        cells = tuple(
+            (
+                self.by_id.get(a_id, {}).get("image", ""),
+                "x" if outcome == "B" else "base",
+                self.by_id.get(b_id, {}).get("image", ""),
+                "x" if outcome == "A" else "base",
+            )
+            for _i, a_id, _a_v, b_id, _b_v, outcome in rounds[:3]
+        )
+        # prewarmed cells go along with the spec, the worker only renders the rest
+        pngs = tuple(
+            self.images.cached_png(path, SALVAGE_BATTLE_CELL_SIZE, style) if path else None
+            for a_path, a_style, b_path, b_style in cells
+            for path, style in ((a_path, a_style), (b_path, b_style))
+        )
+        spec = BattleCollageSpec(cells, cells=pngs)
+        data = await render_service.render(spec)
+        return discord.File(fp=BytesIO(data), filename="battle.png")
 
+    async def build_escaped_spawn_image(self, item: dict) -> discord.File | None:
         try:
-            base = self.safe_open_image(img_path, size=(256, 256))
-            base = self.add_red_x(self.gray_out(base))
-
-            out = BytesIO()
-            base.save(out, format="PNG")
-            out.seek(0)
-            return discord.File(fp=out, filename="escaped.png")
+            data = await self.spawn_image_png(item, "x")
         except Exception:
             return None
+        return discord.File(fp=BytesIO(data), filename="escaped.png") if data else None
 
 
     def battle_power(self, item_id: str, variant: str) -> tuple[float, int]:
@@ -1147,10 +1022,18 @@ class Salvage(commands.Cog):
         if not item:
             return (0.0, 0)
 
-        p_exact, _bucket, denom_exact, _p_rarity, _p_variant = self.odds_for_item_variant_per_spawn(item, variant)
-        return (p_exact, denom_exact)
+        entry = self.odds.odds(item, variant)
+        return (entry.p_exact, entry.denom)
 
     def compare_power(self, a_item_id: str, a_variant: str, b_item_id: str, b_variant: str) -> int:
+        a = self.odds.get(a_item_id, a_variant)
+        b = self.odds.get(b_item_id, b_variant)
+        if a and b and a.rank and b.rank:
+            # rarer wins, rank 1 is the rarest
+            if a.rank == b.rank:
+                return 0
+            return 1 if a.rank < b.rank else -1
+
         a_p, a_d = self.battle_power(a_item_id, a_variant)
         b_p, b_d = self.battle_power(b_item_id, b_variant)
 
@@ -1167,6 +1050,7 @@ class Salvage(commands.Cog):
 
 
     async def spawn(self, trigger_message: discord.Message | None = None):
+        self.refresh_collectibles()
         if not self.collectibles:
             return
 
@@ -1192,7 +1076,7 @@ class Salvage(commands.Cog):
         role = None
         guild = channel.guild
         if guild and SALVAGE_PING_ROLE_NAME:
-            role = discord.utils.get(guild.roles, name=SALVAGE_PING_ROLE_NAME)
+            role = guild_index.role(guild, SALVAGE_PING_ROLE_NAME)
 
         if role is not None:
             ping_content = f"Opt-In Mentions: {role.mention}"
@@ -1315,7 +1199,7 @@ class Salvage(commands.Cog):
 
             escaped_embed = self.build_spawn_embed(s.item, s.variant, 0, escaped=True)
 
-            escaped_file = self.build_escaped_spawn_image(s.item)
+            escaped_file = await self.build_escaped_spawn_image(s.item)
             if escaped_file:
                 escaped_embed.set_image(url="attachment://escaped.png")
                 await msg.edit(embed=escaped_embed, attachments=[escaped_file])
@@ -1382,8 +1266,8 @@ class Salvage(commands.Cog):
 
             self.active_spawn = None
 
-        self.grant_item_and_track(interaction.user.id, item_id, variant, source="spawn")
-        await self.eval_achievements_for(interaction.user)
+        changed = self.grant_item_and_track(interaction.user.id, item_id, variant, source="spawn")
+        await self.eval_achievements_for(interaction.user, changed=changed)
 
         vemoji = VARIANT_EMOJI.get(variant, "")
         rarity = s.item.get("rarity", "Common")
@@ -1405,7 +1289,7 @@ class Salvage(commands.Cog):
                 spawn_msg = await channel.fetch_message(s.message_id)
 
                 caught_embed = self.build_caught_embed(s.item, s.variant, interaction.user)
-                caught_file = self.build_caught_spawn_image(s.item)
+                caught_file = await self.build_caught_spawn_image(s.item)
 
                 if caught_file:
                     caught_embed.set_image(url="attachment://caught.png")
@@ -1464,25 +1348,18 @@ class Salvage(commands.Cog):
         if not self.game_channel_only(interaction):
             return await self.send_wrong_channel(interaction)
 
-        own = self.load_ownership().get(str(interaction.user.id), [])
-        rec_map: dict[tuple[str, str], dict] = {}
-        for x in own:
-            key = (x["id"], x.get("variant", "Normal"))
-            if key not in rec_map or int(x.get("obtained_at", 0)) < int(rec_map[key].get("obtained_at", 0)):
-                rec_map[key] = x
+        rec_map = self.ownership.items(interaction.user.id)
+        owned_keys = rec_map.keys()
 
-        owned_keys = set(rec_map.keys())
-
-        by_id = {c["id"]: c for c in self.collectibles}
+        self.refresh_collectibles()
         entries = []
 
         for (item_id, variant) in owned_keys:
-            c = by_id.get(item_id)
+            c = self.by_id.get(item_id)
             if not c:
                 continue
 
-            rec = rec_map[(item_id, variant)]
-            source = rec.get("source", "spawn")
+            source = rec_map[(item_id, variant)].source
 
             p_exact, bucket_size, denom_exact, p_rarity, p_variant = self.odds_for_item_variant_per_spawn(c, variant)
 
@@ -1507,18 +1384,16 @@ class Salvage(commands.Cog):
     
 
     async def owned_autocomplete(self, interaction: discord.Interaction, current: str):
-        own = self.load_ownership().get(str(interaction.user.id), [])
+        own = self.ownership.items(interaction.user.id)
         if not own:
             return []
-        by_id = {c["id"]: c for c in self.collectibles}
         needle = (current or "").lower().strip()
 
         seen = []
-        for x in own:
-            c = by_id.get(x["id"])
+        for (item_id, variant) in own:
+            c = self.by_id.get(item_id)
             if not c:
                 continue
-            variant = x.get("variant","Normal")
             label = f"{c['name']} [{variant}]"
             if needle and needle not in label.lower():
                 continue
@@ -1554,11 +1429,14 @@ class Salvage(commands.Cog):
         if self.has_item(member.id, item_id, variant):
             return await interaction.response.send_message("They already own that exact variant.", ephemeral=True)
 
-        self.remove_item(interaction.user.id, item_id, variant)
-        self.stats_store.bump(str(interaction.user.id), SALVAGE_GIFTS_SENT, 1)
-        self.grant_item_and_track(member.id, item_id, variant, source=f"gift:{interaction.user.id}")
-        await self.eval_achievements_for(interaction.user)
-        await self.eval_achievements_for(member)
+        if not self.ownership.transfer(interaction.user.id, member.id, item_id, variant, source=f"gift:{interaction.user.id}"):
+            return await interaction.response.send_message("You don't own that item/variant anymore.", ephemeral=True)
+
+        with self.stats_store.update(interaction.user.id) as tx:
+            tx.bump(SALVAGE_GIFTS_SENT, 1)
+        changed = self.track_grant(member.id, item_id, variant, source=f"gift:{interaction.user.id}")
+        await self.eval_achievements_for(interaction.user, changed=tx.fields)
+        await self.eval_achievements_for(member, changed=changed)
 
         vemoji = VARIANT_EMOJI.get(variant, "")
         embed = discord.Embed(
@@ -1580,10 +1458,10 @@ class Salvage(commands.Cog):
         if member.id == interaction.user.id:
             return await interaction.response.send_message("You can't trade with yourself.", ephemeral=True)
 
-        self.by_id = {c["id"]: c for c in self.collectibles}
+        self.refresh_collectibles()
 
-        a_own = self.load_ownership().get(str(interaction.user.id), [])
-        b_own = self.load_ownership().get(str(member.id), [])
+        a_own = self.ownership.items(interaction.user.id)
+        b_own = self.ownership.items(member.id)
         if not a_own:
             return await interaction.response.send_message("You don't own anything to trade yet.", ephemeral=True)
         if not b_own:
@@ -1604,17 +1482,11 @@ class Salvage(commands.Cog):
         if member.id == interaction.user.id:
             return await interaction.response.send_message("You can't battle yourself.", ephemeral=True)
 
-        self.by_id = {c["id"]: c for c in self.collectibles}
-
-        a_own = self.load_ownership().get(str(interaction.user.id), [])
-        b_own = self.load_ownership().get(str(member.id), [])
-
-        a_unique = {(x["id"], x.get("variant","Normal")) for x in a_own}
-        b_unique = {(x["id"], x.get("variant","Normal")) for x in b_own}
+        self.refresh_collectibles()
 
-        if len(a_unique) < 3:
+        if self.ownership.unique_count(interaction.user.id) < 3:
             return await interaction.response.send_message("You need at least **3** unique salvages to battle.", ephemeral=True)
-        if len(b_unique) < 3:
+        if self.ownership.unique_count(member.id) < 3:
             return await interaction.response.send_message(f"{member.mention} needs at least **3** unique salvages to battle.", ephemeral=True)
 
         view = BattleView(self, interaction.user, member)
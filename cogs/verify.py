@@ -14,6 +14,8 @@ import ssl
 from email.message import EmailMessage
 from constants import VERIFY_PATH, VERIFY_ROLE, MODERATOR_ONLY_CHANNEL_ID
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
+from helpers.guild_index import guild_index
 
 
 ALLOWED_SUFFIXES = ("@student.unsw.edu.au", "@ad.unsw.edu.au", "@unsw.edu.au", "@arc.unsw.edu.au")
@@ -83,16 +85,9 @@ class VerifyStore:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
-    def load(self) -> Dict[str, Any]:
-        if not self.path.exists():
-            return {"verified": {}, "pending": {}}
-
+    async def load(self) -> Dict[str, Any]:
         try:
-            raw = self.path.read_text(encoding="utf-8").strip()
-            if not raw:
-                return {"verified": {}, "pending": {}}
-
-            data = json.loads(raw)
+            data = await persistence.read_json_async(self.path)
             if not isinstance(data, dict):
                 return {"verified": {}, "pending": {}}
 
@@ -103,62 +98,67 @@ class VerifyStore:
             return {"verified": {}, "pending": {}}
 
     def save(self, data: Dict[str, Any]) -> None:
-        self.path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        persistence.write_json(self.path, data, indent=2, sort_keys=True)
 
-    def is_verified(self, user_id: int) -> bool:
-        data = self.load()
+    async def is_verified(self, user_id: int) -> bool:
+        data = await self.load()
         return str(user_id) in data.get("verified", {})
 
-    def mark_verified(self, user_id: int) -> None:
-        data = self.load()
-        uid = str(user_id)
-        data["verified"][uid] = {"verified_at": _now()}
-        data["pending"].pop(uid, None)
-        self.save(data)
-
-    def revoke_verified(self, user_id: int) -> None:
-        data = self.load()
-        uid = str(user_id)
-        data["verified"].pop(uid, None)
-        data["pending"].pop(uid, None)
-        self.save(data)
-
-    def set_pending_otp(self, user_id: int, otp_hash: str, otp_salt: str) -> None:
-        data = self.load()
-        uid = str(user_id)
-        now = _now()
-        data.setdefault("pending", {})
-        data["pending"][uid] = {
-            "otp_hash": otp_hash,
-            "otp_salt": otp_salt,
-            "otp_expires_at": now + OTP_TTL_SECONDS,
-            "otp_last_sent_at": now,
-            "otp_tries": 0
-        }
-        self.save(data)
-
-    def get_pending(self, user_id: int) -> Optional[Dict[str, Any]]:
-        data = self.load()
-        return data.get("pending", {}).get(str(user_id))
+    async def mark_verified(self, user_id: int) -> None:
+        async with persistence.lock(self.path):
+            data = await self.load()
+            uid = str(user_id)
+            data["verified"][uid] = {"verified_at": _now()}
+            data["pending"].pop(uid, None)
+            self.save(data)
 
-    def bump_tries(self, user_id: int) -> int:
-        data = self.load()
-        uid = str(user_id)
-        entry = data.get("pending", {}).get(uid)
-        if not entry:
-            return 0
-        entry["otp_tries"] = int(entry.get("otp_tries", 0)) + 1
-        data["pending"][uid] = entry
-        self.save(data)
-        return int(entry["otp_tries"])
-
-    def clear_pending(self, user_id: int) -> None:
-        data = self.load()
-        uid = str(user_id)
-        if uid in data.get("pending", {}):
+    async def revoke_verified(self, user_id: int) -> None:
+        async with persistence.lock(self.path):
+            data = await self.load()
+            uid = str(user_id)
+            data["verified"].pop(uid, None)
             data["pending"].pop(uid, None)
             self.save(data)
 
+    async def set_pending_otp(self, user_id: int, otp_hash: str, otp_salt: str) -> None:
+        async with persistence.lock(self.path):
+            data = await self.load()
+            uid = str(user_id)
+            now = _now()
+            data.setdefault("pending", {})
+            data["pending"][uid] = {
+                "otp_hash": otp_hash,
+                "otp_salt": otp_salt,
+                "otp_expires_at": now + OTP_TTL_SECONDS,
+                "otp_last_sent_at": now,
+                "otp_tries": 0
+            }
+            self.save(data)
+
+    async def get_pending(self, user_id: int) -> Optional[Dict[str, Any]]:
+        data = await self.load()
+        return data.get("pending", {}).get(str(user_id))
+
+    async def bump_tries(self, user_id: int) -> int:
+        async with persistence.lock(self.path):
+            data = await self.load()
+            uid = str(user_id)
+            entry = data.get("pending", {}).get(uid)
+            if not entry:
+                return 0
+            entry["otp_tries"] = int(entry.get("otp_tries", 0)) + 1
+            data["pending"][uid] = entry
+            self.save(data)
+            return int(entry["otp_tries"])
+
+    async def clear_pending(self, user_id: int) -> None:
+        async with persistence.lock(self.path):
+            data = await self.load()
+            uid = str(user_id)
+            if uid in data.get("pending", {}):
+                data["pending"].pop(uid, None)
+                self.save(data)
+
 
 class VerifyEmailModal(discord.ui.Modal, title="UNSW Verification"):
     email = discord.ui.TextInput(
@@ -231,7 +231,7 @@ class ForceVerifyConfirm(discord.ui.View):
             )
             return
 
-        self.cog.store.mark_verified(self.target.id)
+        await self.cog.store.mark_verified(self.target.id)
 
         await self.cog.log_action(
             interaction.guild,
@@ -263,7 +263,7 @@ class Verify(commands.Cog):
         self.store = VerifyStore(VERIFY_PATH)
 
     def get_verify_role(self, guild: discord.Guild) -> Optional[discord.Role]:
-        return discord.utils.get(guild.roles, name=VERIFY_ROLE)
+        return guild_index.role(guild, VERIFY_ROLE)
 
     async def log_action(self, guild: discord.Guild, message: str):
         channel = guild.get_channel(MODERATOR_ONLY_CHANNEL_ID)
@@ -309,7 +309,7 @@ class Verify(commands.Cog):
             )
             return
 
-        pending = self.store.get_pending(member.id) or {}
+        pending = await self.store.get_pending(member.id) or {}
         last_sent = int(pending.get("otp_last_sent_at", 0))
         now = _now()
         if last_sent and now - last_sent < OTP_MIN_RESEND_SECONDS:
@@ -333,12 +333,12 @@ class Verify(commands.Cog):
         code = _gen_code()
         salt = secrets.token_urlsafe(16)
         otp_hash = _sha256(salt + code)
-        self.store.set_pending_otp(member.id, otp_hash=otp_hash, otp_salt=salt)
+        await self.store.set_pending_otp(member.id, otp_hash=otp_hash, otp_salt=salt)
 
         try:
             await _send_otp_email(email, code)
         except Exception:
-            self.store.clear_pending(member.id)
+            await self.store.clear_pending(member.id)
             await interaction.edit_original_response(
                 content="I couldn't send the email code right now. Please try again later."
             )
@@ -370,7 +370,7 @@ class Verify(commands.Cog):
             await interaction.response.send_message("Run this command inside the server.", ephemeral=True)
             return
 
-        if role in member.roles or self.store.is_verified(member.id):
+        if role in member.roles or await self.store.is_verified(member.id):
             ok = await self.grant_role(member, role)
             if not ok:
                 await interaction.response.send_message(
@@ -379,8 +379,8 @@ class Verify(commands.Cog):
                 )
                 return
 
-            if not self.store.is_verified(member.id):
-                self.store.mark_verified(member.id)
+            if not await self.store.is_verified(member.id):
+                await self.store.mark_verified(member.id)
 
             await interaction.response.send_message("✅ You're already verified.", ephemeral=True)
             return
@@ -406,30 +406,30 @@ class Verify(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        if role in member.roles or self.store.is_verified(member.id):
+        if role in member.roles or await self.store.is_verified(member.id):
             ok = await self.grant_role(member, role)
-            if ok and not self.store.is_verified(member.id):
-                self.store.mark_verified(member.id)
+            if ok and not await self.store.is_verified(member.id):
+                await self.store.mark_verified(member.id)
             return await interaction.edit_original_response(content="✅ You're verified!")
 
-        entry = self.store.get_pending(member.id)
+        entry = await self.store.get_pending(member.id)
         if not entry:
             return await interaction.edit_original_response(content="No code found. Run `/verify` again.")
 
         if _now() > int(entry.get("otp_expires_at", 0)):
-            self.store.clear_pending(member.id)
+            await self.store.clear_pending(member.id)
             return await interaction.edit_original_response(content="That code expired. Run `/verify` again.")
 
         tries = int(entry.get("otp_tries", 0))
         if tries >= OTP_MAX_TRIES:
-            self.store.clear_pending(member.id)
+            await self.store.clear_pending(member.id)
             return await interaction.edit_original_response(content="Too many attempts. Run `/verify` again.")
 
         salt = str(entry.get("otp_salt", ""))
         expected = str(entry.get("otp_hash", ""))
 
         if _sha256(salt + code.strip()) != expected:
-            self.store.bump_tries(member.id)
+            await self.store.bump_tries(member.id)
             return await interaction.edit_original_response(content="Incorrect code. Try again.")
 
         ok = await self.grant_role(member, role)
@@ -438,7 +438,7 @@ class Verify(commands.Cog):
                 content="✅ Code correct, but I couldn't grant the role. Tell an admin (permissions/hierarchy)."
             )
 
-        self.store.mark_verified(member.id)
+        await self.store.mark_verified(member.id)
         await self.log_action(interaction.guild, f"✅ {member.mention} verified via email OTP.")
         return await interaction.edit_original_response(content="✅ You are verified!")
 
@@ -465,7 +465,7 @@ class Verify(commands.Cog):
                 await interaction.response.send_message("I couldn't remove the role (permissions/hierarchy).", ephemeral=True)
                 return
 
-        self.store.revoke_verified(user.id)
+        await self.store.revoke_verified(user.id)
         await self.log_action(interaction.guild, f"🛠️ {interaction.user.mention} revoked verification for {user.mention}")
         await interaction.response.send_message(f"Revoked verification for {user.mention}", ephemeral=True)
 
@@ -492,10 +492,10 @@ class Verify(commands.Cog):
             )
             return
 
-        if role in user.roles or self.store.is_verified(user.id):
+        if role in user.roles or await self.store.is_verified(user.id):
             ok = await self.grant_role(user, role)
-            if ok and not self.store.is_verified(user.id):
-                self.store.mark_verified(user.id)
+            if ok and not await self.store.is_verified(user.id):
+                await self.store.mark_verified(user.id)
             await interaction.response.send_message(
                 f"✅ {user.mention} is already verified (role/store ensured).",
                 ephemeral=True
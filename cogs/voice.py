@@ -42,22 +42,16 @@ class VoiceTracking(commands.Cog):
         if duration <= 0:
             return
 
-        self.stats_store.bump(user_id, VOICE_MINUTES, duration)
-
-        stats = self.stats_store.get(user_id)
-        longest = stats.get(VOICE_SESSION_MAX, 0)
-        if duration > longest:
-            self.stats_store.set_value(user_id, VOICE_SESSION_MAX, duration)
-
-        if session["max_people"] >= 3:
-            self.stats_store.bump(user_id, VOICE_3P_MINUTES, duration)
-        if session["max_people"] >= 5:
-            self.stats_store.bump(user_id, VOICE_5P_MINUTES, duration)
-
-        cog = self.bot.get_cog("Challenges")
-        if cog:
-            ctx = await cog.build_ctx(member)
-            await self.achievement_engine.evaluate(ctx)
+        with self.stats_store.update(user_id) as tx:
+            tx.bump(VOICE_MINUTES, duration)
+            tx.set_max(VOICE_SESSION_MAX, duration)
+
+            if session["max_people"] >= 3:
+                tx.bump(VOICE_3P_MINUTES, duration)
+            if session["max_people"] >= 5:
+                tx.bump(VOICE_5P_MINUTES, duration)
+
+        self.achievement_engine.enqueue(member, tx.fields)
 
 
 
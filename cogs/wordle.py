@@ -9,6 +9,7 @@ from discord import app_commands
 from discord.app_commands import Choice
 from constants import *
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
 
 WORDLE_PATH = Path(WORDLE_STATS_PATH)
 SYD = ZoneInfo("Australia/Sydney")
@@ -54,17 +55,17 @@ class WordleTracker(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    def load_state(self):
-        if WORDLE_PATH.exists():
-            return json.loads(WORDLE_PATH.read_text(encoding="utf-8"))
+    async def load_state(self):
+        state = await persistence.read_json_async(WORDLE_PATH)
+        if state is not None:
+            return state
         return {
             "group": {"current": 0, "best": 0, "last_date": None, "total_days_tracked": 0},
             "users": {}
         }
 
     def save_state(self, state):
-        WORDLE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        WORDLE_PATH.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        persistence.write_json(WORDLE_PATH, state, indent=2)
 
     def ensure_schema(self, users: dict, uid_str: str) -> dict:
         u = users.setdefault(str(uid_str), {})
@@ -286,7 +287,7 @@ class WordleTracker(commands.Cog):
         udata["current_streak"] = current_streak
         udata["last_date"] = _iso(latest)
 
-    async def eval_achievements_for(self, guild: discord.Guild, member_id: int):
+    async def eval_achievements_for(self, guild: discord.Guild, member_id: int, changed=WORDLE_CTX_KEYS):
         challenges = self.bot.get_cog("Challenges")
         if not challenges:
             return
@@ -294,7 +295,7 @@ class WordleTracker(commands.Cog):
         if not m:
             return
         ctx = await challenges.build_ctx(m)
-        await challenges.achievement_engine.evaluate(ctx)
+        await challenges.achievement_engine.evaluate(ctx, changed=changed)
 
 
     async def process_wordle_recap_message(self, message: discord.Message) -> dict:
@@ -309,68 +310,69 @@ class WordleTracker(commands.Cog):
         wordle_day_str = wordle_day.isoformat()
         prev_day_str = (created_syd.date() - timedelta(days=2)).isoformat()
 
-        state = self.load_state()
+        async with persistence.lock(WORDLE_PATH):
+            state = await self.load_state()
 
-        g = state.setdefault("group", {})
-        g.setdefault("current", 0)
-        g.setdefault("best", 0)
-        g.setdefault("last_date", None)
-        g.setdefault("total_days_tracked", 0)
+            g = state.setdefault("group", {})
+            g.setdefault("current", 0)
+            g.setdefault("best", 0)
+            g.setdefault("last_date", None)
+            g.setdefault("total_days_tracked", 0)
 
-        g["current"] = group_streak
-        g["best"] = max(int(g.get("best") or 0), group_streak)
-        if g.get("last_date") != wordle_day_str:
-            g["total_days_tracked"] = int(g.get("total_days_tracked") or 0) + 1
-        g["last_date"] = wordle_day_str
+            g["current"] = group_streak
+            g["best"] = max(int(g.get("best") or 0), group_streak)
+            if g.get("last_date") != wordle_day_str:
+                g["total_days_tracked"] = int(g.get("total_days_tracked") or 0) + 1
+            g["last_date"] = wordle_day_str
 
-        token_to_id = {}
-        for u in message.mentions:
-            token_to_id[f"<@{u.id}>"] = u.id
-            token_to_id[f"<@!{u.id}>"] = u.id
+            token_to_id = {}
+            for u in message.mentions:
+                token_to_id[f"<@{u.id}>"] = u.id
+                token_to_id[f"<@!{u.id}>"] = u.id
 
-        played: dict[int, tuple[bool, int | None]] = {}
+            played: dict[int, tuple[bool, int | None]] = {}
 
-        for line in message.content.splitlines():
-            lm = LINE_RE.match(line)
-            if not lm:
-                continue
+            for line in message.content.splitlines():
+                lm = LINE_RE.match(line)
+                if not lm:
+                    continue
 
-            score = lm.group(1)
-            rest = lm.group(2)
+                score = lm.group(1)
+                rest = lm.group(2)
 
-            solved = (score != "X")
-            guesses = None if score == "X" else int(score)
+                solved = (score != "X")
+                guesses = None if score == "X" else int(score)
 
-            for token, uid in token_to_id.items():
-                if token in rest:
-                    played[uid] = (solved, guesses)
+                for token, uid in token_to_id.items():
+                    if token in rest:
+                        played[uid] = (solved, guesses)
 
-        users = state.setdefault("users", {})
+            users = state.setdefault("users", {})
 
-        # Safe iteration (users can grow)
-        for uid_str in list(users.keys()):
-            udata = self.ensure_schema(users, uid_str)
-            self.seed_history_if_needed(udata)
+            # Safe iteration (users can grow)
+            for uid_str in list(users.keys()):
+                udata = self.ensure_schema(users, uid_str)
+                self.seed_history_if_needed(udata)
 
-            if udata.get("last_date") != wordle_day_str and int(uid_str) not in played:
-                udata["current_streak"] = 0
-                self.set_history_entry(udata, wordle_day_str, "missed", None, source="recap")
+                if udata.get("last_date") != wordle_day_str and int(uid_str) not in played:
+                    udata["current_streak"] = 0
+                    self.set_history_entry(udata, wordle_day_str, "missed", None, source="recap")
 
-        for uid, (solved, guesses) in played.items():
-            uid_str = str(uid)
-            udata = self.ensure_schema(users, uid_str)
-            self.seed_history_if_needed(udata)
+            for uid, (solved, guesses) in played.items():
+                uid_str = str(uid)
+                udata = self.ensure_schema(users, uid_str)
+                self.seed_history_if_needed(udata)
 
-            if not solved:
-                self.set_history_entry(udata, wordle_day_str, "failed", None, source="recap")
-            else:
-                self.set_history_entry(udata, wordle_day_str, "solved", guesses, source="recap")
+                if not solved:
+                    self.set_history_entry(udata, wordle_day_str, "failed", None, source="recap")
+                else:
+                    self.set_history_entry(udata, wordle_day_str, "solved", guesses, source="recap")
 
-            self.rebuild_user_from_history(udata)
+                self.rebuild_user_from_history(udata)
 
-            udata["last_date"] = wordle_day_str
+                udata["last_date"] = wordle_day_str
 
-        self.save_state(state)
+            self.save_state(state)
 
         return {
             "ok": True,
@@ -399,8 +401,7 @@ class WordleTracker(commands.Cog):
             for uid in summary["processed_users"]:
                 member = message.guild.get_member(uid)
                 if member:
-                    ctx = await challenges_cog.build_ctx(member)
-                    await challenges_cog.achievement_engine.evaluate(ctx)
+                    challenges_cog.achievement_engine.enqueue(member, WORDLE_CTX_KEYS)
 
     @app_commands.command(name="wordle_grant_day", description="(Admin) Grant or edit a user's Wordle result for a specific day.")
     @app_commands.describe(
@@ -456,17 +457,18 @@ class WordleTracker(commands.Cog):
                 return
             guesses = None
 
-        state = self.load_state()
-        users = state.setdefault("users", {})
+        async with persistence.lock(WORDLE_PATH):
+            state = await self.load_state()
+            users = state.setdefault("users", {})
 
-        udata = self.ensure_schema(users, str(member.id))
-        self.seed_history_if_needed(udata)
+            udata = self.ensure_schema(users, str(member.id))
+            self.seed_history_if_needed(udata)
 
-        self.set_history_entry(udata, day_str, state_val, guesses, source="manual")
+            self.set_history_entry(udata, day_str, state_val, guesses, source="manual")
 
-        self.rebuild_user_from_history(udata)
+            self.rebuild_user_from_history(udata)
 
-        self.save_state(state)
+            self.save_state(state)
 
         try:
             await self.eval_achievements_for(interaction.guild, member.id)
@@ -535,7 +537,7 @@ class WordleTracker(commands.Cog):
                 member = interaction.guild.get_member(uid)
                 if member:
                     ctx = await challenges_cog.build_ctx(member)
-                    await challenges_cog.achievement_engine.evaluate(ctx)
+                    await challenges_cog.achievement_engine.evaluate(ctx, changed=WORDLE_CTX_KEYS)
 
         await interaction.followup.send(
             f"✅ Processed recap for **{summary['wordle_day']}**.\n"
@@ -7,8 +7,9 @@ import json
 from datetime import datetime
 from helpers.scraper import fetch_arc_event_data, fetch_image_bytes
 from constants import SYDNEY_TZ
-from constants import VOLUNTEER_VOTES_PATH
+from constants import VOLUNTEER_VOTES_PATH, VOTW_VOTES_CAST, VOTW_VOTES_RECIEVED
 from helpers.admin import admin_meta
+from helpers.persistence import persistence
 
 VOTES_FILE = Path(VOLUNTEER_VOTES_PATH)
 
@@ -22,15 +23,11 @@ class Workshops(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def load_volunteer_votes(self):
-        if not VOTES_FILE.exists():
-            return {}
-        with open(VOTES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    async def load_volunteer_votes(self):
+        return await persistence.read_json_async(VOTES_FILE, {})
 
     def save_volunteer_votes(self, points):
-        with open(VOTES_FILE, "w", encoding="utf-8") as f:
-            json.dump(points, f, indent=2, sort_keys=True)
+        persistence.write_json(VOTES_FILE, points, indent=2, sort_keys=True)
 
     @app_commands.command(name="admintest", description="only admins can use")
     @app_commands.default_permissions(administrator=True)
@@ -55,21 +52,22 @@ class Workshops(commands.Cog):
             await interaction.followup.send(f"⚠️ You cannot vote for yourself")
             return
 
-        votes = self.load_volunteer_votes()
-        week_votes = votes.setdefault(week_key, {})
-        user_votes = week_votes.setdefault(voter_id, [])
+        async with persistence.lock(VOTES_FILE):
+            votes = await self.load_volunteer_votes()
+            week_votes = votes.setdefault(week_key, {})
+            user_votes = week_votes.setdefault(voter_id, [])
 
-        if nominee_id in user_votes:
-            await interaction.followup.send(f"⚠️ You already voted for {user.mention} this week")
-            return
+            if nominee_id in user_votes:
+                await interaction.followup.send(f"⚠️ You already voted for {user.mention} this week")
+                return
 
-        user_votes.append(nominee_id)
-        self.save_volunteer_votes(votes)
+            user_votes.append(nominee_id)
+            self.save_volunteer_votes(votes)
 
         challenges_cog = interaction.client.get_cog("Challenges")
         if challenges_cog:
-            ctx = await challenges_cog.build_ctx(interaction.user)
-            await challenges_cog.achievement_engine.evaluate(ctx)
+            challenges_cog.achievement_engine.enqueue(interaction.user, {VOTW_VOTES_CAST})
+            challenges_cog.achievement_engine.enqueue(user, {VOTW_VOTES_RECIEVED})
 
         await interaction.followup.send(f"✅ You have voted for {user.mention} for **Volunteer of the Week** (Week {week}) 💚")
 
@@ -85,7 +83,7 @@ class Workshops(commands.Cog):
     async def vote_stats(self, interaction: discord.Interaction, week: int):
         await interaction.response.defer()
 
-        votes = self.load_volunteer_votes()
+        votes = await self.load_volunteer_votes()
         week_key = str(week)
 
         if week_key not in votes:
@@ -119,7 +117,7 @@ class Workshops(commands.Cog):
 
         voter_id = str(interaction.user.id)
         week_key = str(week)
-        votes = self.load_volunteer_votes()
+        votes = await self.load_volunteer_votes()
 
 
         if (week_key not in votes) or (voter_id not in votes[week_key]):
@@ -124,6 +124,17 @@ ADMIN_ROLES = [OFFICER_ROLE, SENIOR_VOLUNTEER_ROLE, COORDINATOR_ROLE]
 
 IMAGE_OUTPUT_DIR = Path(tempfile.gettempdir()) / "discord-bot"
 
+RENDER_WORKERS = 2
+RENDER_MAX_CONCURRENT = 4
+RENDER_TIMEOUT_SECONDS = 30
+BINGO_LAYER_CACHE_CARDS = 8
+BINGO_PNG_CACHE_MB = 32
+
+AVATAR_SIZE = 128
+AVATAR_CACHE_DIR = IMAGE_OUTPUT_DIR / "avatars"
+AVATAR_CACHE_MB = 32
+AVATAR_FETCH_TIMEOUT_SECONDS = 10
+
 CHALLENGE_PATH = "data/challenges.json"
 CHALLENGE_SUGGESTIONS_PATH = "data/challenge_suggestions.json"
 CHALLENGE_POINTS_PATH = "data/challenge_points.json"
@@ -144,7 +155,11 @@ BUGS_PATH = "data/bugs.json"
 MAKE_TEN_PATH = "data/make_ten.json"
 STAMP_CARDS_PATH = "data/stamp_cards.json"
 PUT_THROUGH_PATH = "data/put_through.json"
+PROCESSING_INDEX_PATH = "data/processing_index.json"
 LEETCODE_DATA_PATH = "data/leetcode.json"
+DATASTORE_PATH = "data/ereuse.db"
+# user stats and salvage ownership live in DATASTORE_PATH instead of their JSON files
+USE_DATASTORE = True
 
 
 MEMBER = "member"
@@ -229,9 +244,32 @@ INVITES_COUNT = "invites_count"
 MEMES_POSTED = "memes_posted"
 STAMP_CARDS_COMPLETE = "stamp_cards_complete"
 
+# ctx keys that come from the same source, used as changed sets for achievement evaluation
+POINTS_CTX_KEYS = (WEEKS, TOTAL_CHALLENGES, CURRENT_STREAK, LONGEST_STREAK)
+WORDLE_CTX_KEYS = (WORDLE_BEST_TURN, WORDLE_BEST_STREAK, WORDLE_TOTAL_SOLVED)
+MAKE_TEN_CTX_KEYS = (
+    MAKE_TEN_TOTAL_PLAYED, MAKE_TEN_TOTAL_SOLVED, MAKE_TEN_BEST_STREAK,
+    MAKE_TEN_FASTEST_SOLVE_SECONDS, MAKE_TEN_EARLY_BIRD_SOLVES,
+)
+
 
 STATE_TTL_SECONDS = 15 * 60
 
+STATS_FLUSH_SECONDS = 30
+STATS_FLUSH_DIRTY_USERS = 25
+STATS_COMPACT_SECONDS = 5 * 60
+STATS_COMPACT_LINES = 1000
+STATS_JOURNAL_SEQ_KEY = "_journal_seq"
+
+INVITE_REFRESH_MINUTES = 30
+
+ACH_EVAL_DEBOUNCE_SECONDS = 2
+ACH_EVAL_MAX_DELAY_SECONDS = 10
+ACH_EVAL_WORKERS = 4
+ACH_ANNOUNCE_WINDOW_SECONDS = 5
+
+REACTION_CACHE_MESSAGES = 2000
+
 
 
 CHALLENGE_CHANNEL_ID = 1457312927395741797
@@ -295,6 +333,10 @@ SPAWN_COOLDOWN_MAX = 300
 HINT_COOLDOWN_SECONDS = 30
 MAX_HINTS_PER_SPAWN = 3
 
+SALVAGE_SPAWN_IMAGE_SIZE = (256, 256)
+SALVAGE_BATTLE_CELL_SIZE = (220, 220)
+SALVAGE_IMAGE_CACHE_MB = 64
+
 RARITY_ORDER = ["Common", "Uncommon", "Rare", "Epic", "Legendary"]
 RARITY_EMOJI = {
     "Common": "⚪",
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+
+class LazyContext(Mapping):
+    # Dict-like achievement context. Keys are grouped by the data source that
+    # produces them, and a group only runs the first time one of its keys is read.
+    # The result is kept for the rest of this context's life.
+
+    def __init__(self, base: Dict[str, Any], groups: Iterable[tuple[Iterable[str], Callable[[], Dict[str, Any]]]]):
+        self._values: Dict[str, Any] = dict(base)
+        self._groups: list[Callable[[], Dict[str, Any]]] = []
+        self._providers: Dict[str, int] = {}
+        self._order: list[str] = list(self._values)
+
+        for keys, fn in groups:
+            idx = len(self._groups)
+            self._groups.append(fn)
+            for key in keys:
+                self._providers[key] = idx
+                self._order.append(key)
+
+        self._computed: set[int] = set()
+
+    def _compute(self, idx: int) -> None:
+        self._computed.add(idx)
+        self._values.update(self._groups[idx]())
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        idx = self._providers.get(key)
+        if idx is None or idx in self._computed:
+            raise KeyError(key)
+
+        self._compute(idx)
+        return self._values[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or key in self._providers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def computed_groups(self) -> int:
+        return len(self._computed)
+
+    def __repr__(self) -> str:
+        return f"LazyContext({self._values!r}, pending={len(self._groups) - len(self._computed)} groups)"
+
+
+class TracingContext(Mapping):
+    # wraps a context and records every key a check reads, so achievements
+    # without explicit "deps" can be indexed by what they actually look at
+    def __init__(self, ctx: Mapping):
+        self._ctx = ctx
+        self.keys_read: set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        self.keys_read.add(key)
+        return self._ctx[key]
+
+    def __contains__(self, key) -> bool:
+        self.keys_read.add(key)
+        return key in self._ctx
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ctx)
+
+    def __len__(self) -> int:
+        return len(self._ctx)
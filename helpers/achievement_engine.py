@@ -1,8 +1,12 @@
 from __future__ import annotations
-from helpers.achievements import ACHIEVEMENTS
+from helpers.achievements import ACHIEVEMENTS, STAT_CTX_ALIASES
+from helpers.achievement_context import TracingContext
+from helpers.evaluation_queue import EvaluationQueue
+from helpers.guild_index import guild_index
 import discord
 import asyncio
-from constants import ACHIEVEMENT_UNLOCKS_CHANNEL_ID, USER_ID, MEMBER
+from typing import Iterable, Optional
+from constants import ACHIEVEMENT_UNLOCKS_CHANNEL_ID, USER_ID, MEMBER, HIDDEN_ACHIEVEMENTS_COUNT, ACH_ANNOUNCE_WINDOW_SECONDS
 
 
 class AchievementEngine:
@@ -11,24 +15,200 @@ class AchievementEngine:
         self.save = save_fn
         self.channel_id = ACHIEVEMENT_UNLOCKS_CHANNEL_ID
 
-    async def _grant_role_if_needed(self, member: discord.Member, role_name: str | None):
-        if not role_name:
+        # ctx key -> achievements whose check reads it. Entries with "deps" are
+        # indexed up front, the rest are traced every time their check runs and
+        # the keys they read get added, so branches a check only sometimes takes
+        # still end up indexed. Untraced checks run on every evaluation.
+        self._order = {key: i for i, key in enumerate(ACHIEVEMENTS)}
+        self._dependents: dict[str, set[str]] = {}
+        self._explicit: set[str] = set()
+        self._untraced: set[str] = set()
+
+        for key, ach in ACHIEVEMENTS.items():
+            deps = ach.get("deps")
+            if deps is None:
+                self._untraced.add(key)
+            else:
+                self._explicit.add(key)
+                self._index(key, deps)
+
+        # users get one full evaluation per process before going incremental
+        self._evaluated: set[str] = set()
+        # ctx keys that changed as a side effect of an evaluation (hidden count)
+        self._stale: dict[str, set[str]] = {}
+        self.checks_run = 0
+
+        # achievement key -> how many users have earned it, kept in step with
+        # every grant/revoke so rarity lookups don't have to scan the file
+        self.earned_counts: dict[str, int] = {}
+        self.rebuild_counts()
+
+        # background evaluation, the Challenges cog sets queue.ctx_builder
+        self.queue = EvaluationQueue(self)
+
+        # member id -> (member, unlocked achievements) waiting to be announced
+        self.announce_window = ACH_ANNOUNCE_WINDOW_SECONDS
+        self._announcements: dict[int, tuple[discord.Member, list[dict]]] = {}
+        self._announce_tasks: set[asyncio.Task] = set()
+
+    def enqueue(self, member: discord.Member, changed: Optional[Iterable[str]] = None) -> None:
+        self.queue.enqueue(member, changed)
+
+    def _index(self, ach_key: str, ctx_keys: Iterable[str]):
+        for ctx_key in ctx_keys:
+            self._dependents.setdefault(ctx_key, set()).add(ach_key)
+
+    def rebuild_counts(self) -> None:
+        counts: dict[str, int] = {}
+        for raw in self.load().values():
+            for key in self._normalize_user_earned(raw):
+                counts[key] = counts.get(key, 0) + 1
+        self.earned_counts = counts
+
+    def _count(self, key: str, amount: int) -> None:
+        n = self.earned_counts.get(key, 0) + amount
+        if n > 0:
+            self.earned_counts[key] = n
+        else:
+            self.earned_counts.pop(key, None)
+
+    def percentage(self, achievement_key: str, guild: discord.Guild) -> float:
+        total_users = guild.member_count
+        if not total_users:
+            return 0.0
+
+        return round((self.earned_counts.get(achievement_key, 0) / total_users) * 100.0, 1)
+
+    def forget_user(self, user_id) -> None:
+        # next evaluation for this user checks everything again
+        self._evaluated.discard(str(user_id))
+        self._stale.pop(str(user_id), None)
+
+    def dependents(self, ctx_key: str) -> set[str]:
+        return set(self._dependents.get(ctx_key, ()))
+
+    def affected(self, changed: Iterable[str]) -> list[str]:
+        keys = set()
+        for ctx_key in changed:
+            keys.update(self._dependents.get(ctx_key, ()))
+            for alias in STAT_CTX_ALIASES.get(ctx_key, ()):
+                keys.update(self._dependents.get(alias, ()))
+
+        keys |= self._untraced
+        return sorted(keys, key=self._order.__getitem__)
+
+    def _check(self, key: str, ach: dict, ctx) -> bool:
+        self.checks_run += 1
+        if key in self._explicit:
+            return ach["check"](ctx)
+
+        traced = TracingContext(ctx)
+        try:
+            return ach["check"](traced)
+        finally:
+            self._index(key, traced.keys_read)
+            self._untraced.discard(key)
+
+    async def _grant_roles(self, member: discord.Member, role_names: list[str | None]):
+        # one add_roles call for everything unlocked in this evaluation
+        roles = []
+        for role_name in role_names:
+            if not role_name:
+                continue
+            role = guild_index.role(member.guild, role_name)
+            if role and role not in member.roles and role not in roles:
+                roles.append(role)
+
+        if not roles:
+            return
+        try:
+            await member.add_roles(*roles, reason="Achievement Unlocked")
+            return
+        except discord.HTTPException as e:
+            if len(roles) == 1:
+                print(f"[WARN] couldn't give {member} the {roles[0].name} role: {e}")
+                return
+            print(f"[WARN] couldn't give {member} {len(roles)} roles at once ({e}), trying them one by one")
+
+        # one role the bot can't assign (above its top role, deleted meanwhile) shouldn't block the rest
+        for role in roles:
+            try:
+                await member.add_roles(role, reason="Achievement Unlocked")
+            except discord.HTTPException as e:
+                print(f"[WARN] couldn't give {member} the {role.name} role: {e}")
+
+    def _format_unlocks(self, member: discord.Member, unlocked: list[dict]) -> list[str]:
+        if len(unlocked) == 1:
+            ach = unlocked[0]
+            return [
+                (f"## ❓ Hidden Achievement Unlocked!\n" if ach.get("hidden", False) else "") +
+                f"🏅 **{member.mention} unlocked:** {ach['name']}\n" +
+                f"{ach['description']}"
+            ]
+
+        hidden = sum(1 for ach in unlocked if ach.get("hidden", False))
+        header = (
+            (f"## ❓ {hidden} Hidden Achievement{'s' if hidden > 1 else ''} Unlocked!\n" if hidden else "") +
+            f"🏅 **{member.mention} unlocked {len(unlocked)} achievements:**"
+        )
+
+        # stay under discord's 2000 character limit
+        messages = [header]
+        for ach in unlocked:
+            line = f"\n{'❓ ' if ach.get('hidden', False) else '• '}**{ach['name']}** - {ach['description']}"
+            if len(messages[-1]) + len(line) > 1900:
+                messages.append(line.lstrip("\n"))
+            else:
+                messages[-1] += line
+        return messages
+
+    async def _announce(self, member: discord.Member, unlocked: list[dict]):
+        channel = member.guild.get_channel(self.channel_id)
+        if not channel:
+            return
+
+        for content in self._format_unlocks(member, unlocked):
+            await channel.send(content)
+
+    def _queue_announcement(self, member: discord.Member, unlocked: list[dict]):
+        # everything a member unlocks within the window goes out as one message
+        entry = self._announcements.get(member.id)
+        if entry is not None:
+            entry[1].extend(unlocked)
             return
 
-        role = discord.utils.get(member.guild.roles, name=role_name)
+        self._announcements[member.id] = (member, list(unlocked))
+        task = asyncio.get_running_loop().create_task(self._announce_later(member.id))
+        self._announce_tasks.add(task)
+        task.add_done_callback(self._announce_tasks.discard)
 
-        if not role or role in member.roles:
+    async def _announce_later(self, member_id: int):
+        await asyncio.sleep(self.announce_window)
+        member, unlocked = self._announcements.pop(member_id, (None, []))
+        if member is None:
             return
         try:
-            await member.add_roles(role, reason="Achievement Unlocked")
-        except:
-            pass
+            await self._announce(member, unlocked)
+        except Exception as e:
+            print(f"[WARN] achievement announcement failed: {e}")
+
+    async def flush_announcements(self):
+        for task in list(self._announce_tasks):
+            task.cancel()
+
+        pending = list(self._announcements.values())
+        self._announcements.clear()
+        for member, unlocked in pending:
+            try:
+                await self._announce(member, unlocked)
+            except Exception as e:
+                print(f"[WARN] achievement announcement failed: {e}")
 
     async def _revoke_role_if_needed(self, member: discord.Member, role_name: str | None):
         if not role_name:
             return
 
-        role = discord.utils.get(member.guild.roles, name=role_name)
+        role = guild_index.role(member.guild, role_name)
         if not role or role not in member.roles:
             return
 
@@ -57,21 +237,31 @@ class AchievementEngine:
         return int(time.time())
 
 
-    async def evaluate(self, ctx):
+    async def evaluate(self, ctx, changed: Optional[Iterable[str]] = None):
+        # changed is the set of ctx keys (or stats fields) the caller touched,
+        # only achievements depending on them are checked. None checks everything.
         data = self.load()
         user_id = str(ctx[USER_ID])
         member: discord.Member = ctx[MEMBER]
 
+        stale = self._stale.pop(user_id, set())
+        if changed is None or user_id not in self._evaluated:
+            candidates = list(ACHIEVEMENTS)
+        else:
+            candidates = self.affected(set(changed) | stale)
+        self._evaluated.add(user_id)
+
         earned_map = self._normalize_user_earned(data.get(user_id))
         earned_keys = set(earned_map.keys())
         newly_unlocked: list[tuple[str, dict]] = []
 
-        for key, ach in ACHIEVEMENTS.items():
+        for key in candidates:
             if key in earned_keys:
                 continue
 
+            ach = ACHIEVEMENTS[key]
             try:
-                ok = ach["check"](ctx)
+                ok = self._check(key, ach, ctx)
             except Exception:
                 continue
 
@@ -86,22 +276,16 @@ class AchievementEngine:
         for key, _ach in newly_unlocked:
             if earned_map.get(key, 0) == 0:
                 earned_map[key] = now
+            self._count(key, 1)
 
         data[user_id] = dict(sorted(earned_map.items(), key=lambda kv: kv[0]))
         self.save(data)
 
-        for key, ach in newly_unlocked:
-            await self._grant_role_if_needed(member, ach.get("role"))
+        if any(ach.get("hidden", False) for _key, ach in newly_unlocked):
+            self._stale.setdefault(user_id, set()).add(HIDDEN_ACHIEVEMENTS_COUNT)
 
-            is_hidden = ach.get("hidden", False)
-
-            channel = member.guild.get_channel(self.channel_id)
-            if channel:
-                await channel.send(
-                    (f"## ❓ Hidden Achievement Unlocked!\n" if is_hidden else "") +
-                    f"🏅 **{member.mention} unlocked:** {ach['name']}\n" +
-                    f"{ach['description']}"
-                )
+        await self._grant_roles(member, [ach.get("role") for _key, ach in newly_unlocked])
+        self._queue_announcement(member, [ach for _key, ach in newly_unlocked])
 
 
 
@@ -120,6 +304,7 @@ class AchievementEngine:
 
         if achievement_key in earned_map:
             earned_map.pop(achievement_key, None)
+            self._count(achievement_key, -1)
             changed = True
 
             if earned_map:
@@ -129,11 +314,28 @@ class AchievementEngine:
 
             self.save(data)
 
+        # the achievement can be earned again, so don't skip it next time
+        self.forget_user(user_id)
+
         await self._revoke_role_if_needed(member, role_name)
 
         return changed or (role_name is not None)
 
     
+    def reset_user(self, user_id) -> list[str]:
+        # drops every achievement the user has, returns the keys that were removed
+        data = self.load()
+        user_id = str(user_id)
+
+        earned_keys = list(self._normalize_user_earned(data.pop(user_id, None)))
+        if earned_keys:
+            for key in earned_keys:
+                self._count(key, -1)
+            self.save(data)
+
+        self.forget_user(user_id)
+        return earned_keys
+
     async def revoke_for_members(self, members: list[discord.Member], achievement_key: str, *, sleep_every: int = 10, sleep_seconds = 0.6) -> tuple[int, int]:
         revoked = 0
         attempted = 0
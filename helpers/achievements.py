@@ -2,6 +2,7 @@ from constants import *
 import json
 from pathlib import Path
 import discord
+from helpers.persistence import read_json_async
 
 ACH_FILE = Path(ACHEIVEMENTS_PATH)
 
@@ -14,8 +15,12 @@ def rarity_style(percent: float) -> tuple[str, str]:
         return "⭐", "&e"
     return "✅", "&a"
 
-async def achievement_percentage(achievement_key: str, guild: discord.Guild) -> float:
-        data = json.loads(ACH_FILE.read_text())
+async def achievement_percentage(achievement_key: str, guild: discord.Guild, engine=None) -> float:
+        # the engine keeps earned counts in memory, only scan the file without one
+        if engine is not None:
+            return engine.percentage(achievement_key, guild)
+
+        data = await read_json_async(ACH_FILE, {})
 
         if not data:
             return 0.0
@@ -28,13 +33,9 @@ async def achievement_percentage(achievement_key: str, guild: discord.Guild) ->
 
         return round((earned_count / total_users) * 100.0, 1)
 
-async def get_user_achievements(user_id: int, guild) -> list[str]:
-    if not ACH_FILE.exists():
-        return []
-
-    try:
-        data = json.loads(ACH_FILE.read_text(encoding="utf-8"))
-    except Exception:
+async def get_user_achievements(user_id: int, guild, engine=None) -> list[str]:
+    data = await read_json_async(ACH_FILE)
+    if not isinstance(data, dict):
         return []
 
     raw = data.get(str(user_id), {})
@@ -48,7 +49,7 @@ async def get_user_achievements(user_id: int, guild) -> list[str]:
 
     achievements: list[str] = []
     for ach_key in keys:
-        percent = await achievement_percentage(ach_key, guild)
+        percent = await achievement_percentage(ach_key, guild, engine)
         emoji, _ = rarity_style(percent)
         achievements.append(f"{emoji} {ach_key}")
 
@@ -737,6 +738,7 @@ ACHIEVEMENTS = {
         "check": lambda ctx: (ctx.get(MAKE_TEN_TOTAL_SOLVED, 0) >= 1)
                   and (ctx.get(MAKE_TEN_FASTEST_SOLVE_SECONDS) is not None)
                   and (ctx[MAKE_TEN_FASTEST_SOLVE_SECONDS] <= 90),
+        "deps": (MAKE_TEN_TOTAL_SOLVED, MAKE_TEN_FASTEST_SOLVE_SECONDS),
         "progress": lambda ctx: 1 if ((ctx.get(MAKE_TEN_FASTEST_SOLVE_SECONDS) is not None) and (ctx[MAKE_TEN_FASTEST_SOLVE_SECONDS] <= 90)) else 0,
         "max": 1
     },
@@ -1007,4 +1009,16 @@ ACHIEVEMENTS = {
         "max": 999999,
         "hidden": True
     }
-}
\ No newline at end of file
+}
+
+
+# stats fields that build_ctx exposes under a different ctx key, so callers can
+# pass the stats fields they touched as the changed set
+STAT_CTX_ALIASES = {
+    REACTED_USERS: (UNIQUE_USERS_REACTED_TO,),
+    SALVAGE_UNIQUE_VARIANTS: (SALVAGE_UNIQUE_VARIANTS_COUNT, SALVAGE_ALL_VARIANTS, SALVAGE_ALT_VARIANT),
+    SALVAGE_UNIQUE_RARITIES: (SALVAGE_UNIQUE_RARITIES_COUNT, SALVAGE_ALL_RARITIES),
+    LAST_PROFILE_AT: (CURIOUS_WINDOW_OK,),
+    LAST_COMPARE_AT: (CURIOUS_WINDOW_OK,),
+    LAST_SERVERSTATS_AT: (CURIOUS_WINDOW_OK,),
+}
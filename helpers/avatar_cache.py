@@ -0,0 +1,199 @@
+from __future__ import annotations
+import asyncio
+import os
+import re
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+import aiohttp
+import discord
+from PIL import Image
+from constants import AVATAR_SIZE, AVATAR_CACHE_DIR, AVATAR_CACHE_MB, AVATAR_FETCH_TIMEOUT_SECONDS
+
+
+def _filename(key: str, size: int) -> str:
+    # avatar hashes are hex (a_ for animated), default avatars are just a digit
+    return f"{re.sub(r'[^A-Za-z0-9_-]', '_', key)}_{size}.png"
+
+
+def resize_avatar(data: bytes, size: int = AVATAR_SIZE) -> bytes:
+    # the same resize the bingo renderer does, so cached avatars render identically
+    img = Image.open(BytesIO(data)).resize((size, size))
+    out = BytesIO()
+    try:
+        img.save(out, format="PNG")
+    except OSError:
+        out = BytesIO()
+        img.convert("RGBA").save(out, format="PNG")
+    return out.getvalue()
+
+
+class AvatarCache:
+    # Avatars resized to `size`, kept on disk as PNGs named by the avatar hash. A new
+    # avatar means a new hash, so files never go stale, they just stop being used;
+    # the directory is kept under max_bytes by deleting the least recently used.
+    # Fetches go through one shared aiohttp session, get() takes any URL.
+
+    def __init__(
+        self,
+        root: str | Path = AVATAR_CACHE_DIR,
+        max_bytes: int = AVATAR_CACHE_MB * 1024 * 1024,
+        size: int = AVATAR_SIZE,
+        timeout: float = AVATAR_FETCH_TIMEOUT_SECONDS,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.size = size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        self._session = session
+        self._owns_session = session is None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # filename -> [bytes on disk, last used], read from the directory on first use
+        self._index: Optional[Dict[str, list]] = None
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _load_index(self) -> Dict[str, list]:
+        if self._index is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            index = {}
+            for p in self.root.glob("*.png"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                index[p.name] = [st.st_size, st.st_mtime]
+            self._index = index
+            self.bytes = sum(v[0] for v in index.values())
+        return self._index
+
+    def _read(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._read_locked(name)
+
+    def _read_locked(self, name: str) -> Optional[bytes]:
+        index = self._load_index()
+        if name not in index:
+            return None
+        path = self.root / name
+        try:
+            data = path.read_bytes()
+        except OSError:
+            # deleted behind our back
+            self.bytes -= index.pop(name)[0]
+            return None
+
+        now = time.time()
+        index[name][1] = now
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return data
+
+    def _write(self, name: str, data: bytes) -> None:
+        with self._lock:
+            self._write_locked(name, data)
+
+    def _write_locked(self, name: str, data: bytes) -> None:
+        index = self._load_index()
+        if len(data) > self.max_bytes:
+            return
+
+        path = self.root / name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        old = index.get(name)
+        if old is not None:
+            self.bytes -= old[0]
+        index[name] = [len(data), time.time()]
+        self.bytes += len(data)
+
+        if self.bytes > self.max_bytes:
+            for victim, (n, _used) in sorted(index.items(), key=lambda kv: kv[1][1]):
+                if self.bytes <= self.max_bytes:
+                    break
+                if victim == name:
+                    continue
+                try:
+                    (self.root / victim).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                del index[victim]
+                self.bytes -= n
+
+    def _store(self, name: str, raw: bytes) -> bytes:
+        data = resize_avatar(raw, self.size)
+        self._write(name, data)
+        return data
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+            self._owns_session = True
+        return self._session
+
+    async def _fetch(self, name: str, url: str) -> Optional[bytes]:
+        cached = await asyncio.to_thread(self._read, name)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        try:
+            async with self.session().get(url, timeout=self.timeout) as r:
+                r.raise_for_status()
+                raw = await r.read()
+            return await asyncio.to_thread(self._store, name, raw)
+        except Exception as e:
+            # a card without an avatar beats no card
+            self.errors += 1
+            print(f"[WARN] avatar fetch failed for {url}: {e}")
+            return None
+
+    async def get(self, key: str, url: str) -> Optional[bytes]:
+        # PNG bytes of the avatar with this hash at self.size, fetched from url on a miss
+        name = _filename(key, self.size)
+
+        fut = self._inflight.get(name)
+        if fut is not None:
+            return await asyncio.shield(fut)
+
+        fut = asyncio.ensure_future(self._fetch(name, url))
+        self._inflight[name] = fut
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            if fut.done():
+                self._inflight.pop(name, None)
+            else:
+                fut.add_done_callback(lambda _f: self._inflight.pop(name, None))
+
+    async def for_member(self, member: discord.abc.User) -> Optional[bytes]:
+        asset = member.display_avatar.with_size(self.size)
+        return await self.get(asset.key, asset.url)
+
+    def stats(self) -> dict:
+        files = len(self._index) if self._index is not None else None
+        return {"files": files, "bytes": self.bytes, "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+avatar_cache = AvatarCache()
+
@@ -0,0 +1,68 @@
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from constants import BINGO_CARDS_PATH
+from helpers import bingo_render
+
+
+def _time_render(card_number: str, grid, completed, runs: int, cold: bool) -> list[float]:
+    times = []
+    for _ in range(runs):
+        if cold:
+            # what a fresh render worker pays on its first card
+            bingo_render.load_font.cache_clear()
+            bingo_render.layout_text.cache_clear()
+            bingo_render.invalidate_card()
+
+        start = time.perf_counter()
+        bingo_render.render_bingo_card(card_number, grid, completed)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _fmt(times: list[float]) -> str:
+    return f"median {statistics.median(times) * 1000:.1f} ms, min {min(times) * 1000:.1f} ms, max {max(times) * 1000:.1f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time bingo card renders with cold and warm font/layout/layer caches")
+    parser.add_argument("--cards", default=BINGO_CARDS_PATH)
+    parser.add_argument("--card", default=None, help="card number, defaults to the first one")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    try:
+        cards = json.loads(Path(args.cards).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        cards = {}
+
+    if not cards:
+        print(f"no bingo cards in {args.cards}")
+        return 1
+
+    key = args.card or next(iter(cards))
+    if key not in cards:
+        print(f"card {key} doesn't exist")
+        return 1
+
+    grid = cards[key]["grid"]
+    completed = ["A1", "B2", "C3"]
+
+    cold = _time_render(key, grid, completed, args.runs, cold=True)
+    warm = _time_render(key, grid, completed, args.runs, cold=False)
+
+    print(f"card #{key}, {args.runs} runs each")
+    print(f"  cold caches: {_fmt(cold)}")
+    print(f"  warm caches: {_fmt(warm)}")
+    print(f"  speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")
+    print(f"  fonts: {bingo_render.load_font.cache_info()}")
+    print(f"  layouts: {bingo_render.layout_text.cache_info()}")
+    print(f"  card layers: {bingo_render.layer_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,17 @@
 from  PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
-from constants import IMAGE_OUTPUT_DIR
+from dataclasses import dataclass
+from functools import lru_cache
+from collections import OrderedDict
+import threading
+import hashlib
+import json
+from typing import Optional
 import discord
 from io import BytesIO
-import requests
-
-IMAGE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+from constants import BINGO_LAYER_CACHE_CARDS, BINGO_PNG_CACHE_MB, AVATAR_SIZE
+from helpers.avatar_cache import avatar_cache
+from helpers.render_service import render_service
 
 BG_COLOUR = (0, 0, 0, 0)
 GRID_COLOUR = (64, 68, 75, 220)
@@ -18,6 +24,21 @@ COMPLETE_COLOUR = (100, 190,120 )
 BASE_DIR = Path(__file__).resolve().parent.parent
 FONT_PATH = BASE_DIR / "assets" / "fonts" / "Inter-Regular.ttf"
 
+# Fonts and tile layouts are cached for the life of the process (each render
+# worker keeps its own), so only the first card pays for the font size search.
+
+@lru_cache(maxsize=None)
+def load_font(size: int):
+    try:
+        return ImageFont.truetype(FONT_PATH, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+# textbbox only depends on the font and text, so any canvas works for measuring
+_MEASURE = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+
 def wrap_text(draw, text, font, max_width):
     words = text.split()
     lines = []
@@ -39,13 +60,12 @@ def wrap_text(draw, text, font, max_width):
     return lines
 
 
-def fit_text_to_tile(draw, text, max_width, max_height, max_font=48, min_font=12):
+@lru_cache(maxsize=4096)
+def layout_text(text: str, max_width: int, max_height: int, max_font: int = 48, min_font: int = 12) -> tuple[int, tuple[str, ...]]:
+    # biggest font size whose wrapped lines fit the box, and those lines
     for size in range(max_font, min_font - 1, -1):
-        try:
-            font = ImageFont.truetype(FONT_PATH, size)
-        except OSError:
-            font = ImageFont.load_default()
-        lines = wrap_text(draw, text, font, max_width)
+        font = load_font(size)
+        lines = wrap_text(_MEASURE, text, font, max_width)
 
         line_height = font.size + 4
         total_height = len(lines) * line_height
@@ -55,68 +75,209 @@ def fit_text_to_tile(draw, text, max_width, max_height, max_font=48, min_font=12
 
         fits = True
         for line in lines:
-            w = draw.textbbox((0,0), line, font=font)[2]
+            w = _MEASURE.textbbox((0,0), line, font=font)[2]
             if w > max_width:
                 fits = False
                 break
 
         if fits:
-            return font, lines
+            return size, tuple(lines)
 
-    try:
-        font = ImageFont.truetype(FONT_PATH, min_font)
-    except OSError:
-        font = ImageFont.load_default()
-    return font, wrap_text(draw, text, font, max_width)
+    return min_font, tuple(wrap_text(_MEASURE, text, load_font(min_font), max_width))
 
-def render_bingo_card(card_number: str, grid: list[list[str]], completed_tiles: list[str], member: discord.Member | None) -> Path:
-    rows = cols = 5
 
-    TILE_SIZE = 200
-    GRID_SIZE = TILE_SIZE * cols
-    TILE_PADDING = 30
+def fit_text_to_tile(draw, text, max_width, max_height, max_font=48, min_font=12):
+    size, lines = layout_text(text, max_width, max_height, max_font, min_font)
+    return load_font(size), list(lines)
 
-    SIDE_PADDING = 60
-    TOP_PADDING = 40
-    BOTTOM_PADDING = 40
+@dataclass(frozen=True)
+class BingoCardSpec:
+    # everything a render needs, no discord objects so it can go to a render worker
+    card_number: str
+    grid: tuple[tuple[str, ...], ...]
+    completed: frozenset[str]
+    avatar: Optional[bytes] = None
+    name: Optional[str] = None
+    name_colour: Optional[tuple[int, int, int]] = None
 
-    LABEL_SPACE = 50
-    LABEL_GAP = 15
+    def render(self) -> bytes:
+        return render_bingo_card(self.card_number, self.grid, self.completed, self.avatar, self.name, self.name_colour)
 
-    TITLE_HEIGHT = 120
-    AVATAR_SIZE = 128
-    AVATAR_GAP = 6
-    NAME_HEIGHT = 48
-    NAME_GAP = 10
 
-    HEADER_HEIGHT = max(TITLE_HEIGHT, AVATAR_SIZE + AVATAR_GAP + NAME_HEIGHT + NAME_GAP)
+async def bingo_card_spec(card_number: str, grid, completed_tiles, member: discord.Member | None) -> BingoCardSpec:
+    avatar = name = name_colour = None
+    if member:
+        avatar = await avatar_cache.for_member(member)
+        name = member.display_name
 
-    try:
-        label_font = ImageFont.truetype(FONT_PATH, LABEL_SPACE)
-        title_font = ImageFont.truetype(FONT_PATH, TITLE_HEIGHT // 2)
-        name_font = ImageFont.truetype(FONT_PATH, NAME_HEIGHT)
-    except OSError:
-        label_font = ImageFont.load_default()
-        title_font = ImageFont.load_default()
-        name_font = ImageFont.load_default()
+        colour = member.color
+        name_colour = TEXT_COLOUR if colour.value == 0 else (colour.r, colour.g, colour.b)
 
-    img_w = SIDE_PADDING * 2 + 2 * LABEL_SPACE + 2 * LABEL_GAP + GRID_SIZE
-    img_h = TOP_PADDING + HEADER_HEIGHT + 2 * LABEL_SPACE + 2 * LABEL_GAP + GRID_SIZE + BOTTOM_PADDING
+    return BingoCardSpec(
+        card_number=str(card_number),
+        grid=tuple(tuple(row) for row in grid),
+        completed=frozenset(completed_tiles),
+        avatar=avatar,
+        name=name,
+        name_colour=name_colour,
+    )
 
-    img = Image.new("RGBA", (img_w, img_h), BG_COLOUR)
-    draw = ImageDraw.Draw(img)
+
+# card layout
+ROWS = COLS = 5
+
+TILE_SIZE = 200
+GRID_SIZE = TILE_SIZE * COLS
+TILE_PADDING = 30
+
+SIDE_PADDING = 60
+TOP_PADDING = 40
+BOTTOM_PADDING = 40
+
+LABEL_SPACE = 50
+LABEL_GAP = 15
+
+TITLE_HEIGHT = 120
+AVATAR_GAP = 6
+NAME_HEIGHT = 48
+NAME_GAP = 10
+
+HEADER_HEIGHT = max(TITLE_HEIGHT, AVATAR_SIZE + AVATAR_GAP + NAME_HEIGHT + NAME_GAP)
+
+IMG_W = SIDE_PADDING * 2 + 2 * LABEL_SPACE + 2 * LABEL_GAP + GRID_SIZE
+IMG_H = TOP_PADDING + HEADER_HEIGHT + 2 * LABEL_SPACE + 2 * LABEL_GAP + GRID_SIZE + BOTTOM_PADDING
+
+GRID_X = SIDE_PADDING + LABEL_SPACE + LABEL_GAP
+GRID_Y = TOP_PADDING + HEADER_HEIGHT + LABEL_SPACE + LABEL_GAP
 
 
-    # Title
+def tile_id(row: int, col: int) -> str:
+    return f"{chr(ord('A') + col)}{row + 1}"
+
+
+def render_tile(text: str, fill) -> Image.Image:
+    # one tile with its border, TILE_SIZE + 1 square since the outline is drawn on both edges
+    tile = Image.new("RGBA", (TILE_SIZE + 1, TILE_SIZE + 1), BG_COLOUR)
+    draw = ImageDraw.Draw(tile)
+    draw.rectangle([0, 0, TILE_SIZE, TILE_SIZE], fill=fill, outline=BORDER_COLOUR)
+
+    max_text_w = max_text_h = TILE_SIZE - 2 * TILE_PADDING
+    tile_font, lines = fit_text_to_tile(draw, text, max_text_w, max_text_h)
+
+    line_height = tile_font.size + 4
+    total_h = len(lines) * line_height
+    start_y = (TILE_SIZE - total_h) // 2
+
+    for i, line in enumerate(lines):
+        draw.text(
+            (TILE_SIZE // 2, start_y + i * line_height),
+            line,
+            fill="black",
+            font=tile_font,
+            anchor="ma"
+        )
+    return tile
+
+
+def tile_origin(row: int, col: int) -> tuple[int, int]:
+    return GRID_X + col * TILE_SIZE, GRID_Y + row * TILE_SIZE
+
+
+def render_base(card_number: str, grid) -> Image.Image:
+    # everything that only depends on the card: title, labels and every tile as not completed
+    img = Image.new("RGBA", (IMG_W, IMG_H), BG_COLOUR)
+    draw = ImageDraw.Draw(img)
+
     title = f"Bingo Card #{card_number}"
-    titlex = (img_w) // 2
-    draw.text((titlex, TOP_PADDING + HEADER_HEIGHT // 2), title, fill=TEXT_COLOUR, font=title_font, anchor="mm")
+    draw.text((IMG_W // 2, TOP_PADDING + HEADER_HEIGHT // 2), title, fill=TEXT_COLOUR, font=load_font(TITLE_HEIGHT // 2), anchor="mm")
 
+    label_font = load_font(LABEL_SPACE)
+    for col in range(COLS):
+        label = chr(ord("A") + col)
+        x = GRID_X + col * TILE_SIZE + TILE_SIZE // 2
+        draw.text((x, GRID_Y - LABEL_SPACE // 2 - LABEL_GAP), label, fill=LABEL_COLOUR, font=label_font, anchor="mm")
 
-    # Avatar
-    if member:
-        avatar_url = member.display_avatar.url
-        avatar_img = Image.open(BytesIO(requests.get(avatar_url).content)).resize((AVATAR_SIZE, AVATAR_SIZE))
+    for row in range(ROWS):
+        label = str(row + 1)
+        y = GRID_Y + row * TILE_SIZE + TILE_SIZE // 2
+        draw.text((GRID_X - LABEL_SPACE // 2 - LABEL_GAP, y), label, fill=LABEL_COLOUR, font=label_font, anchor="mm")
+
+    for row in range(ROWS):
+        for col in range(COLS):
+            text = grid[row][col]
+            fill = FREE_COLOUR if text.upper() == "FREE" else GRID_COLOUR
+            # neighbouring tiles share a border line, it's the same colour either way
+            img.paste(render_tile(text, fill), tile_origin(row, col))
+
+    return img
+
+
+class CardLayers:
+    # the static base of one card plus its completed tiles, built on first use
+
+    def __init__(self, card_number: str, grid):
+        self.card_number = card_number
+        self.grid = grid
+        self.base = render_base(card_number, grid)
+        self._completed: dict[str, Image.Image] = {}
+
+    def completed_tile(self, row: int, col: int) -> Image.Image:
+        key = tile_id(row, col)
+        tile = self._completed.get(key)
+        if tile is None:
+            tile = render_tile(self.grid[row][col], COMPLETE_COLOUR)
+            self._completed[key] = tile
+        return tile
+
+
+# Layers live in whichever process renders (each render worker has its own) and are
+# keyed by the grid itself, so an edited card is a miss even where invalidate_card
+# never ran. invalidate_card just frees the old layers early.
+_layers: OrderedDict[tuple, CardLayers] = OrderedDict()
+_layers_lock = threading.Lock()
+layer_stats = {"hits": 0, "misses": 0}
+
+
+def card_layers(card_number: str, grid) -> CardLayers:
+    key = (str(card_number), tuple(tuple(row) for row in grid))
+    with _layers_lock:
+        layers = _layers.get(key)
+        if layers is not None:
+            _layers.move_to_end(key)
+            layer_stats["hits"] += 1
+            return layers
+        layer_stats["misses"] += 1
+
+    layers = CardLayers(key[0], key[1])
+    with _layers_lock:
+        _layers[key] = layers
+        while len(_layers) > BINGO_LAYER_CACHE_CARDS:
+            _layers.popitem(last=False)
+    return layers
+
+
+def invalidate_card(card_number=None) -> None:
+    # drop the cached layers and finished PNGs of one card, or all of them
+    with _layers_lock:
+        for key in list(_layers):
+            if card_number is None or key[0] == str(card_number):
+                del _layers[key]
+    bingo_png_cache.discard(card_number)
+
+
+def render_bingo_card(card_number: str, grid, completed_tiles, avatar: bytes | None = None, name: str | None = None, name_colour=None) -> bytes:
+    layers = card_layers(card_number, grid)
+    img = layers.base.copy()
+
+    # completed tiles over the base, FREE tiles always look the same
+    for row in range(ROWS):
+        for col in range(COLS):
+            if tile_id(row, col) in completed_tiles and layers.grid[row][col].upper() != "FREE":
+                img.paste(layers.completed_tile(row, col), tile_origin(row, col))
+
+    # header, the only part that depends on who's viewing
+    if avatar:
+        avatar_img = Image.open(BytesIO(avatar)).resize((AVATAR_SIZE, AVATAR_SIZE))
 
         img.paste(
             avatar_img,
@@ -124,77 +285,97 @@ def render_bingo_card(card_number: str, grid: list[list[str]], completed_tiles:
             avatar_img if avatar_img.mode == "RGBA" else None
         )
 
-        colour = member.color
-        if colour.value == 0:
-            name_colour = TEXT_COLOUR
-        else:
-            name_colour = (colour.r, colour.g, colour.b)
-
+    if name:
         name_y = TOP_PADDING + AVATAR_SIZE + AVATAR_GAP + NAME_HEIGHT // 2
 
-        draw.text(
+        ImageDraw.Draw(img).text(
             (SIDE_PADDING, name_y),
-            member.display_name,
-            fill=name_colour,
-            font=name_font,
+            name,
+            fill=name_colour or TEXT_COLOUR,
+            font=load_font(NAME_HEIGHT),
             anchor="lm"
         )
 
-    # grid
-    grid_x = SIDE_PADDING + LABEL_SPACE + LABEL_GAP
-    grid_y = TOP_PADDING + HEADER_HEIGHT + LABEL_SPACE + LABEL_GAP
-
-    for col in range(cols):
-        label = chr(ord("A") + col)
-        x = grid_x + col * TILE_SIZE + TILE_SIZE // 2
-        draw.text((x, grid_y - LABEL_SPACE // 2 - LABEL_GAP), label, fill=LABEL_COLOUR, font=label_font, anchor="mm")
-
-    for row in range(rows):
-        label = str(row + 1)
-        y = grid_y + row * TILE_SIZE + TILE_SIZE // 2
-        draw.text((grid_x - LABEL_SPACE // 2 - LABEL_GAP, y), label, fill=LABEL_COLOUR, font=label_font, anchor="mm")
-
-    for row in range(rows):
-        for col in range(cols):
-            x1 = grid_x + col * TILE_SIZE
-            y1 = grid_y + row * TILE_SIZE
-            x2 = x1 + TILE_SIZE
-            y2 = y1 + TILE_SIZE
-
-            tile_id = f"{chr(ord('A') + col)}{row + 1}"
-
-            if grid[row][col].upper() == "FREE":
-                fill = FREE_COLOUR
-            elif tile_id in completed_tiles:
-                fill = COMPLETE_COLOUR
-            else:
-                fill = GRID_COLOUR
-
-            draw.rectangle([x1, y1, x2, y2], fill=fill, outline=BORDER_COLOUR)
-
-
-            max_text_w = max_text_h = TILE_SIZE - 2 * TILE_PADDING
-
-            tile_font, lines = fit_text_to_tile(
-                draw,
-                grid[row][col],
-                max_text_w,
-                max_text_h
-            )
-
-            line_height = tile_font.size + 4
-            total_h = len(lines) * line_height
-            start_y = y1 + (TILE_SIZE - total_h) // 2
-
-            for i, line in enumerate(lines):
-                draw.text(
-                    (x1 + TILE_SIZE // 2, start_y + i * line_height),
-                    line,
-                    fill="black",
-                    font=tile_font,
-                    anchor="ma"
-                )
-
-    out = IMAGE_OUTPUT_DIR / f"bingo_{card_number}.png"
-    img.save(out)
-    return out
\ No newline at end of file
+    out = BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def card_hash(grid) -> str:
+    return hashlib.sha1(json.dumps(grid, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class BingoPngCache:
+    # Finished card PNGs in the bot process, keyed by everything that shows up on the
+    # card, so a repeat view with no new progress never reaches a render worker.
+    # Bounded by total PNG bytes, least recently viewed goes first.
+
+    def __init__(self, max_bytes: int = BINGO_PNG_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: tuple, data: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old)
+        if len(data) > self.max_bytes:
+            return
+
+        self._entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _k, v = self._entries.popitem(last=False)
+            self.bytes -= len(v)
+
+    def discard(self, card_number=None) -> None:
+        for key in list(self._entries):
+            if card_number is None or key[0] == str(card_number):
+                self.bytes -= len(self._entries.pop(key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+bingo_png_cache = BingoPngCache()
+
+
+def render_key(card_number: str, grid, completed_tiles, member: discord.Member | None) -> tuple:
+    avatar_key = name = name_colour = None
+    if member:
+        # the avatar hash changes with the avatar, no need to fetch it to key on it
+        avatar_key = member.display_avatar.key
+        name = member.display_name
+        name_colour = member.color.value
+    return (str(card_number), card_hash(grid), frozenset(completed_tiles), avatar_key, name, name_colour)
+
+
+async def render_card(card_number: str, grid, completed_tiles, member: discord.Member | None = None) -> bytes:
+    # PNG bytes of a card, straight from the cache when nothing on it changed
+    key = render_key(card_number, grid, completed_tiles, member)
+    data = bingo_png_cache.get(key)
+    if data is None:
+        spec = await bingo_card_spec(card_number, grid, completed_tiles, member)
+        data = await render_service.render(spec)
+        # a failed avatar fetch renders without it, don't keep that under the real avatar hash
+        if member is None or spec.avatar is not None:
+            bingo_png_cache.put(key, data)
+    return data
@@ -0,0 +1,332 @@
+from __future__ import annotations
+import argparse
+import io
+import json
+import sqlite3
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from constants import *
+from helpers.persistence import persistence
+from helpers.stats import StatsStore
+
+
+# The stores that run on the database. Only user stats and salvage ownership moved,
+# they're the two rewritten on every reaction/catch; the rest are small, rarely
+# written and stay on their data/*.json files, so they aren't imported or exported.
+DATA_PATHS = [
+    USER_STATS_PATH,
+    OWNERSHIP_PATH,
+]
+
+
+def namespace_for(path: str) -> str:
+    return Path(path).stem
+
+
+class DataStore(ABC):
+    # namespace is the stem of the file the store used to live in ("user_stats"),
+    # key is usually a user id
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, default=None):
+        ...
+
+    @abstractmethod
+    def put(self, namespace: str, key: str, value) -> None:
+        ...
+
+    def put_many(self, namespace: str, rows: Dict[str, Any]) -> None:
+        for key, value in rows.items():
+            self.put(namespace, key, value)
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        ...
+
+    def replace(self, namespace: str, rows: Dict[str, Any]) -> None:
+        # namespace ends up holding exactly these rows
+        for key in set(self.items(namespace)) - {str(k) for k in rows}:
+            self.delete(namespace, key)
+        self.put_many(namespace, rows)
+
+    @abstractmethod
+    def items(self, namespace: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def namespaces(self) -> list[str]:
+        ...
+
+    def user_rows(self, user_id) -> Dict[str, Any]:
+        out = {}
+        for ns in self.namespaces():
+            value = self.get(ns, str(user_id))
+            if value is not None:
+                out[ns] = value
+        return out
+
+    def get_meta(self, key: str, default=None):
+        return default
+
+    def set_meta(self, key: str, value: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteDataStore(DataStore):
+    def __init__(self, path: str | Path = DATASTORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_records_key ON records (key);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+
+    def get(self, namespace: str, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM records WHERE namespace = ? AND key = ?",
+                (namespace, str(key)),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, namespace: str, key: str, value) -> None:
+        self.put_many(namespace, {str(key): value})
+
+    def put_many(self, namespace: str, rows: Dict[str, Any]) -> None:
+        now = time.time()
+        params = [(namespace, str(k), json.dumps(v, ensure_ascii=False), now) for k, v in rows.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO records (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    params,
+                )
+                self._conn.execute("COMMIT")
+            except:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM records WHERE namespace = ? AND key = ?", (namespace, str(key)))
+
+    def replace(self, namespace: str, rows: Dict[str, Any]) -> None:
+        now = time.time()
+        params = [(namespace, str(k), json.dumps(v, ensure_ascii=False), now) for k, v in rows.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM records WHERE namespace = ?", (namespace,))
+                self._conn.executemany(
+                    "INSERT INTO records (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                    params,
+                )
+                self._conn.execute("COMMIT")
+            except:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM records WHERE namespace = ? ORDER BY key",
+                (namespace,),
+            ).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def namespaces(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT namespace FROM records ORDER BY namespace").fetchall()
+        return [r[0] for r in rows]
+
+    def user_rows(self, user_id) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, value FROM records WHERE key = ?",
+                (str(user_id),),
+            ).fetchall()
+        return {ns: json.loads(v) for ns, v in rows}
+
+    def get_meta(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[SqliteDataStore] = None
+
+
+def shared_datastore() -> Optional[SqliteDataStore]:
+    # the bot's database, opened on first use. None when USE_DATASTORE is off and
+    # the stores stay on their JSON files
+    global _shared
+    if not USE_DATASTORE:
+        return None
+    if _shared is None:
+        _shared = SqliteDataStore(DATASTORE_PATH)
+    return _shared
+
+
+def datastore_for(path: str) -> Optional[SqliteDataStore]:
+    # the shared database for a store that used to live in `path`, with that file imported
+    store = shared_datastore()
+    if store is not None:
+        ensure_imported(store, path)
+    return store
+
+
+def close_shared_datastore() -> None:
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
+
+
+def import_json_file(store: DataStore, path: str) -> Dict[str, int]:
+    if path == USER_STATS_PATH:
+        # replays any stats journal on top of the snapshot
+        data = StatsStore(Path(path), journal=True).load() or None
+    else:
+        data = persistence.read_json(path)
+    if persistence.unreadable(path):
+        # importing would mark it done and the real data would never be read again
+        raise ValueError(f"{path} doesn't parse, fix it before moving it into the datastore")
+    if data is None:
+        return {}
+
+    if not isinstance(data, dict):
+        print(f"[WARN] {path} isn't a JSON object, not importing it")
+        return {}
+
+    ns = namespace_for(path)
+    store.put_many(ns, data)
+    return {ns: len(data)}
+
+
+def _imported_key(path: str) -> str:
+    return f"imported:{namespace_for(path)}"
+
+
+def import_json_files(store: DataStore, paths: Iterable[str] = DATA_PATHS) -> Dict[str, int]:
+    counts = {}
+    for path in paths:
+        counts.update(import_json_file(store, path))
+        store.set_meta(_imported_key(path), time.strftime("%Y-%m-%dT%H:%M:%S"))
+    return counts
+
+
+def ensure_imported(store: DataStore, path: str) -> None:
+    # a store that moved onto the database pulls its JSON file in the first time
+    if store.get_meta(_imported_key(path)) or store.get_meta("imported_at"):
+        return
+
+    counts = import_json_file(store, path)
+    store.set_meta(_imported_key(path), time.strftime("%Y-%m-%dT%H:%M:%S"))
+    print(f"[INFO] imported {path} into the datastore ({sum(counts.values())} rows)")
+
+
+def export_files(store: DataStore) -> Dict[str, Any]:
+    # file stem -> what that data/*.json file would hold
+    return {namespace_for(path): store.items(namespace_for(path)) for path in DATA_PATHS}
+
+
+def export_json(store: DataStore, out_dir: str | Path) -> list[Path]:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for stem, data in export_files(store).items():
+        path = out_dir / f"{stem}.json"
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        written.append(path)
+
+    return written
+
+
+def export_zip(store: DataStore) -> bytes:
+    # the same files as export_json, zipped in memory for sending as an attachment
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for stem, data in export_files(store).items():
+            zf.writestr(f"{stem}.json", json.dumps(data, indent=2, ensure_ascii=False))
+    return out.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import/export the user stats and ownership files to SQLite")
+    parser.add_argument("--db", default=DATASTORE_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    imp = sub.add_parser("import", help="one-shot import of the JSON files into the database")
+    imp.add_argument("--force", action="store_true", help="import again even if already imported")
+
+    exp = sub.add_parser("export", help="write them back out as JSON files")
+    exp.add_argument("--out", default="data/export")
+
+    args = parser.parse_args(argv)
+    store = SqliteDataStore(args.db)
+
+    try:
+        if args.cmd == "import":
+            done = store.get_meta("imported_at")
+            if done and not args.force:
+                print(f"already imported at {done}, use --force to import again")
+                return 1
+
+            # files the bot already moved onto the database are newer there than in JSON
+            paths = [p for p in DATA_PATHS if args.force or not store.get_meta(_imported_key(p))]
+            for p in sorted(set(DATA_PATHS) - set(paths)):
+                print(f"skipping {p}, already imported (--force to overwrite)")
+
+            counts = import_json_files(store, paths)
+            store.set_meta("imported_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+            for ns, n in sorted(counts.items()):
+                print(f"{ns}: {n} rows")
+        else:
+            for path in export_json(store, args.out):
+                print(f"wrote {path}")
+    finally:
+        store.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import discord
+from constants import ACH_EVAL_DEBOUNCE_SECONDS, ACH_EVAL_MAX_DELAY_SECONDS, ACH_EVAL_WORKERS
+
+
+class _Pending:
+    __slots__ = ("member", "changed", "first_at", "events")
+
+    def __init__(self, member: discord.Member, changed: Optional[set[str]]):
+        self.member = member
+        self.changed = changed
+        self.first_at = time.monotonic()
+        self.events = 1
+
+
+class EvaluationQueue:
+    # Runs achievement evaluation off the event handlers. enqueue() just records
+    # the member and what changed. A user is evaluated once debounce seconds go by
+    # with no new events for them (or max_delay after their first one), with
+    # every changed set since then merged, so a burst of messages is one
+    # evaluation. A fixed pool of workers does the evaluating and a user is
+    # never evaluated twice at once.
+
+    def __init__(
+        self,
+        engine,
+        ctx_builder: Optional[Callable[[discord.Member], Awaitable[Any]]] = None,
+        debounce: float = ACH_EVAL_DEBOUNCE_SECONDS,
+        max_delay: float = ACH_EVAL_MAX_DELAY_SECONDS,
+        workers: int = ACH_EVAL_WORKERS,
+    ):
+        self.engine = engine
+        self.ctx_builder = ctx_builder
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.worker_count = workers
+
+        self._pending: Dict[int, _Pending] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._in_flight: set[int] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+
+        self.enqueued = 0
+        self.evaluated = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+
+        self._ready = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.worker_count)]
+
+        for uid in list(self._pending):
+            self._schedule(uid)
+
+    async def stop(self) -> None:
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, member: discord.Member, changed: Optional[Iterable[str]] = None) -> None:
+        if member is None or getattr(member, "bot", False):
+            return
+
+        self.enqueued += 1
+        uid = member.id
+        changed = set(changed) if changed is not None else None
+
+        entry = self._pending.get(uid)
+        if entry is None:
+            self._pending[uid] = _Pending(member, changed)
+        else:
+            # None means "check everything" and wins over any partial set
+            entry.member = member
+            entry.changed = None if entry.changed is None or changed is None else entry.changed | changed
+            entry.events += 1
+
+        if self._ready is None:
+            # not started (no running loop yet), the entry waits for start()
+            return
+        self._schedule(uid)
+
+    def _schedule(self, uid: int) -> None:
+        entry = self._pending.get(uid)
+        if entry is None:
+            return
+
+        handle = self._timers.pop(uid, None)
+        if handle is not None:
+            handle.cancel()
+
+        waited = time.monotonic() - entry.first_at
+        delay = max(0.0, min(self.debounce, self.max_delay - waited))
+        self._timers[uid] = asyncio.get_running_loop().call_later(delay, self._fire, uid)
+
+    def _fire(self, uid: int) -> None:
+        self._timers.pop(uid, None)
+        # still running from last time, the worker reschedules when it's done
+        if uid in self._in_flight or uid not in self._pending:
+            return
+        self._in_flight.add(uid)
+        self._ready.put_nowait(uid)
+
+    async def _worker(self):
+        while True:
+            uid = await self._ready.get()
+            entry = self._pending.pop(uid, None)
+            try:
+                if entry is not None:
+                    await self._evaluate(entry)
+            finally:
+                self._in_flight.discard(uid)
+                self._ready.task_done()
+                if uid in self._pending and uid not in self._timers:
+                    self._schedule(uid)
+
+    async def _evaluate(self, entry: _Pending):
+        lag = time.monotonic() - entry.first_at
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+        if self.ctx_builder is None:
+            return
+
+        try:
+            ctx = await self.ctx_builder(entry.member)
+            await self.engine.evaluate(ctx, changed=entry.changed)
+            self.evaluated += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"[WARN] achievement eval failed for {entry.member.id}: {e}")
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def oldest_wait(self) -> float:
+        if not self._pending:
+            return 0.0
+        return time.monotonic() - min(e.first_at for e in self._pending.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "ready": self._ready.qsize() if self._ready else 0,
+            "in_flight": len(self._in_flight),
+            "oldest_wait": round(self.oldest_wait(), 2),
+            "last_lag": round(self.last_lag, 2),
+            "max_lag": round(self.max_lag, 2),
+            "enqueued": self.enqueued,
+            "evaluated": self.evaluated,
+            "failed": self.failed,
+            "workers": len(self._workers),
+        }
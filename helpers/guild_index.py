@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import Dict, Optional
+import discord
+
+
+class GuildIndex:
+    # Name -> role/emoji maps per guild so lookups aren't a linear scan of
+    # guild.roles / guild.emojis every time. Built on first use per guild and
+    # dropped by the role/emoji update events in main.py. Like discord.utils.get,
+    # the first object with a given name wins.
+
+    def __init__(self):
+        self._roles: Dict[int, Dict[str, discord.Role]] = {}
+        self._roles_folded: Dict[int, Dict[str, discord.Role]] = {}
+        self._emojis: Dict[int, Dict[str, discord.Emoji]] = {}
+        self._emoji_ids: Dict[int, frozenset[str]] = {}
+
+    def _build_roles(self, guild: discord.Guild):
+        by_name: Dict[str, discord.Role] = {}
+        folded: Dict[str, discord.Role] = {}
+        for role in guild.roles:
+            by_name.setdefault(role.name, role)
+            folded.setdefault(role.name.lower(), role)
+        self._roles[guild.id] = by_name
+        self._roles_folded[guild.id] = folded
+
+    def _build_emojis(self, guild: discord.Guild):
+        by_name: Dict[str, discord.Emoji] = {}
+        for emoji in guild.emojis:
+            by_name.setdefault(emoji.name, emoji)
+        self._emojis[guild.id] = by_name
+        self._emoji_ids[guild.id] = frozenset(str(e.id) for e in guild.emojis)
+
+    def role(self, guild: Optional[discord.Guild], name: Optional[str]) -> Optional[discord.Role]:
+        if guild is None or not name:
+            return None
+        if guild.id not in self._roles:
+            self._build_roles(guild)
+        return self._roles[guild.id].get(name)
+
+    def role_casefold(self, guild: Optional[discord.Guild], name: Optional[str]) -> Optional[discord.Role]:
+        if guild is None or not name:
+            return None
+        if guild.id not in self._roles_folded:
+            self._build_roles(guild)
+        return self._roles_folded[guild.id].get(name.strip().lower())
+
+    def emoji(self, guild: Optional[discord.Guild], name: str) -> Optional[discord.Emoji]:
+        if guild is None:
+            return None
+        if guild.id not in self._emojis:
+            self._build_emojis(guild)
+        return self._emojis[guild.id].get(name)
+
+    def emoji_ids(self, guild: discord.Guild) -> frozenset[str]:
+        if guild.id not in self._emoji_ids:
+            self._build_emojis(guild)
+        return self._emoji_ids[guild.id]
+
+    def invalidate_roles(self, guild_id: int) -> None:
+        self._roles.pop(guild_id, None)
+        self._roles_folded.pop(guild_id, None)
+
+    def invalidate_emojis(self, guild_id: int) -> None:
+        self._emojis.pop(guild_id, None)
+        self._emoji_ids.pop(guild_id, None)
+
+    def invalidate(self, guild_id: int) -> None:
+        self.invalidate_roles(guild_id)
+        self.invalidate_emojis(guild_id)
+
+    def clear(self) -> None:
+        self._roles.clear()
+        self._roles_folded.clear()
+        self._emojis.clear()
+        self._emoji_ids.clear()
+
+
+guild_index = GuildIndex()
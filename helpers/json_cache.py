@@ -0,0 +1,79 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Any, Dict, Tuple
+from helpers.persistence import persistence
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("cached JSON views are read-only, load a fresh copy to modify")
+
+
+class FrozenDict(dict):
+    __setitem__ = __delitem__ = _readonly
+    setdefault = update = pop = popitem = clear = _readonly
+    __ior__ = _readonly
+
+
+class FrozenList(list):
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+
+def freeze(obj):
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+class JsonCache:
+    # Parsed JSON files handed out as read-only views. An entry stays valid while
+    # the file's (mtime_ns, size) is unchanged, or while the same unwritten save
+    # is still queued in the persistence executor.
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[tuple, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _validator(self, key: str):
+        pending = persistence.peek_pending(key)
+        if pending is not None:
+            # tuple comparison checks identity first, so an unchanged queued save is cheap
+            return ("pending", pending), pending
+
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            return ("missing",), None
+        return ("disk", st.st_mtime_ns, st.st_size), None
+
+    def get(self, path, default=None):
+        key = str(Path(path))
+        validator, pending = self._validator(key)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == validator:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if validator[0] == "missing":
+            value = freeze(default)
+        elif isinstance(pending, tuple):
+            # a queued write_json, freeze copies it so there's nothing to parse
+            value = freeze(pending[0])
+        else:
+            value = freeze(persistence.read_json(key, default))
+
+        self._entries[key] = (validator, value)
+        return value
+
+    def invalidate(self, path) -> None:
+        key = str(Path(path))
+        self._entries.pop(key, None)
+
+
+json_cache = JsonCache()
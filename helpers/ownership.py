@@ -0,0 +1,217 @@
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from helpers.persistence import persistence
+
+
+Key = Tuple[str, str]
+
+
+def key_str(item_id: str, variant: str) -> str:
+    # same "id|variant" format the select menus use as option values
+    return f"{item_id}|{variant}"
+
+
+class OwnedItem:
+    __slots__ = ("item_id", "variant", "count", "obtained_at", "source")
+
+    def __init__(self, item_id: str, variant: str, count: int, obtained_at: int, source: str):
+        self.item_id = item_id
+        self.variant = variant
+        self.count = count
+        self.obtained_at = obtained_at
+        self.source = source
+
+    @property
+    def key(self) -> Key:
+        return (self.item_id, self.variant)
+
+    def to_json(self) -> dict:
+        return {"count": self.count, "obtained_at": self.obtained_at, "source": self.source}
+
+
+class OwnershipStore:
+    # Per user, one record per (item_id, variant) holding how many times it was
+    # obtained plus the first time it was obtained and where from. The whole file
+    # stays in memory, every change is a single write through the persistence thread.
+    #
+    # On disk: {uid: {"item_id|variant": {"count", "obtained_at", "source"}}}.
+    # Users still in the old list-of-dicts format are migrated on load.
+    #
+    # With a datastore (helpers.datastore.DataStore) each user is one row there instead,
+    # and a change only writes the users it touched.
+
+    def __init__(self, path: Path, datastore=None, namespace: str = "ownership"):
+        self.path = path
+        self.datastore = datastore
+        self.namespace = namespace
+        self._users: Optional[Dict[str, Dict[Key, OwnedItem]]] = None
+        self.migrated = 0
+
+    @staticmethod
+    def _from_list(entries: list) -> Dict[Key, OwnedItem]:
+        out: Dict[Key, OwnedItem] = {}
+        for x in entries:
+            if not isinstance(x, dict) or "id" not in x:
+                continue
+
+            key = (x["id"], x.get("variant", "Normal"))
+            at = int(x.get("obtained_at", 0) or 0)
+            rec = out.get(key)
+            if rec is None:
+                out[key] = OwnedItem(key[0], key[1], 1, at, x.get("source", "spawn"))
+                continue
+
+            rec.count += 1
+            if at < rec.obtained_at:
+                rec.obtained_at = at
+                rec.source = x.get("source", "spawn")
+        return out
+
+    @staticmethod
+    def _from_dict(entries: dict) -> Dict[Key, OwnedItem]:
+        out: Dict[Key, OwnedItem] = {}
+        for k, rec in entries.items():
+            item_id, _, variant = k.partition("|")
+            out[(item_id, variant or "Normal")] = OwnedItem(
+                item_id,
+                variant or "Normal",
+                int(rec.get("count", 1)),
+                int(rec.get("obtained_at", 0) or 0),
+                rec.get("source", "spawn"),
+            )
+        return out
+
+    def load(self) -> Dict[str, Dict[Key, OwnedItem]]:
+        if self._users is not None:
+            return self._users
+
+        if self.datastore is not None:
+            raw = self.datastore.items(self.namespace)
+        else:
+            raw = persistence.read_json(self.path, {})
+        if not isinstance(raw, dict):
+            raw = {}
+
+        users = {}
+        migrated = 0
+        for uid, entries in raw.items():
+            if isinstance(entries, list):
+                users[uid] = self._from_list(entries)
+                migrated += 1
+            elif isinstance(entries, dict):
+                users[uid] = self._from_dict(entries)
+
+        self._users = users
+        self.migrated = migrated
+        if migrated:
+            print(f"[INFO] migrated {migrated} users in {self.path} to the keyed ownership format")
+            self.save([uid for uid, entries in raw.items() if isinstance(entries, list)])
+        return users
+
+    @staticmethod
+    def _to_json(items: Dict[Key, OwnedItem]) -> dict:
+        return {key_str(*key): rec.to_json() for key, rec in items.items()}
+
+    def save(self, user_ids: Optional[Iterable] = None) -> None:
+        # user_ids: the users that changed, only the datastore makes use of it
+        users = self.load()
+
+        if self.datastore is None:
+            data = {uid: self._to_json(items) for uid, items in users.items() if items}
+            persistence.write_json(self.path, data, indent=2, ensure_ascii=False)
+            return
+
+        if user_ids is None:
+            rows = {uid: self._to_json(items) for uid, items in users.items() if items}
+            persistence.submit(self._write_rows, rows, None)
+            return
+
+        # serialise here, the records keep changing on the loop
+        rows = {}
+        for uid in {str(u) for u in user_ids}:
+            items = users.get(uid)
+            rows[uid] = self._to_json(items) if items else None
+        persistence.submit(self._write_rows, None, rows)
+
+    def _write_rows(self, everything: Optional[dict], changed: Optional[dict]) -> None:
+        # runs on the persistence thread
+        try:
+            if everything is not None:
+                self.datastore.replace(self.namespace, everything)
+                return
+            for uid, row in changed.items():
+                if row is None:
+                    self.datastore.delete(self.namespace, uid)
+                else:
+                    self.datastore.put(self.namespace, uid, row)
+        except Exception as e:
+            print(f"[WARN] ownership write failed: {e}")
+
+    def items(self, user_id) -> Dict[Key, OwnedItem]:
+        # live view, don't mutate
+        return self.load().get(str(user_id), {})
+
+    def records(self, user_id) -> Iterator[OwnedItem]:
+        return iter(self.items(user_id).values())
+
+    def unique_count(self, user_id) -> int:
+        return len(self.items(user_id))
+
+    def has(self, user_id, item_id: str, variant: str) -> bool:
+        return (item_id, variant) in self.items(user_id)
+
+    def _grant(self, uid: str, item_id: str, variant: str, source: str, at: int) -> OwnedItem:
+        items = self.load().setdefault(uid, {})
+        rec = items.get((item_id, variant))
+        if rec is None:
+            rec = items[(item_id, variant)] = OwnedItem(item_id, variant, 0, at, source)
+        rec.count += 1
+        return rec
+
+    def _remove(self, uid: str, item_id: str, variant: str) -> Optional[OwnedItem]:
+        # drops every copy of that variant, same as the old list filter did
+        items = self.load().get(uid)
+        if not items:
+            return None
+
+        rec = items.pop((item_id, variant), None)
+        if not items:
+            del self.load()[uid]
+        return rec
+
+    def grant(self, user_id, item_id: str, variant: str, source: str) -> OwnedItem:
+        rec = self._grant(str(user_id), item_id, variant, source, int(time.time()))
+        self.save([user_id])
+        return rec
+
+    def remove(self, user_id, item_id: str, variant: str) -> bool:
+        if self._remove(str(user_id), item_id, variant) is None:
+            return False
+
+        self.save([user_id])
+        return True
+
+    def transfer(self, from_id, to_id, item_id: str, variant: str, source: str) -> bool:
+        # gift: the giver loses it, the receiver gets a fresh record, one write
+        if self._remove(str(from_id), item_id, variant) is None:
+            return False
+
+        self._grant(str(to_id), item_id, variant, source, int(time.time()))
+        self.save([from_id, to_id])
+        return True
+
+    def swap(self, a_id, a_key: Key, b_id, b_key: Key) -> bool:
+        # trade: both sides must still own their pick, then both move in one write
+        a_id, b_id = str(a_id), str(b_id)
+        if not self.has(a_id, *a_key) or not self.has(b_id, *b_key):
+            return False
+
+        at = int(time.time())
+        self._remove(a_id, *a_key)
+        self._remove(b_id, *b_key)
+        self._grant(b_id, a_key[0], a_key[1], f"trade:{a_id}", at)
+        self._grant(a_id, b_key[0], b_key[1], f"trade:{b_id}", at)
+        self.save([a_id, b_id])
+        return True
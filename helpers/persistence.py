@@ -0,0 +1,230 @@
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class PersistenceExecutor:
+    # One writer thread does every file write. If a path is saved again before its
+    # queued write runs, the queued write just picks up the newer text, so a burst
+    # of saves becomes one write. Reads check the not-yet-written data first so
+    # callers always see their own saves.
+    #
+    # write_json hands the object itself to the writer thread and json.dumps runs
+    # there, so the caller must not touch it afterwards (save a copy if you keep
+    # it around). A file that exists but doesn't parse is never written over: the
+    # reader gets the default, and saves to it are refused until it reads cleanly.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # path -> text, or (data, dump kwargs) from write_json
+        self._pending: Dict[str, Any] = {}
+        self._unreadable: set[str] = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._appends: Dict[str, list[str]] = {}
+        self._scheduled: set[str] = set()
+        self._futures: set[concurrent.futures.Future] = set()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence")
+
+    @staticmethod
+    def _key(path) -> str:
+        return str(Path(path))
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        # ordered with the writes, for anything that has to happen on the writer thread
+        fut = self._pool.submit(fn, *args)
+        with self._lock:
+            self._futures.add(fut)
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, fut):
+        with self._lock:
+            self._futures.discard(fut)
+
+    def write_text(self, path, text: str) -> None:
+        self._queue(self._key(path), text)
+
+    def write_json(self, path, data, **dump_kwargs) -> None:
+        self._queue(self._key(path), (data, dump_kwargs))
+
+    def _queue(self, key: str, entry) -> None:
+        with self._lock:
+            if key in self._unreadable:
+                print(f"[ERROR] not saving {key}, the file on disk doesn't parse and would be lost. Fix or move it first")
+                return
+            self._pending[key] = entry
+            if key in self._scheduled:
+                return
+            self._scheduled.add(key)
+
+        self.submit(self._write, key)
+
+    def append_text(self, path, text: str) -> None:
+        # appends are never coalesced away, only batched into one write per job
+        key = self._key(path)
+        with self._lock:
+            buf = self._appends.setdefault(key, [])
+            buf.append(text)
+            if len(buf) > 1:
+                return
+
+        self.submit(self._append, key)
+
+    def _append(self, key: str) -> None:
+        with self._lock:
+            chunks = self._appends.pop(key, [])
+        if not chunks:
+            return
+
+        try:
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            with open(key, "a", encoding="utf-8") as f:
+                f.write("".join(chunks))
+        except Exception as e:
+            print(f"[WARN] failed to append to {key}: {e}")
+
+    def _write(self, key: str) -> None:
+        with self._lock:
+            self._scheduled.discard(key)
+            entry = self._pending.get(key)
+        if entry is None:
+            return
+
+        path = Path(key)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            text = self._encode(entry)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(path)
+        except Exception as e:
+            # keep it pending so reads stay consistent, the next save retries
+            print(f"[WARN] failed to write {key}: {e}")
+            return
+
+        with self._lock:
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+
+    @staticmethod
+    def _encode(entry) -> str:
+        if isinstance(entry, str):
+            return entry
+        data, dump_kwargs = entry
+        return json.dumps(data, **dump_kwargs)
+
+    def peek_pending(self, path):
+        # the queued save for path as handed in: text, or (data, dump kwargs). Hands off
+        with self._lock:
+            return self._pending.get(self._key(path))
+
+    def read_text(self, path) -> Optional[str]:
+        entry = self.peek_pending(path)
+        if entry is not None:
+            return self._encode(entry)
+
+        try:
+            return Path(self._key(path)).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def read_json(self, path, default: Any = None) -> Any:
+        entry = self.peek_pending(path)
+        if entry is not None:
+            if isinstance(entry, str):
+                return json.loads(entry) if entry.strip() else default
+            # a copy, the queued object belongs to the writer now
+            return copy.deepcopy(entry[0])
+
+        key = self._key(path)
+        try:
+            raw = Path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return default
+        if not raw.strip():
+            return default
+
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            with self._lock:
+                first = key not in self._unreadable
+                self._unreadable.add(key)
+            if first:
+                print(f"[ERROR] {key} doesn't parse ({e}), using the default and refusing to save over it")
+            return default
+
+        with self._lock:
+            self._unreadable.discard(key)
+        return data
+
+    def unreadable(self, path) -> bool:
+        with self._lock:
+            return self._key(path) in self._unreadable
+
+    async def read_text_async(self, path) -> Optional[str]:
+        # a queued save is returned straight away, only the disk read goes to a thread
+        entry = self.peek_pending(path)
+        if isinstance(entry, str):
+            return entry
+        return await asyncio.to_thread(self.read_text, path)
+
+    async def read_json_async(self, path, default: Any = None) -> Any:
+        # same as read_json, but the read and the parse (or copy) happen off the event loop
+        return await asyncio.to_thread(self.read_json, path, default)
+
+    def lock(self, path) -> asyncio.Lock:
+        # for coroutines that read a file with read_json_async, change it and save it:
+        # the read is an await, so without this two of them can overwrite each other
+        key = self._key(path)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def exists(self, path) -> bool:
+        key = self._key(path)
+        with self._lock:
+            if key in self._pending:
+                return True
+        return Path(key).exists()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    async def flush(self) -> None:
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                return
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+
+    def flush_sync(self) -> None:
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                return
+            concurrent.futures.wait(futures)
+
+
+persistence = PersistenceExecutor()
+
+
+def read_json(path, default: Any = None) -> Any:
+    return persistence.read_json(path, default)
+
+
+async def read_json_async(path, default: Any = None) -> Any:
+    return await persistence.read_json_async(path, default)
+
+
+def write_json(path, data, **dump_kwargs) -> None:
+    persistence.write_json(path, data, **dump_kwargs)
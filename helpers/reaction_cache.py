@@ -0,0 +1,136 @@
+from __future__ import annotations
+import asyncio
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import discord
+from constants import REACTION_CACHE_MESSAGES
+
+
+class MessageReactions:
+    __slots__ = ("owner_id", "reactors", "bots")
+
+    def __init__(self, owner_id: int):
+        self.owner_id = owner_id
+        # emoji (str) -> ids of everyone who reacted with it
+        self.reactors: Dict[str, set[int]] = {}
+        self.bots: set[int] = set()
+
+    def add(self, emoji: str, user_id: int, is_bot: bool = False) -> None:
+        self.reactors.setdefault(emoji, set()).add(user_id)
+        if is_bot:
+            self.bots.add(user_id)
+
+    def remove(self, emoji: str, user_id: int) -> None:
+        users = self.reactors.get(emoji)
+        if users is None:
+            return
+        users.discard(user_id)
+        if not users:
+            del self.reactors[emoji]
+
+    def reacted_with_other(self, emoji: str, user_id: int) -> bool:
+        return any(user_id in users for e, users in self.reactors.items() if e != emoji)
+
+    def unique_users(self) -> set[int]:
+        out = set()
+        for users in self.reactors.values():
+            out |= users
+        return out - self.bots
+
+    def total_reactions(self) -> int:
+        return sum(len(users) for users in self.reactors.values())
+
+
+class ReactionCache:
+    # Per-message reaction state so a reaction event doesn't have to fetch the
+    # message and page through every reactor list. A message is seeded from the
+    # API the first time we see a reaction on it, after that the raw reaction
+    # events keep it up to date. Least recently touched messages fall out first.
+    #
+    # Seeding pages through the reactor lists, so events can arrive halfway. They're
+    # queued against the in-flight seed and applied once paging is done, and a second
+    # seed of the same message just waits for the first.
+
+    def __init__(self, max_messages: int = REACTION_CACHE_MESSAGES):
+        self.max_messages = max_messages
+        self._messages: OrderedDict[int, MessageReactions] = OrderedDict()
+        # message id -> (future of the state being seeded, events that came in meanwhile)
+        self._seeding: Dict[int, tuple[asyncio.Future, list[Callable[[MessageReactions], None]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, message_id: int) -> Optional[MessageReactions]:
+        state = self._messages.get(message_id)
+        if state is not None:
+            self._messages.move_to_end(message_id)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return state
+
+    async def seed(self, message: discord.Message) -> MessageReactions:
+        inflight = self._seeding.get(message.id)
+        if inflight is not None:
+            return await asyncio.shield(inflight[0])
+
+        fut = asyncio.get_running_loop().create_future()
+        deltas: list[Callable[[MessageReactions], None]] = []
+        self._seeding[message.id] = (fut, deltas)
+        try:
+            state = MessageReactions(message.author.id)
+            for r in message.reactions:
+                emoji = str(r.emoji)
+                async for u in r.users():
+                    state.add(emoji, u.id, u.bot)
+
+            # anything that happened while we were paging is newer than the pages
+            for apply in deltas:
+                apply(state)
+
+            self._messages[message.id] = state
+            self._messages.move_to_end(message.id)
+            while len(self._messages) > self.max_messages:
+                self._messages.popitem(last=False)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # whoever is waiting gets it, don't warn about it if nobody is
+            fut.exception()
+            raise
+        finally:
+            del self._seeding[message.id]
+
+        fut.set_result(state)
+        return state
+
+    def _apply(self, message_id: int, fn: Callable[[MessageReactions], None]) -> None:
+        state = self._messages.get(message_id)
+        if state is not None:
+            fn(state)
+
+        inflight = self._seeding.get(message_id)
+        if inflight is not None:
+            inflight[1].append(fn)
+
+    def on_add(self, message_id: int, emoji: str, user_id: int, is_bot: bool = False) -> None:
+        self._apply(message_id, lambda state: state.add(emoji, user_id, is_bot))
+
+    def on_remove(self, message_id: int, emoji: str, user_id: int) -> None:
+        self._apply(message_id, lambda state: state.remove(emoji, user_id))
+
+    def on_clear(self, message_id: int) -> None:
+        self._apply(message_id, lambda state: state.reactors.clear())
+
+    def on_clear_emoji(self, message_id: int, emoji: str) -> None:
+        self._apply(message_id, lambda state: state.reactors.pop(emoji, None))
+
+    def forget(self, message_id: int) -> None:
+        self._messages.pop(message_id, None)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
+reaction_cache = ReactionCache()
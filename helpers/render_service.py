@@ -0,0 +1,97 @@
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import multiprocessing
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+from constants import RENDER_WORKERS, RENDER_MAX_CONCURRENT, RENDER_TIMEOUT_SECONDS
+
+
+def _run(spec) -> tuple[bytes, float]:
+    # runs in a worker process, specs are plain picklable objects with a render() -> PNG bytes
+    start = time.perf_counter()
+    data = spec.render()
+    return data, time.perf_counter() - start
+
+
+class RenderService:
+    # Pillow work off the event loop. Every job is a spec whose render() returns PNG
+    # bytes, run in a process pool with at most max_concurrent jobs in flight.
+    # inline=True renders right in the caller instead (tests, or no pool available).
+
+    def __init__(
+        self,
+        workers: int = RENDER_WORKERS,
+        max_concurrent: int = RENDER_MAX_CONCURRENT,
+        timeout: float = RENDER_TIMEOUT_SECONDS,
+        inline: bool = False,
+    ):
+        self.workers = workers
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.inline = inline
+
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._timings: Dict[str, list] = {}
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, forking a process that has the writer/prewarm threads running isn't safe
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _record(self, kind: str, render_s: float, wait_s: float) -> None:
+        # [jobs, total render, max render, total wait]
+        t = self._timings.setdefault(kind, [0, 0.0, 0.0, 0.0])
+        t[0] += 1
+        t[1] += render_s
+        t[2] = max(t[2], render_s)
+        t[3] += wait_s
+
+    async def render(self, spec) -> bytes:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+
+        kind = type(spec).__name__
+        queued = time.perf_counter()
+
+        async with self._sem:
+            started = time.perf_counter()
+            if self.inline:
+                data, render_s = _run(spec)
+            else:
+                try:
+                    fut = self._executor().submit(_run, spec)
+                    data, render_s = await asyncio.wait_for(asyncio.wrap_future(fut), self.timeout)
+                except BrokenProcessPool:
+                    # a worker died (OOM etc.), start a fresh pool next time and do this one in a thread
+                    print(f"[WARN] render pool broke during {kind}, restarting it")
+                    self._pool = None
+                    data, render_s = await asyncio.to_thread(_run, spec)
+
+            self._record(kind, render_s, started - queued)
+            return data
+
+    def stats(self) -> Dict[str, dict]:
+        out = {}
+        for kind, (jobs, total, worst, wait) in self._timings.items():
+            out[kind] = {
+                "jobs": jobs,
+                "avg_ms": round(total / jobs * 1000, 1),
+                "max_ms": round(worst * 1000, 1),
+                "avg_wait_ms": round(wait / jobs * 1000, 1),
+            }
+        return out
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+render_service = RenderService()
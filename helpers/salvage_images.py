@@ -0,0 +1,270 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Iterable, Optional, Tuple
+from PIL import Image, ImageDraw, ImageEnhance, ImageFont, ImageOps
+from constants import SALVAGE_SPAWN_IMAGE_SIZE, SALVAGE_BATTLE_CELL_SIZE, SALVAGE_IMAGE_CACHE_MB
+
+
+Size = Tuple[int, int]
+
+# "base" is the item contained in a transparent square, "x" is greyed out with a
+# red cross (escaped / lost a round), "check" is greyed out with a green tick (caught)
+STYLES = ("base", "x", "check")
+
+
+def open_contained(path: str, size: Size = (256, 256)) -> Image.Image:
+    try:
+        with Image.open(path) as im:
+            img = im.convert("RGBA")
+    except:
+        img = Image.new("RGBA", size, (40,40,40,255))
+    img = ImageOps.contain(img, size)
+    canvas = Image.new("RGBA", size, (0,0,0,0))
+    canvas.paste(img, ((size[0]-img.size[0])//2, (size[1]-img.size[1])//2), img)
+    return canvas
+
+
+def gray_out(img: Image.Image) -> Image.Image:
+    g = ImageOps.grayscale(img).convert("RGBA")
+    g = ImageEnhance.Brightness(g).enhance(0.75)
+    alpha = g.split()[-1].point(lambda a: int(a * 0.55))
+    g.putalpha(alpha)
+    return g
+
+
+def add_red_x(img: Image.Image) -> Image.Image:
+    overlay = img.copy()
+    d = ImageDraw.Draw(overlay)
+
+    w, h = overlay.size
+    margin = int(min(w,h) * 0.12)
+    thickness = max(8, int(min(w, h) * 0.06))
+
+    red = (220, 50, 60, 255)
+
+    d.line((margin, margin, w - margin, h - margin), fill=red, width=thickness)
+    d.line((w - margin, margin, margin, h - margin), fill=red, width=thickness)
+    return overlay
+
+
+def add_green_check(img: Image.Image) -> Image.Image:
+    overlay = img.copy()
+    d = ImageDraw.Draw(overlay)
+
+    w, h = overlay.size
+    margin = int(min(w, h) * 0.10)
+    thickness = max(8, int(min(w, h) * 0.06))
+
+    x2, y2 = w - margin, margin
+    x1, y1 = margin + int(w * 0.4), h - int(h * 0.18)
+    x0, y0 = margin + int(w * 0.1), h - int(h * 0.33)
+
+    green = (60, 220, 120, 255)
+    d.line((x0, y0, x1, y1), fill=green, width=thickness)
+    d.line((x1, y1, x2, y2), fill=green, width=thickness)
+    return overlay
+
+
+def render(path: str, size: Size, style: str) -> Image.Image:
+    img = open_contained(path, size)
+    if style == "x":
+        return add_red_x(gray_out(img))
+    if style == "check":
+        return add_green_check(gray_out(img))
+    return img
+
+
+def encode_png(img: Image.Image) -> bytes:
+    out = BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+# what each item gets pre-rendered as in the bot process: the caught/escaped
+# spawn images, as PNG bytes ready to send, and both battle cells, which are
+# handed to the render worker with the collage spec
+PREWARM = (
+    ("png", SALVAGE_SPAWN_IMAGE_SIZE, "check"),
+    ("png", SALVAGE_SPAWN_IMAGE_SIZE, "x"),
+    ("png", SALVAGE_BATTLE_CELL_SIZE, "base"),
+    ("png", SALVAGE_BATTLE_CELL_SIZE, "x"),
+)
+
+
+class SalvageImageCache:
+    # LRU of rendered item images keyed by (kind, path, size, style), capped by
+    # memory (RGBA bytes for images, encoded length for PNGs). Cached images are
+    # shared, treat them as read-only and paste from them.
+
+    def __init__(self, max_bytes: int = SALVAGE_IMAGE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._warmer: Optional[threading.Thread] = None
+
+    def _lookup(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _store(self, key: tuple, value, cost: int) -> bool:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if cost > self.max_bytes:
+                return False
+
+            self._entries[key] = (value, cost)
+            self.bytes += cost
+            while self.bytes > self.max_bytes:
+                _k, (_v, c) = self._entries.popitem(last=False)
+                self.bytes -= c
+            return True
+
+    def _full(self, extra: int) -> bool:
+        with self._lock:
+            return self.bytes + extra > self.max_bytes
+
+    def cached_png(self, path: str, size: Size, style: str = "base") -> Optional[bytes]:
+        return self._lookup(("png", path, tuple(size), style))
+
+    def store_png(self, path: str, size: Size, style: str, data: bytes) -> None:
+        self._store(("png", path, tuple(size), style), data, len(data))
+
+    def image(self, path: str, size: Size, style: str = "base") -> Image.Image:
+        key = ("image", path, tuple(size), style)
+        img = self._lookup(key)
+        if img is None:
+            img = render(path, size, style)
+            self._store(key, img, img.width * img.height * 4)
+        return img
+
+    def png(self, path: str, size: Size, style: str = "base") -> bytes:
+        key = ("png", path, tuple(size), style)
+        data = self._lookup(key)
+        if data is None:
+            data = encode_png(render(path, size, style))
+            self._store(key, data, len(data))
+        return data
+
+    def _warm(self, paths: list[str]) -> None:
+        for path in paths:
+            for kind, size, style in PREWARM:
+                key = (kind, path, tuple(size), style)
+                with self._lock:
+                    if key in self._entries:
+                        continue
+
+                img = render(path, size, style)
+                if kind == "png":
+                    value = encode_png(img)
+                    cost = len(value)
+                else:
+                    value = img
+                    cost = img.width * img.height * 4
+
+                # stop once full, evicting what was just warmed would be pointless
+                if self._full(cost):
+                    return
+                self._store(key, value, cost)
+
+    def prewarm(self, collectibles: Iterable[dict]) -> threading.Thread:
+        paths = [c["image"] for c in collectibles if c.get("image")]
+        self._warmer = threading.Thread(target=self._warm, args=(paths,), name="salvage-image-prewarm", daemon=True)
+        self._warmer.start()
+        return self._warmer
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+
+# battle cells the bot process didn't have pre-rendered get cached in whichever
+# process renders the collage (a render worker)
+_cell_cache: Optional[SalvageImageCache] = None
+
+
+def cell_cache() -> SalvageImageCache:
+    global _cell_cache
+    if _cell_cache is None:
+        _cell_cache = SalvageImageCache()
+    return _cell_cache
+
+
+@dataclass(frozen=True)
+class SpawnImageSpec:
+    path: str
+    size: Size
+    style: str
+
+    def render(self) -> bytes:
+        return encode_png(render(self.path, self.size, self.style))
+
+
+@dataclass(frozen=True)
+class BattleCollageSpec:
+    # one (left path, left style, right path, right style) per round
+    rounds: tuple[tuple[str, str, str, str], ...]
+    cell: Size = SALVAGE_BATTLE_CELL_SIZE
+    # prewarmed PNGs of the cells in order (left, right per round), None for a
+    # cell the worker has to render itself
+    cells: tuple[Optional[bytes], ...] = ()
+
+    def _cell(self, cache: SalvageImageCache, n: int, path: str, style: str) -> Image.Image:
+        png = self.cells[n] if n < len(self.cells) else None
+        if png is not None:
+            return Image.open(BytesIO(png)).convert("RGBA")
+        return cache.image(path, self.cell, style)
+
+    def render(self) -> bytes:
+        cell = self.cell
+        pad = 20
+        rows = 3
+        w = pad + cell[0] + pad + 80 + pad + cell[0] + pad
+        h = pad + rows * (cell[1] + pad)
+
+        canvas = Image.new("RGBA", (w, h), (20, 20, 24, 255))
+        draw = ImageDraw.Draw(canvas)
+
+        try:
+            font = ImageFont.truetype("arial.ttf", 32)
+        except:
+            font = ImageFont.load_default()
+
+        cache = cell_cache()
+        for i, (a_path, a_style, b_path, b_style) in enumerate(self.rounds[:3]):
+            # cached, pasted from only
+            left = self._cell(cache, 2 * i, a_path, a_style)
+            right = self._cell(cache, 2 * i + 1, b_path, b_style)
+
+            y = pad + i * (cell[1] + pad)
+            x_left = pad
+            x_mid = x_left + cell[0] + pad
+            x_right = x_mid + 80 + pad
+
+            canvas.paste(left, (x_left, y), left)
+            canvas.paste(right, (x_right, y), right)
+
+            vs = "VS"
+            bbox = draw.textbbox((0,0), vs, font=font)
+            tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+            draw.text((x_mid + (80 - tw)//2, y + (cell[1] - th)//2), vs, font=font, fill=(230,230,240,255))
+
+        return encode_png(canvas)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+from constants import RARITY_WEIGHTS, VARIANT_WEIGHTS
+from helpers.sampling import AliasSampler
+
+
+# two probabilities closer than this count as the same power
+POWER_EPS = 1e-15
+
+
+def fmt_odds(p: float) -> str:
+    # how odds are shown to players
+    if p <= 0:
+        return "Unknown"
+    denom = int(round(1.0 / p))
+    pct = p * 100.0
+
+    if denom >= 10_000:
+        return f"1 in {denom:,} ({pct:.6f}%)"
+    return f"1 in {denom:,} ({pct:.3f}%)"
+
+
+class OddsEntry:
+    __slots__ = ("p_exact", "bucket_size", "denom", "p_rarity", "p_variant", "rank")
+
+    def __init__(self, p_exact: float, bucket_size: int, denom: int, p_rarity: float, p_variant: float):
+        self.p_exact = p_exact
+        self.bucket_size = bucket_size
+        self.denom = denom
+        self.p_rarity = p_rarity
+        self.p_variant = p_variant
+        # 1 is the rarest, equal odds share a rank, 0 means impossible/unknown
+        self.rank = 0
+
+    def as_tuple(self) -> Tuple[float, int, int, float, float]:
+        # same shape odds_for_item_variant_per_spawn always returned
+        return self.p_exact, self.bucket_size, self.denom, self.p_rarity, self.p_variant
+
+
+class OddsTable:
+    # Per-spawn odds for every (item_id, variant), worked out once per collectibles list.
+    # A spawn picks a rarity by weight (only rarities that have items count), then an
+    # item uniformly from that rarity's bucket, then a variant by weight.
+
+    def __init__(
+        self,
+        collectibles: Iterable[dict],
+        rarity_weights: List[Tuple[str, int]] = RARITY_WEIGHTS,
+        variant_weights: List[Tuple[str, int]] = VARIANT_WEIGHTS,
+    ):
+        self.items = list(collectibles)
+        self.buckets: Dict[str, List[dict]] = {}
+        for c in self.items:
+            self.buckets.setdefault(c.get("rarity", "Common"), []).append(c)
+
+        self.rarity_pool = [(r, int(w)) for r, w in rarity_weights if r in self.buckets]
+        self.variant_pool = [(v, int(w)) for v, w in variant_weights]
+
+        r_total = sum(w for _r, w in self.rarity_pool) or 1
+        v_total = sum(w for _v, w in self.variant_pool) or 1
+        self.p_rarity = {r: (w / r_total if w > 0 else 0.0) for r, w in self.rarity_pool}
+        self.p_variant = {v: (w / v_total if w > 0 else 0.0) for v, w in self.variant_pool}
+
+        self.entries: Dict[Tuple[str, str], OddsEntry] = {}
+        for rarity, items in self.buckets.items():
+            for c in items:
+                for variant in self.p_variant:
+                    self.entries[(c["id"], variant)] = self._compute(rarity, variant)
+
+        self._rank()
+
+        # samplers for spawning, built from the same weights the odds come from
+        self.rarity_sampler = AliasSampler(self.rarity_pool) if any(w > 0 for _r, w in self.rarity_pool) else None
+        self.variant_sampler = AliasSampler(self.variant_pool) if any(w > 0 for _v, w in self.variant_pool) else None
+
+    def _compute(self, rarity: str, variant: str) -> OddsEntry:
+        p_rarity = self.p_rarity.get(rarity, 0.0)
+        bucket_size = len(self.buckets.get(rarity, ())) or 1
+        p_variant = self.p_variant.get(variant, 0.0)
+
+        p_exact = p_rarity * (1.0 / bucket_size) * p_variant
+        denom = int(round(1.0 / p_exact)) if p_exact > 0 else 0
+        return OddsEntry(p_exact, bucket_size, denom, p_rarity, p_variant)
+
+    def _rank(self) -> None:
+        ranked = sorted((e for e in self.entries.values() if e.p_exact > 0), key=lambda e: e.p_exact)
+        rank = 0
+        prev = None
+        for e in ranked:
+            if prev is None or e.p_exact - prev > POWER_EPS:
+                rank += 1
+            prev = e.p_exact
+            e.rank = rank
+
+    def get(self, item_id: str, variant: str) -> Optional[OddsEntry]:
+        return self.entries.get((item_id, variant))
+
+    def odds(self, item: dict, variant: str) -> OddsEntry:
+        entry = self.entries.get((item.get("id"), variant))
+        if entry is None:
+            # item/variant that isn't in the table (e.g. an old variant name)
+            entry = self._compute(item.get("rarity", "Common"), variant)
+        return entry
+
+    def bucket_size(self, rarity: str) -> int:
+        return len(self.buckets.get(rarity, ()))
+
+    def pick_rarity(self, rng: random.Random = random) -> str:
+        if self.rarity_sampler is None:
+            return "Common"
+        return self.rarity_sampler.sample(rng)
+
+    def pick_item(self, rng: random.Random = random) -> Optional[dict]:
+        bucket = self.buckets.get(self.pick_rarity(rng))
+        if bucket:
+            return rng.choice(bucket)
+        return rng.choice(self.items) if self.items else None
+
+    def pick_variant(self, rng: random.Random = random) -> str:
+        if self.variant_sampler is None:
+            return "Normal"
+        return self.variant_sampler.sample(rng)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import random
+import time
+from pathlib import Path
+from typing import List, Tuple
+from constants import *
+from helpers.salvage_odds import OddsTable, fmt_odds
+
+try:
+    import numpy as np
+except ImportError:
+    # only this offline tool uses numpy, the bot never needs it
+    np = None
+
+
+def load_collectibles(path: str | Path) -> list[dict]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _layout(table: OddsTable) -> Tuple[List[str], List[List[int]], List[str], List[str]]:
+    # flat item order, item indices per rarity (same order as the rarity sampler), variant order
+    item_ids = [c["id"] for c in table.items]
+    pos = {id(c): i for i, c in enumerate(table.items)}
+    rarities = list(table.rarity_sampler.values) if table.rarity_sampler else []
+    buckets = [[pos[id(c)] for c in table.buckets[r]] for r in rarities]
+    variants = list(table.variant_sampler.values) if table.variant_sampler else []
+    return item_ids, buckets, rarities, variants
+
+
+def _alias_draw_np(rng, sampler, size: int):
+    prob = np.asarray(sampler.prob)
+    alias = np.asarray(sampler.alias)
+    idx = rng.integers(0, len(prob), size=size)
+    keep = rng.random(size) < prob[idx]
+    return np.where(keep, idx, alias[idx])
+
+
+def simulate_numpy(table: OddsTable, draws: int, seed: int | None, chunk: int = 1_000_000):
+    item_ids, buckets, rarities, variants = _layout(table)
+    rng = np.random.default_rng(seed)
+
+    n_items, n_variants = len(item_ids), len(variants)
+    counts = np.zeros(n_items * n_variants, dtype=np.int64)
+    bucket_arrays = [np.asarray(b) for b in buckets]
+
+    done = 0
+    while done < draws:
+        size = min(chunk, draws - done)
+
+        r_idx = _alias_draw_np(rng, table.rarity_sampler, size)
+        items = np.empty(size, dtype=np.int64)
+        for r, bucket in enumerate(bucket_arrays):
+            mask = r_idx == r
+            k = int(mask.sum())
+            if k:
+                items[mask] = bucket[rng.integers(0, len(bucket), size=k)]
+
+        v_idx = _alias_draw_np(rng, table.variant_sampler, size)
+        counts += np.bincount(items * n_variants + v_idx, minlength=n_items * n_variants)
+        done += size
+
+    return counts.tolist(), item_ids, variants
+
+
+def simulate_python(table: OddsTable, draws: int, seed: int | None):
+    # same draws through the samplers the bot spawns with, much slower
+    item_ids, _buckets, _rarities, variants = _layout(table)
+    rng = random.Random(seed)
+
+    row = {item_id: i for i, item_id in enumerate(item_ids)}
+    col = {v: j for j, v in enumerate(variants)}
+    counts = [0] * (len(item_ids) * len(variants))
+
+    for _ in range(draws):
+        item = table.pick_item(rng)
+        variant = table.pick_variant(rng)
+        counts[row[item["id"]] * len(variants) + col[variant]] += 1
+
+    return counts, item_ids, variants
+
+
+def z_score(observed: int, n: int, p: float) -> float:
+    if p <= 0 or p >= 1:
+        return 0.0 if observed == round(n * p) else math.inf
+    return (observed - n * p) / math.sqrt(n * p * (1 - p))
+
+
+def report(table: OddsTable, counts: list, item_ids: list, variants: list, draws: int, tolerance: float, top: int) -> int:
+    by_id = {c["id"]: c for c in table.items}
+    n_variants = len(variants)
+
+    cells = []
+    rarity_counts: dict[str, int] = {}
+    variant_counts: dict[str, int] = {}
+    for i, item_id in enumerate(item_ids):
+        rarity = by_id[item_id].get("rarity", "Common")
+        for j, variant in enumerate(variants):
+            observed = counts[i * n_variants + j]
+            rarity_counts[rarity] = rarity_counts.get(rarity, 0) + observed
+            variant_counts[variant] = variant_counts.get(variant, 0) + observed
+
+            p = table.get(item_id, variant).p_exact
+            cells.append((abs(z_score(observed, draws, p)), item_id, variant, observed, p))
+
+    print("\nRarity (shown vs simulated)")
+    for rarity, p in table.p_rarity.items():
+        obs = rarity_counts.get(rarity, 0)
+        print(f"  {rarity:<10} {fmt_odds(p):>28}  {fmt_odds(obs / draws):>28}  z={z_score(obs, draws, p):+.2f}")
+
+    print("\nVariant (shown vs simulated)")
+    for variant, p in table.p_variant.items():
+        obs = variant_counts.get(variant, 0)
+        print(f"  {variant:<10} {fmt_odds(p):>28}  {fmt_odds(obs / draws):>28}  z={z_score(obs, draws, p):+.2f}")
+
+    cells.sort(reverse=True)
+    failing = [c for c in cells if c[0] > tolerance]
+
+    print(f"\nWorst {min(top, len(cells))} of {len(cells)} item/variant cells")
+    for z, item_id, variant, observed, p in cells[:top]:
+        name = by_id[item_id].get("name", item_id)
+        expected = draws * p
+        print(f"  {name} [{variant}]: shown {fmt_odds(p)}, got {observed:,} vs {expected:,.1f} expected, |z|={z:.2f}")
+
+    # with this many cells a few |z| > 3 are normal, > tolerance is worth a look
+    if failing:
+        print(f"\n{len(failing)} cell(s) outside |z| <= {tolerance}")
+        return 1
+
+    print(f"\nall cells within |z| <= {tolerance}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate salvage spawns and check them against the odds shown to players")
+    parser.add_argument("--collectibles", default=COLLECTIBLES_PATH)
+    parser.add_argument("--draws", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--tolerance", type=float, default=5.0, help="max |z| per item/variant before it's flagged")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--python", action="store_true", help="use the pure Python samplers even if numpy is installed")
+    args = parser.parse_args(argv)
+
+    table = OddsTable(load_collectibles(args.collectibles))
+    if table.rarity_sampler is None or table.variant_sampler is None:
+        print("nothing to simulate, no collectibles with a weighted rarity")
+        return 1
+
+    use_numpy = np is not None and not args.python
+    if np is None and not args.python:
+        print("numpy isn't installed, falling back to the pure Python samplers (pip install numpy for speed)")
+
+    start = time.perf_counter()
+    if use_numpy:
+        counts, item_ids, variants = simulate_numpy(table, args.draws, args.seed)
+    else:
+        counts, item_ids, variants = simulate_python(table, args.draws, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.draws:,} spawns over {len(table.items)} collectibles x {len(variants)} variants "
+          f"in {elapsed:.2f}s ({args.draws / max(elapsed, 1e-9):,.0f} spawns/s, {'numpy' if use_numpy else 'python'})")
+
+    return report(table, counts, item_ids, variants, args.draws, args.tolerance, args.top)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
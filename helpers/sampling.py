@@ -0,0 +1,58 @@
+from __future__ import annotations
+import random
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class AliasSampler(Generic[T]):
+    # Vose's alias method: O(n) to build, then every draw is one random index
+    # plus one coin flip no matter how many outcomes there are.
+
+    def __init__(self, weighted: Sequence[Tuple[T, float]]):
+        pairs = [(v, float(w)) for v, w in weighted if w > 0]
+        if not pairs:
+            raise ValueError("AliasSampler needs at least one positive weight")
+
+        self.values: List[T] = [v for v, _w in pairs]
+        n = len(pairs)
+        total = sum(w for _v, w in pairs)
+        scaled = [w * n / total for _v, w in pairs]
+
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # whatever is left is 1.0 give or take float error
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def index(self, rng: random.Random = random) -> int:
+        i = rng.randrange(len(self.values))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample(self, rng: random.Random = random) -> T:
+        return self.values[self.index(rng)]
+
+    def probabilities(self) -> List[float]:
+        # what the table actually draws with, for checking it against the weights
+        n = len(self.values)
+        out = [0.0] * n
+        for i in range(n):
+            out[i] += self.prob[i] / n
+            out[self.alias[i]] += (1.0 - self.prob[i]) / n
+        return out
@@ -2,74 +2,363 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from constants import (
+    STATS_FLUSH_SECONDS,
+    STATS_FLUSH_DIRTY_USERS,
+    STATS_COMPACT_SECONDS,
+    STATS_COMPACT_LINES,
+    STATS_JOURNAL_SEQ_KEY,
+)
+from helpers.persistence import persistence
 
 
+def apply_op(user: Dict[str, Any], op: str, field: str, value, key=None) -> None:
+    if op == "bump":
+        user[field] = int(user.get(field, 0)) + value
+    elif op == "set_add":
+        current = list(user.get(field, []))
+        if value not in current:
+            current.append(value)
+        user[field] = current
+    elif op == "max":
+        if value > user.get(field, 0):
+            user[field] = value
+    elif op == "set":
+        user[field] = value
+    elif op == "bump_map":
+        mapping = dict(user.get(field, {}))
+        mapping[key] = int(mapping.get(key, 0)) + value
+        user[field] = mapping
+    else:
+        raise ValueError(f"unknown stats op {op!r}")
+
+
+class StatsUpdate:
+    # collects ops for one user, StatsStore.update applies them in one go
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.ops: list[tuple] = []
+
+    def bump(self, field: str, amount: int = 1):
+        if amount:
+            self.ops.append(("bump", field, amount, None))
+        return self
+
+    def set_add(self, field: str, value):
+        self.ops.append(("set_add", field, value, None))
+        return self
+
+    def set_max(self, field: str, value):
+        self.ops.append(("max", field, value, None))
+        return self
+
+    def set(self, field: str, value):
+        self.ops.append(("set", field, value, None))
+        return self
+
+    def bump_map(self, field: str, key: str, amount: int = 1):
+        self.ops.append(("bump_map", field, amount, key))
+        return self
+
+    @property
+    def fields(self) -> set[str]:
+        # what changed, for AchievementEngine.evaluate(changed=...)
+        return {field for _op, field, _value, _key in self.ops}
+
 
 class StatsStore:
-    def __init__(self, path: Path):
+    # One backend mode at most, the constructor rejects combinations. With none of
+    # them every change rewrites the whole file.
+    #
+    # write_behind keeps the whole file in memory and only writes it out
+    # every flush_interval seconds, once flush_threshold users are dirty, or on close()
+    #
+    # journal also keeps it in memory but appends every change to <path>.journal,
+    # and every compact_interval seconds / compact_lines changes folds the journal
+    # into the snapshot at <path>. Startup replays journal entries newer than the
+    # snapshot's sequence number.
+    #
+    # datastore (a helpers.datastore.DataStore) keeps it in memory too, and every
+    # change writes just that user's row, off the loop on the persistence thread.
+    # There's nothing to flush or compact. This is what the bot runs with unless
+    # USE_DATASTORE is off, then it falls back to journal.
+    def __init__(
+        self,
+        path: Path,
+        write_behind: bool = False,
+        flush_interval: float = STATS_FLUSH_SECONDS,
+        flush_threshold: int = STATS_FLUSH_DIRTY_USERS,
+        journal: bool = False,
+        compact_interval: float = STATS_COMPACT_SECONDS,
+        compact_lines: int = STATS_COMPACT_LINES,
+        datastore=None,
+        namespace: str = "user_stats",
+    ):
+        modes = [name for name, on in (("write_behind", write_behind), ("journal", journal), ("datastore", datastore is not None)) if on]
+        if len(modes) > 1:
+            raise ValueError(f"StatsStore takes one backend mode, got {' + '.join(modes)}")
+
         self.path = path
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
 
-    def load(self) -> Dict[str, Dict[str, int]]:
-        if not self.path.exists():
-            return {}
+        self.datastore = datastore
+        self.namespace = namespace
+
+        self.journal = journal
+        self.journal_path = path.with_suffix(".journal")
+        self.compact_interval = compact_interval
+        self.compact_lines = compact_lines
+
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty: set[str] = set()
+        self._flusher: Optional[asyncio.Task] = None
+        self._seq = 0
+        self._journal_lines = 0
+
+    @property
+    def resident(self) -> bool:
+        return self.write_behind or self.journal or self.datastore is not None
+
+    def _read_snapshot(self) -> tuple[Dict[str, Dict[str, Any]], int]:
+        if self.datastore is not None:
+            return self.datastore.items(self.namespace), 0
+
+        data = persistence.read_json(self.path, {})
+        if not isinstance(data, dict):
+            return {}, 0
+
+        seq = data.pop(STATS_JOURNAL_SEQ_KEY, 0)
+        return data, int(seq or 0)
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        return self._read_snapshot()[0]
+
+    def _write(self, data: Dict[str, Dict[str, int]]) -> None:
+        persistence.write_json(self.path, data, indent=2, sort_keys=True)
+
+    def _replay(self) -> Dict[str, Dict[str, Any]]:
+        data, seq = self._read_snapshot()
+        lines = 0
+
+        raw = persistence.read_text(self.journal_path) or ""
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except:
+                # torn last line from a crash mid-append
+                print(f"[WARN] stopping stats journal replay at bad line after seq {seq}")
+                break
+
+            entry_seq = int(entry.get("s", 0))
+            if entry_seq <= seq:
+                continue
+
+            if "all" in entry:
+                data = entry["all"]
+            else:
+                uid = entry["u"]
+                user = dict(data.get(uid, {}))
+                for op, field, value, key in entry["o"]:
+                    apply_op(user, op, field, value, key)
+                data[uid] = user
+
+            seq = entry_seq
+            lines += 1
+
+        self._seq = seq
+        self._journal_lines = lines
+        return data
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        self._seq += 1
+        entry["s"] = self._seq
+        persistence.append_text(self.journal_path, json.dumps(entry, separators=(",", ":")) + "\n")
+
+        self._journal_lines += 1
+        if self._journal_lines >= self.compact_lines:
+            self.compact()
+
+    def compact(self) -> None:
+        if not self.journal or self._data is None or self._journal_lines == 0:
+            return
+
+        # user dicts are replaced rather than mutated (see apply), so a shallow
+        # copy is a stable snapshot the writer thread can encode on its own time
+        snapshot = dict(self._data)
+        snapshot[STATS_JOURNAL_SEQ_KEY] = self._seq
+        self._journal_lines = 0
+        persistence.submit(self._write_snapshot, snapshot)
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        # runs on the persistence thread, after every append queued before it
+        if persistence.unreadable(self.path):
+            print(f"[ERROR] not compacting into {self.path}, it doesn't parse. The journal keeps everything")
+            return
+        try:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(snapshot, indent=2, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"[WARN] stats compaction failed: {e}")
+            return
 
+        # drop only what the snapshot now covers, anything newer stays
+        seq = snapshot[STATS_JOURNAL_SEQ_KEY]
         try:
-            raw = self.path.read_text(encoding="utf-8").strip()
-            if not raw:
-                return {}
+            raw = self.journal_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return
 
-            data = json.loads(raw)
-            return data if isinstance(data, dict) else {}
-        except:
-            return {}
+        keep = []
+        for line in raw.splitlines(keepends=True):
+            try:
+                if int(json.loads(line).get("s", 0)) > seq:
+                    keep.append(line)
+            except:
+                continue
+
+        tmp = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        tmp.write_text("".join(keep), encoding="utf-8")
+        tmp.replace(self.journal_path)
+
+    def _write_row(self, user_id: str, user: Dict[str, Any]) -> None:
+        # runs on the persistence thread
+        try:
+            self.datastore.put(self.namespace, user_id, user)
+        except Exception as e:
+            print(f"[WARN] stats write for {user_id} failed: {e}")
+
+    def _write_rows(self, data: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.datastore.replace(self.namespace, data)
+        except Exception as e:
+            print(f"[WARN] stats save failed: {e}")
+
+    def _mark_dirty(self, user_id: str) -> None:
+        self._dirty.add(user_id)
+        if len(self._dirty) >= self.flush_threshold:
+            self.flush()
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        if not self.resident:
+            return self._read()
+
+        if self._data is None:
+            self._data = self._replay() if self.journal else self._read()
+        return self._data
 
     def save(self, data: Dict[str, Dict[str, int]]) -> None:
-        self.path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        if self.datastore is not None:
+            self._data = data
+            persistence.submit(self._write_rows, dict(data))
+            return
 
-    def bump(self, user_id: str, field: str, amount: int = 1) -> Dict[str, int]:
-        data = self.load()
-        user = data.get(user_id, {})
+        if not self.resident:
+            self._write(data)
+            return
 
-        user[field] = int(user.get(field, 0)) + amount
-        data[user_id] = user
-        self.save(data)
+        self._data = data
+        if self.journal:
+            self._log({"all": data})
+            return
 
-        return user
+        # whole-dataset save (e.g. after mutating all()), so count it as one dirty entry
+        self._mark_dirty("*")
 
-    def set_bump(self, user_id: str, field: str, value: str):
+    def flush(self) -> None:
+        if self.journal:
+            self.compact()
+            return
+
+        if not self.write_behind or not self._dirty or self._data is None:
+            return
+
+        self._dirty.clear()
+        try:
+            # shallow copy is enough, user dicts are replaced rather than mutated (see apply)
+            self._write(dict(self._data))
+        except Exception as e:
+            print(f"[WARN] stats flush failed: {e}")
+            self._dirty.add("*")
+
+    async def _flush_loop(self):
+        interval = self.compact_interval if self.journal else self.flush_interval
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+    def start(self) -> None:
+        if self.resident:
+            self.load()
+        # only write_behind and journal have anything to flush
+        if (self.write_behind or self.journal) and self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        self.flush()
+
+    @contextmanager
+    def update(self, user_id):
+        tx = StatsUpdate(str(user_id))
+        yield tx
+        self.apply(tx.user_id, tx.ops)
+
+    def apply(self, user_id: str, ops) -> Dict[str, Any]:
         data = self.load()
-        user = data.get(user_id, {})
+        if not ops:
+            return data.get(user_id, {})
 
-        current = set(user.get(field, []))
-        current.add(value)
+        # work on a copy so a bad op can't leave the user half-updated
+        user = dict(data.get(user_id, {}))
+        for op, field, value, key in ops:
+            apply_op(user, op, field, value, key)
 
-        user[field] = list(current)
         data[user_id] = user
-        self.save(data)
+        self._commit(data, user_id, ops)
 
         return user
 
+    def bump(self, user_id: str, field: str, amount: int = 1) -> Dict[str, int]:
+        return self.apply(user_id, [("bump", field, amount, None)])
+
+    def set_bump(self, user_id: str, field: str, value: str):
+        return self.apply(user_id, [("set_add", field, value, None)])
+
     def get(self, user_id):
-        return self.load().get(str(user_id), {
+        user = self.load().get(str(user_id), {
             "messages": 0,
             "files": 0,
             "ereuse_reacts": 0
         })
+        # callers used to get a fresh copy from disk, keep it that way
+        return dict(user) if self.resident else user
 
     def set_value(self, user_id: str, field: str, value):
-        user_id = str(user_id)
-        data = self.load()
-        user = data.get(user_id, {})
+        return self.apply(str(user_id), [("set", field, value, None)])
 
-        user[field] = value
-        data[user_id] = user
-        self.save(data)
-
-        return user
+    def _commit(self, data, user_id: str, ops) -> None:
+        if self.datastore is not None:
+            # the user dict is replaced on every change, never mutated, so it's safe to hand over
+            persistence.submit(self._write_row, user_id, data[user_id])
+        elif self.journal:
+            self._log({"u": user_id, "o": ops})
+        elif self.write_behind:
+            self._mark_dirty(user_id)
+        else:
+            self.save(data)
 
 
     def all(self):
-        return self.load()
\ No newline at end of file
+        return self.load()
@@ -7,44 +7,33 @@ import os
 import traceback
 from constants import *
 from helpers.stats import StatsStore
+from helpers.persistence import persistence
+from helpers.datastore import datastore_for, close_shared_datastore
 from pathlib import Path
 from helpers.achievement_engine import AchievementEngine
+from helpers.reaction_cache import reaction_cache
+from helpers.guild_index import guild_index
+from helpers.render_service import render_service
+from helpers.avatar_cache import avatar_cache
 import json
 from typing import Any, Dict
-import cogs.challenges
-import cogs.voice
-import cogs.salvage
-import cogs.general
-from cogs.verify import VerifyStore
-
-load_dotenv()
 
 def _safe_json_load(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-
-    try:
-        raw = path.read_text(encoding="utf-8").strip()
-        if not raw:
-            return {}
-        data = json.loads(raw)
-        return data if isinstance(data, dict) else {}
-    except:
-        return {}
+    data = persistence.read_json(path, {})
+    return data if isinstance(data, dict) else {}
 
 
 def _safe_json_save(path: Path, data: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    persistence.write_json(path, data, indent=2, sort_keys=True)
 
 
-stats_store = StatsStore(Path(USER_STATS_PATH))
+# All set up by create_bot(). Importing this module must not do anything: render
+# workers are spawned processes and re-import it as __mp_main__.
+stats_store: StatsStore | None = None
+achievement_engine: AchievementEngine | None = None
+verify_store = None
+bot: "eReuseBot | None" = None
 
-achievement_engine = AchievementEngine(
-    load_fn=lambda: _safe_json_load(Path(ACHEIVEMENTS_PATH)),
-    save_fn=lambda d: _safe_json_save(Path(ACHEIVEMENTS_PATH), d)
-)
-
-verify_store = VerifyStore(VERIFY_PATH)
 ALLOWED_UNVERIFIED = {"verify", "verifyfinish", "help"}
 
 def _has_role(member: discord.Member, role_name: str) -> bool:
@@ -67,13 +56,21 @@ class VerifiedOnlyTree(app_commands.CommandTree):
         if not isinstance(member, discord.Member):
             return False
         
-        if _has_role(member, VERIFY_ROLE) or verify_store.is_verified(member.id):
+        if _has_role(member, VERIFY_ROLE) or await verify_store.is_verified(member.id):
             return True
         
         raise app_commands.CheckFailure("not_verified")
 
 class eReuseBot(commands.Bot):
     async def setup_hook(self) -> None:
+        import cogs.challenges
+        import cogs.voice
+        import cogs.salvage
+        import cogs.general
+
+        stats_store.start()
+        achievement_engine.queue.start()
+
         for filename in os.listdir("./cogs"):
             if filename.endswith(".py"):
                 try:
@@ -98,21 +95,23 @@ class eReuseBot(commands.Bot):
         except Exception as e:
             print(f"[ERROR] tree.sync failed: {e}")
 
+    async def close(self) -> None:
+        # finish achievement work while the connection is still up
+        await achievement_engine.queue.stop()
+        await achievement_engine.flush_announcements()
+        await super().close()
+        stats_store.close()
+        render_service.close()
+        await avatar_cache.close()
+        await persistence.flush()
+        close_shared_datastore()
 
-handler = logging.FileHandler(filename='discord.log', encoding='utf-8', mode='w')
-intents = discord.Intents.default()
-intents.message_content = True
-intents.guilds = True
-intents.members = True
-intents.reactions = True
-
-bot = eReuseBot(command_prefix="!", intents=intents, tree_cls=VerifiedOnlyTree)
 
-@bot.event
 async def on_ready():
+    # guild objects can be rebuilt on reconnect, don't hold on to old roles/emojis
+    guild_index.clear()
     print(f"{bot.user.name} is up and running :D")
 
-@bot.event
 async def on_message(message: discord.Message):
     if message.author == bot.user:
         return
@@ -120,65 +119,63 @@ async def on_message(message: discord.Message):
     if message.guild is None:
         return
 
-    stats_store.bump(str(message.author.id), "messages", 1)
+    user_id = str(message.author.id)
 
-    if message.attachments:
-        stats_store.bump(str(message.author.id), "files", len(message.attachments))
+    with stats_store.update(user_id) as tx:
+        tx.bump("messages", 1)
 
-    if "ereuse" in message.content.lower():
-        emoji = discord.utils.get(message.guild.emojis, name="eReuse")
-        if emoji:
-            try:
-                await message.add_reaction(emoji)
-                stats_store.bump(str(message.author.id), "ereuse_reacts", 1)
-            except Exception as e:
-                print(f"Failed to react: {e}")
+        if message.attachments:
+            tx.bump("files", len(message.attachments))
 
-    if "67" in message.content:
-        try:
-            stats_store.bump(str(message.author.id), SIX_SEVEN, 1)
-        except Exception as e:
-            pass
+        if "ereuse" in message.content.lower():
+            emoji = guild_index.emoji(message.guild, "eReuse")
+            if emoji:
+                try:
+                    await message.add_reaction(emoji)
+                    tx.bump("ereuse_reacts", 1)
+                except Exception as e:
+                    print(f"Failed to react: {e}")
 
+        if "67" in message.content:
+            tx.bump(SIX_SEVEN, 1)
 
-    emoji_ids = CUSTOM_EMOJI_REGEX.findall(message.content)
-    if emoji_ids:
-        user_id = str(message.author.id)
-        guild_emoji_ids = {str(e.id) for e in message.guild.emojis}
 
-        used_this_message = set()
+        emoji_ids = CUSTOM_EMOJI_REGEX.findall(message.content)
+        if emoji_ids:
+            guild_emoji_ids = guild_index.emoji_ids(message.guild)
 
-        for eid in emoji_ids:
-            if eid in guild_emoji_ids:
-                stats_store.bump(user_id, SERVER_EMOJIS_USED, 1)
-                used_this_message.add(eid)
-            
-        if used_this_message:
-            for eid in used_this_message:
-                stats_store.set_bump(user_id, UNIQUE_SERVER_EMOJIS, eid)
-            
-            stats = stats_store.get(user_id)
-            if not stats.get(EMOJI_ARCHIVIST, False):
-                unique_count = len(stats.get(UNIQUE_SERVER_EMOJIS, []))
-                total_emojis = len(message.guild.emojis)
+            used_this_message = set()
 
-                if total_emojis > 0 and unique_count >= total_emojis:
-                    stats_store.set_value(user_id, EMOJI_ARCHIVIST, True)
+            for eid in emoji_ids:
+                if eid in guild_emoji_ids:
+                    tx.bump(SERVER_EMOJIS_USED, 1)
+                    used_this_message.add(eid)
 
+            if used_this_message:
+                for eid in used_this_message:
+                    tx.set_add(UNIQUE_SERVER_EMOJIS, eid)
 
-    try:
-        member = message.guild.get_member(message.author.id)
-        challenges_cog = bot.get_cog("Challenges")
-        if member and challenges_cog:
-            ctx = await challenges_cog.build_ctx(member)
-            await achievement_engine.evaluate(ctx)
-    except Exception as e:
-        print(f"[WARN] achievment eval failed: {e}")
+                stats = stats_store.get(user_id)
+                if not stats.get(EMOJI_ARCHIVIST, False):
+                    unique_count = len(set(stats.get(UNIQUE_SERVER_EMOJIS, [])) | used_this_message)
+                    total_emojis = len(message.guild.emojis)
+
+                    if total_emojis > 0 and unique_count >= total_emojis:
+                        tx.set(EMOJI_ARCHIVIST, True)
+
+
+    member = message.guild.get_member(message.author.id)
+    if member:
+        achievement_engine.enqueue(member, tx.fields)
 
     await bot.process_commands(message)
 
-@bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
+    emoji = str(payload.emoji)
+    is_bot = payload.member.bot if payload.member else payload.user_id == bot.user.id
+    # keep the cached state right for every reaction, including ones we ignore below
+    reaction_cache.on_add(payload.message_id, emoji, payload.user_id, is_bot)
+
     if payload.user_id == bot.user.id:
         return
 
@@ -192,67 +189,80 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     channel = guild.get_channel(payload.channel_id)
     if channel is None:
         return
+
+    state = reaction_cache.get(payload.message_id)
+    if state is None:
+        try:
+            message = await channel.fetch_message(payload.message_id)
+        except (discord.Forbidden, discord.NotFound):
+            return
+        # the fetched message already includes this reaction
+        state = await reaction_cache.seed(message)
     
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except (discord.Forbidden, discord.NotFound):
-        return
-    
-    user = guild.get_member(payload.user_id) or await guild.fetch_member(payload.user_id)
+    user = payload.member or guild.get_member(payload.user_id) or await guild.fetch_member(payload.user_id)
     if user.bot:
         return
 
-    stats_store.bump(str(user.id), REACTIONS_GIVEN, 1)
+    with stats_store.update(user.id) as tx:
+        tx.bump(REACTIONS_GIVEN, 1)
 
-    if message.author.id == bot.user.id and str(payload.emoji) == "💚":
-        stats_store.set_value(str(user.id), FOOTER_READER, True)
+        if state.owner_id == bot.user.id and emoji == "💚":
+            tx.set(FOOTER_READER, True)
 
-    if channel.id == ANNOUNCEMENT_CHANNEL_ID:
-        already_reacted = False
-        for r in message.reactions:
-            if str(r.emoji) == str(payload.emoji):
-                continue
+        if channel.id == ANNOUNCEMENT_CHANNEL_ID:
+            if not state.reacted_with_other(emoji, user.id):
+                tx.bump(ANNOUNCEMENT_REACTS, 1)
 
-            users = [u async for u in r.users()]
-            if user in users:
-                already_reacted = True
-                break
+        unique_users = state.unique_users()
+        total_reactions = state.total_reactions()
+        message_owner = guild.get_member(state.owner_id)
 
-        if not already_reacted:
-            stats_store.bump(str(user.id), ANNOUNCEMENT_REACTS, 1)
+        if message_owner:
+            tx.set_add(REACTED_USERS, str(message_owner.id))
 
-    unique_users = {u.id for r in message.reactions async for u in r.users() if not u.bot}
-    total_reactions = sum(r.count for r in message.reactions)
-    message_owner = guild.get_member(message.author.id)
+    if message_owner:
+        stats = stats_store.get(str(message_owner.id))
+        updated = (
+            len(unique_users) > stats.get(MAX_UNIQUE_REACTORS, 0)
+            or total_reactions > stats.get(MAX_REACTIONS_ON_MESSAGE, 0)
+        )
 
-    challenges_cog = bot.get_cog("Challenges")
+        if updated:
+            with stats_store.update(message_owner.id) as owner_tx:
+                owner_tx.set_max(MAX_UNIQUE_REACTORS, len(unique_users))
+                owner_tx.set_max(MAX_REACTIONS_ON_MESSAGE, total_reactions)
+            achievement_engine.enqueue(message_owner, owner_tx.fields)
 
-    if message_owner:
-        stats_store.set_bump(str(user.id), REACTED_USERS, str(message_owner.id))
+    achievement_engine.enqueue(user, tx.fields)
 
-        stats = stats_store.get(str(message_owner.id))
-        curr_unique = stats.get(MAX_UNIQUE_REACTORS, 0)
-        curr_reacts = stats.get(MAX_REACTIONS_ON_MESSAGE, 0)
-        updated = False
+async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
+    reaction_cache.on_remove(payload.message_id, str(payload.emoji), payload.user_id)
 
-        if len(unique_users) > curr_unique:
-            stats_store.set_value(str(message_owner.id), MAX_UNIQUE_REACTORS, len(unique_users))
-            updated = True
+async def on_raw_reaction_clear(payload: discord.RawReactionClearEvent):
+    reaction_cache.on_clear(payload.message_id)
 
-        if total_reactions > curr_reacts:
-            stats_store.set_value(str(message_owner.id), MAX_REACTIONS_ON_MESSAGE, total_reactions)
-            updated = True
+async def on_raw_reaction_clear_emoji(payload: discord.RawReactionClearEmojiEvent):
+    reaction_cache.on_clear_emoji(payload.message_id, str(payload.emoji))
 
-        if updated and challenges_cog:
-            ctx =  await challenges_cog.build_ctx(message_owner)
-            await achievement_engine.evaluate(ctx)
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    reaction_cache.forget(payload.message_id)
 
-    if user and challenges_cog:
-        ctx = await challenges_cog.build_ctx(user)
-        await achievement_engine.evaluate(ctx)
+async def on_guild_role_create(role: discord.Role):
+    guild_index.invalidate_roles(role.guild.id)
+
+async def on_guild_role_delete(role: discord.Role):
+    guild_index.invalidate_roles(role.guild.id)
+
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    guild_index.invalidate_roles(after.guild.id)
+
+async def on_guild_emojis_update(guild: discord.Guild, before, after):
+    guild_index.invalidate_emojis(guild.id)
+
+async def on_guild_available(guild: discord.Guild):
+    guild_index.invalidate(guild.id)
 
 
-@bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error):
     if interaction.guild is not None:
         cmd = interaction.command
@@ -260,7 +270,7 @@ async def on_app_command_error(interaction: discord.Interaction, error):
         member = interaction.user
 
         if root_name not in ALLOWED_UNVERIFIED and isinstance(member, discord.Member):
-            if not _has_role(member, VERIFY_ROLE) and not verify_store.is_verified(member.id):
+            if not _has_role(member, VERIFY_ROLE) and not await verify_store.is_verified(member.id):
                 msg = (
                     "🔒 You must verify before using bot commands.\n"
                     "Use **`/verify`** to start, then **`/verifyfinish`** with your code.\n"
@@ -283,11 +293,58 @@ async def on_app_command_error(interaction: discord.Interaction, error):
     except Exception:
         pass
 
+EVENTS = (
+    on_ready,
+    on_message,
+    on_raw_reaction_add,
+    on_raw_reaction_remove,
+    on_raw_reaction_clear,
+    on_raw_reaction_clear_emoji,
+    on_raw_message_delete,
+    on_guild_role_create,
+    on_guild_role_delete,
+    on_guild_role_update,
+    on_guild_emojis_update,
+    on_guild_available,
+)
+
+
+def create_bot() -> eReuseBot:
+    global stats_store, achievement_engine, verify_store, bot
+    from cogs.verify import VerifyStore
+
+    # per-user rows in the database, or the journalled JSON file with USE_DATASTORE off
+    datastore = datastore_for(USER_STATS_PATH)
+    stats_store = StatsStore(Path(USER_STATS_PATH), journal=datastore is None, datastore=datastore)
+
+    achievement_engine = AchievementEngine(
+        load_fn=lambda: _safe_json_load(Path(ACHEIVEMENTS_PATH)),
+        save_fn=lambda d: _safe_json_save(Path(ACHEIVEMENTS_PATH), d)
+    )
+
+    verify_store = VerifyStore(VERIFY_PATH)
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.guilds = True
+    intents.members = True
+    intents.reactions = True
+
+    bot = eReuseBot(command_prefix="!", intents=intents, tree_cls=VerifiedOnlyTree)
+    for event in EVENTS:
+        bot.event(event)
+    bot.tree.error(on_app_command_error)
+    return bot
+
+
 def main():
+    load_dotenv()
     token = os.getenv('DISCORD_TOKEN')
     if not token:
         raise RuntimeError("Missing Discord_Token Environment Variable")
-    bot.run(token, log_handler=handler, log_level=logging.DEBUG)
+
+    handler = logging.FileHandler(filename='discord.log', encoding='utf-8', mode='w')
+    create_bot().run(token, log_handler=handler, log_level=logging.DEBUG)
 
 
 if __name__ == "__main__":